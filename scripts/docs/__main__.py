@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Unified entry point of the docs scripts.
+
+Usage:
+    python -m scripts.docs [options] COMMAND [COMMAND ...]
+
+Subcommands run in the given order in one process and share a DocsSession:
+source files are read once, mutator subcommands rewrite them in memory and
+the changes are written in one atomic batch, and the source and markdown
+indexes are built once for every reporting subcommand. Script modules are
+imported only when their subcommand runs, e.g.
+
+    python -m scripts.docs fix clean add-params verify
+"""
+import argparse
+import importlib
+import os
+import sys
+
+# The scripts import their siblings as top-level modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from git_scope import add_scope_arguments, git_scope
+from profiling import PROFILER, run_profiled
+from reporting import FORMATS, json_array, progress
+
+# Subcommand -> (kind, target): a JSDoc rule and its log tag, or the reporting scripts to run
+COMMANDS = {
+    'check': ('report', ['check_jsdoc_annotations', 'find_functions_without_params']),
+    'fix': ('rule', ('fix', 'FIXED')),
+    'clean': ('rule', ('clean', 'CLEANED')),
+    'restore-params': ('rule', ('restore-params', 'UPDATED')),
+    'improve-params': ('rule', ('improve-params', 'IMPROVED')),
+    'add-params': ('rule', ('add-params', 'UPDATED')),
+    'analyze': ('report', ['analyze_types_docs', 'analyze_docs', 'analyze_docs_precise', 'find_empty_param_descriptions']),
+    'verify': ('report', ['verify_changes']),
+}
+
+def parse_args(argv=None):
+    """Parse the subcommand chain and the options shared by every subcommand"""
+    parser = argparse.ArgumentParser(prog='python -m scripts.docs', description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('commands', nargs='+', choices=list(COMMANDS), metavar='COMMAND',
+                        help=f"subcommands to run in order: {', '.join(COMMANDS)}")
+    parser.add_argument('--dry-run', action='store_true',
+                        help='print the rewrites of the mutator subcommands as a unified diff instead of writing them')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='process every file even if the cache has a result for it')
+    parser.add_argument('--profile', action='store_true',
+                        help='record per-file, per-rule and per-pattern timings for the whole chain')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='like --profile, and record the peak memory of each stage (slows the timings down)')
+    parser.add_argument('--format', choices=FORMATS, default='text',
+                        help='output format of the reporting subcommands (default: text)')
+    parser.add_argument('--base', help='base ref for verify (default: the one of verify_changes.py)')
+    parser.add_argument('--head', help='head ref for verify (default: HEAD)')
+    parser.add_argument('--exact', action='store_true', help='compare token streams in verify')
+    add_scope_arguments(parser)
+    return parser.parse_intermixed_args(argv)
+
+def verify_argv(args):
+    """Return the verify_changes.py arguments selected on the command line"""
+    argv = ['--format', args.format]
+    if args.base:
+        argv += ['--base', args.base]
+    if args.head:
+        argv += ['--head', args.head]
+    if args.exact:
+        argv.append('--exact')
+    if args.changed_since:
+        argv += ['--changed-since', args.changed_since]
+    if args.staged:
+        argv.append('--staged')
+    return argv
+
+def run_report(module_name, args):
+    """Import a reporting script and run its main function"""
+    module = importlib.import_module(module_name)
+    if PROFILER.enabled:
+        # Script modules are imported lazily, after profiling started
+        PROFILER.instrument_patterns()
+
+    with PROFILER.stage(module_name):
+        if module_name == 'verify_changes':
+            module.main(verify_argv(args))
+        else:
+            module.main()
+
+def main():
+    """Run a chain of docs subcommands in one process"""
+    args = parse_args()
+
+    from session import DocsSession
+    session = DocsSession(dry_run=args.dry_run, use_cache=not args.no_cache,
+                          scope=git_scope(args.changed_since, args.staged))
+
+    # With --format json the findings of every reporting script form one array
+    with json_array(args.format):
+        for command in args.commands:
+            kind, target = COMMANDS[command]
+            if kind == 'rule':
+                rule_name, tag = target
+                with PROFILER.stage(command):
+                    summary = session.run_rule(rule_name, tag)
+                progress(f"[{command.upper()}] {summary['changed']} changed, {summary['cached']} cached, {summary['processed']} files",
+                         stderr=args.dry_run)
+                continue
+
+            # Reporting scripts read the tree from disk
+            session.flush()
+            for module_name in target:
+                run_report(module_name, args)
+
+    session.close()
+
+if __name__ == "__main__":
+    run_profiled('docs', main)
\ No newline at end of file
@@ -3,6 +3,16 @@ import os
 import re
 from pathlib import Path
 
+from edits import insert_lines
+from file_cache import tool_version
+from jsdoc_rules import rewrite_file
+from profiling import run_profiled
+from reporting import progress
+from runner import run_mutator
+from ts_lexer import parse_param, split_params
+
+TOOL_VERSION = 1
+
 # Parameter name to description mapping
 PARAM_DESCRIPTIONS = {
     'stateSchema': 'Partial state schema with updates to be applied to the existing state configuration.',
@@ -36,119 +46,83 @@ PARAM_DESCRIPTIONS = {
     'key': 'Key identifier for the operation.',
 }
 
+def add_missing_params_block(block):
+    """Return the edit adding @param annotations to the JSDoc block of an exported function that is missing them"""
+    jsdoc_block = block.text
+    declaration = block.declaration
+
+    if not declaration or declaration['kind'] != 'function' or not declaration['exported']:
+        return []
+
+    params_str = declaration['params']
+
+    # Skip if already has @param
+    if '@param' in jsdoc_block:
+        return []
+
+    # Skip if no parameters
+    if not params_str.strip():
+        return []
+
+    # Parse parameters, splitting at top-level commas only
+    params = []
+    for param in split_params(params_str):
+        parsed = parse_param(param)
+
+        # Destructured parameters have no name to document
+        if parsed['destructured']:
+            continue
+
+        param_name = parsed['name']
+
+        if param_name and param_name not in ['args', 'rest']:
+            # Get description for the parameter
+            description = PARAM_DESCRIPTIONS.get(param_name, f"The {param_name} parameter.")
+            params.append({
+                'name': param_name,
+                'description': description
+            })
+
+    if not params:
+        return []  # No valid parameters found
+
+    # Add @param annotations to JSDoc
+    lines = jsdoc_block.split('\n')
+
+    # Find insertion point (before @template, @throws, @returns, @example)
+    insert_index = len(lines) - 1  # Before closing */
+    for i, line in enumerate(lines):
+        if any(tag in line for tag in ['@template', '@throws', '@returns', '@example']):
+            insert_index = i
+            break
+
+    # Create @param lines (without types)
+    param_lines = []
+    if insert_index > 0 and insert_index < len(lines) - 1:
+        param_lines.append(' *')  # Empty line before @param
+
+    for param in params:
+        param_line = f" * @param {param['name']} {param['description']}"
+        param_lines.append(param_line)
+
+    # Insert @param lines before closing */ or before other annotations
+    return [insert_lines(lines, insert_index, param_lines)]
+
 def add_missing_param_annotations(file_path):
-    """Add @param annotations to functions that are missing them"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        original_content = content
-
-        # Pattern for functions with JSDoc that might be missing @param
-        function_pattern = r'(/\*\*[\s\S]*?\*/)\s*export\s+(async\s+)?function\s+(\w+)\s*(<[^>]*>)?\s*\(([^)]*)\)'
-
-        def process_function(match):
-            jsdoc_block = match.group(1)
-            async_keyword = match.group(2) or ""
-            function_name = match.group(3)
-            generics = match.group(4) or ""
-            params_str = match.group(5)
-
-            # Skip if already has @param
-            if '@param' in jsdoc_block:
-                return match.group(0)
-
-            # Skip if no parameters
-            if not params_str.strip():
-                return match.group(0)
-
-            # Parse parameters
-            params = []
-            for param in params_str.split(','):
-                param = param.strip()
-                if not param:
-                    continue
-
-                # Extract parameter name (handle complex cases)
-                param_name = param.split(':')[0].split('=')[0].strip()
-                # Remove destructuring, rest operators, etc. - just get the base name
-                param_name = re.sub(r'[{}\[\]?.]', '', param_name).strip()
-                param_name = re.sub(r'^\.\.\.', '', param_name)  # Remove rest operator
-
-                if param_name and param_name not in ['args', 'rest']:
-                    # Get description for the parameter
-                    description = PARAM_DESCRIPTIONS.get(param_name, f"The {param_name} parameter.")
-                    params.append({
-                        'name': param_name,
-                        'description': description
-                    })
-
-            if not params:
-                return match.group(0)  # No valid parameters found
-
-            # Add @param annotations to JSDoc
-            lines = jsdoc_block.split('\n')
-
-            # Find insertion point (before @template, @throws, @returns, @example)
-            insert_index = len(lines) - 1  # Before closing */
-            for i, line in enumerate(lines):
-                if any(tag in line for tag in ['@template', '@throws', '@returns', '@example']):
-                    insert_index = i
-                    break
-
-            # Create @param lines (without types)
-            param_lines = []
-            if insert_index > 0 and insert_index < len(lines) - 1:
-                param_lines.append(' *')  # Empty line before @param
-
-            for param in params:
-                param_line = f" * @param {param['name']} {param['description']}"
-                param_lines.append(param_line)
-
-            # Insert @param lines
-            if insert_index == len(lines) - 1:
-                # Insert before closing */
-                lines = lines[:-1] + param_lines + [lines[-1]]
-            else:
-                # Insert before other annotations
-                lines = lines[:insert_index] + param_lines + lines[insert_index:]
-
-            new_jsdoc = '\n'.join(lines)
-            return f"{new_jsdoc}\nexport {async_keyword}function {function_name}{generics}({params_str})"
-
-        # Apply the transformation
-        content = re.sub(function_pattern, process_function, content, flags=re.MULTILINE)
-
-        if content != original_content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            return True
-
-        return False
-
-    except Exception as e:
-        print(f"Error processing {file_path}: {e}")
-        return False
+    """Return the old and new contents of a file with missing @param annotations added"""
+    return rewrite_file(file_path, ['add-params'])
 
 def main():
     """Add missing @param annotations in TypeScript files"""
-    files_processed = 0
-    files_changed = 0
-
-    # Process all .ts files in src directory
-    for root, dirs, files in os.walk('src'):
-        for file in files:
-            if file.endswith('.ts'):
-                file_path = os.path.join(root, file)
-                files_processed += 1
-
-                if add_missing_param_annotations(file_path):
-                    files_changed += 1
-                    print(f"[UPDATED] {file_path}")
+    summary = run_mutator('add_missing_param_annotations', add_missing_param_annotations, 'UPDATED', tool_version(__file__, TOOL_VERSION), main.__doc__)
+    files_processed = summary['processed']
+    files_changed = summary['changed']
+    files_cached = summary['cached']
 
-    print(f"\n=== SUMMARY ===")
-    print(f"Files processed: {files_processed}")
-    print(f"Files changed: {files_changed}")
+    progress(f"\n=== SUMMARY ===")
+    progress(f"Files processed: {files_processed}")
+    progress(f"Files changed: {files_changed}")
+    progress(f"Files cached: {files_cached}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_profiled('add_missing_param_annotations', main)
\ No newline at end of file
@@ -6,71 +6,85 @@ import os
 import re
 from pathlib import Path
 
-def analyze_markdown_file(file_path):
-    """Analyze a single markdown file for missing descriptions."""
-    missing_descriptions = []
-
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+from file_cache import FileCache, cache_enabled, tool_version
+from git_scope import get_git_scope
+from line_index import format_location
+from markdown_model import load_document
+from profiling import PROFILER, run_profiled
+from reporting import emit, output_format, progress
+from repo_files import list_files
+from watch import watch, watch_enabled
 
-    # Pattern to find property sections: ### propertyName followed by ```ts code block
-    property_pattern = r'###\s+(\w+)\s*\n\s*```ts\s*\n([^`]+)\n```\s*(?:\n\s*\n|$)'
+TOOL_VERSION = 1
 
-    matches = re.finditer(property_pattern, content, re.MULTILINE)
+CATEGORIES = ['interfaces', 'functions', 'types']
 
-    for match in matches:
-        property_name = match.group(1)
-        type_definition = match.group(2).strip()
-
-        # Check if there's descriptive text after the code block
-        end_pos = match.end()
-        remaining_content = content[end_pos:].strip()
+def analyze_markdown_file(file_path, scope=None):
+    """Analyze a single markdown file for missing descriptions."""
+    missing_descriptions = []
 
-        # Look for the next ### or end of file
-        next_section = re.search(r'\n###\s+\w+', remaining_content)
-        if next_section:
-            description_section = remaining_content[:next_section.start()].strip()
-        else:
-            description_section = remaining_content.strip()
+    document = load_document(file_path, scope)
 
+    # Property sections: ### propertyName followed by ```ts code block
+    for heading, code_block, description_section in document.property_sections():
         # If description section is empty or very short, it's likely missing
         if not description_section or len(description_section) < 10:
             missing_descriptions.append({
-                'property': property_name,
-                'type': type_definition,
-                'file': str(file_path)
+                'property': heading['text'],
+                'type': document.code(code_block).strip(),
+                'file': str(file_path),
+                'line': document.lines.line(heading['start'])
             })
 
     return missing_descriptions
 
-def analyze_docs_directory():
-    """Analyze all markdown files in docs directories."""
+def iter_missing_descriptions(categories=CATEGORIES):
+    """Yield the missing descriptions of every analyzed category as they are found."""
     base_path = Path('docs')
-
-    categories = ['interfaces', 'functions', 'types']
-    all_missing = {}
+    cache = FileCache('analyze_docs', tool_version(__file__, TOOL_VERSION), cache_enabled())
+    scope = get_git_scope()
+    analyzed_files = []
+    with PROFILER.stage('walk'):
+        # One listing of docs/ serves every category
+        pages = list_files(base_path, '*/*.md')
 
     for category in categories:
         category_path = base_path / category
         if not category_path.exists():
-            print(f"Directory {category_path} not found, skipping...")
+            progress(f"Directory {category_path} not found, skipping...")
             continue
 
-        all_missing[category] = []
-
         # Find all .md files in the category
-        md_files = list(category_path.glob('*.md'))
+        md_files = [Path(md_file) for md_file in pages if os.path.dirname(md_file) == str(category_path)]
+        if scope is not None:
+            md_files = scope.filter(md_files)
 
-        print(f"\nAnalyzing {len(md_files)} files in {category}/...")
+        progress(f"\nAnalyzing {len(md_files)} files in {category}/...")
 
         for md_file in md_files:
-            missing = analyze_markdown_file(md_file)
-            if missing:
-                all_missing[category].extend([{
+            analyzed_files.append(md_file)
+            with PROFILER.file(md_file):
+                hit, missing = cache.lookup(md_file)
+                if not hit:
+                    missing = analyze_markdown_file(md_file, scope)
+                    cache.store(md_file, missing)
+            for item in missing:
+                yield {
+                    'category': category,
                     'interface_name': md_file.stem,
                     **item
-                } for item in missing])
+                }
+
+    if scope is None:
+        cache.retain(analyzed_files)
+    cache.save()
 
+def analyze_docs_directory():
+    """Analyze all markdown files in docs directories."""
+    base_path = Path('docs')
+    all_missing = {category: [] for category in CATEGORIES if (base_path / category).exists()}
+    for item in iter_missing_descriptions():
+        all_missing[item['category']].append(item)
     return all_missing
 
 def print_results(results):
@@ -92,7 +106,7 @@ def print_results(results):
 
                 print(f"  [MISSING] {item['property']}")
                 print(f"     Type: {item['type']}")
-                print(f"     File: {item['file']}")
+                print(f"     File: {format_location(item['file'], item['line'])}")
                 print()
                 total_missing += 1
         else:
@@ -102,12 +116,30 @@ def print_results(results):
     print(f"SUMMARY: {total_missing} properties missing descriptions")
     print(f"{'='*50}")
 
+def list_markdown_files(categories=CATEGORIES):
+    """Return the markdown pages of the analyzed categories."""
+    pages = list_files('docs', '*/*.md')
+    return [md_file for category in categories for md_file in pages if os.path.dirname(md_file) == os.path.join('docs', category)]
+
+def describe_missing(item):
+    """Return the one-line form of a finding used by watch mode."""
+    return f"{format_location(item['file'], item['line'])} {item['property']}: {item['type']}"
+
 def main():
     """Main function."""
+    if watch_enabled():
+        watch(list_markdown_files, lambda md_file: analyze_markdown_file(Path(md_file)), describe_missing)
+        return
+
+    fmt = output_format()
+    if fmt != 'text':
+        emit(iter_missing_descriptions(), fmt, 'analyze_docs')
+        return
+
     print("[ANALYZING] markdown documentation for missing descriptions...")
 
     results = analyze_docs_directory()
     print_results(results)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_profiled('analyze_docs', main)
\ No newline at end of file
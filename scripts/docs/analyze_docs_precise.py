@@ -3,49 +3,36 @@
 Enhanced script to analyze markdown documentation and find missing descriptions,
 accounting for interfaces with the same name in different files.
 """
-import os
-import re
 from pathlib import Path
-import ast
-
-def extract_interface_from_ts_file(file_path, interface_name):
-    """Extract interface definition from TypeScript file."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Pattern to match interface definition
-        pattern = rf'export\s+interface\s+{re.escape(interface_name)}\s*[<\{{]'
-        match = re.search(pattern, content)
-        if match:
-            return {
-                'file': str(file_path),
-                'found': True
-            }
-    except Exception as e:
-        pass
 
-    return {'found': False}
+from dts_index import DTS_PATH, get_dts_index
+from file_cache import FileCache, cache_enabled, tool_version
+from git_scope import get_git_scope
+from line_index import format_location
+from markdown_model import load_document
+from profiling import PROFILER, run_profiled
+from reporting import emit, output_format, progress
+from repo_files import list_files
+from source_index import describe_definition, get_source_index
+from watch import watch, watch_enabled
 
-def find_source_file_for_interface(interface_name, src_path='src'):
-    """Find all TypeScript files that define the given interface."""
-    src_dir = Path(src_path)
-    matching_files = []
+TOOL_VERSION = 1
 
-    # Search all .ts files
-    for ts_file in src_dir.rglob('*.ts'):
-        result = extract_interface_from_ts_file(ts_file, interface_name)
-        if result['found']:
-            matching_files.append(str(ts_file))
+# Tags whose presence in a property's JSDoc interferes with the generated docs
+ANNOTATION_TAGS = {'type', 'property', 'method', 'param', 'returns'}
 
-    return matching_files
+def find_source_file_for_interface(interface_name, src_path='src'):
+    """Find all TypeScript files that define the given interface."""
+    # The docs pages are generated from types.d.ts, so resolve through its declarations
+    dts_index = get_dts_index(src_path=src_path)
+    if dts_index is not None and dts_index.lookup(interface_name, 'interface'):
+        return dts_index.source_files(interface_name, 'interface')
+    return get_source_index(src_path).files_defining(interface_name, 'interface')
 
-def analyze_markdown_file_detailed(file_path):
+def analyze_markdown_file_detailed(file_path, scope=None):
     """Analyze a single markdown file for missing descriptions with more detail."""
     missing_descriptions = []
-
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    document = load_document(file_path, scope)
 
     # Extract interface name from file path
     interface_name = file_path.stem
@@ -53,32 +40,15 @@ def analyze_markdown_file_detailed(file_path):
     # Find corresponding source files
     source_files = find_source_file_for_interface(interface_name)
 
-    # Pattern to find property sections: ### propertyName followed by ```ts code block
-    property_pattern = r'###\s+(\w+)\s*\n\s*```ts\s*\n([^`]+)\n```\s*(?:\n\s*\n|$)'
-
-    matches = re.finditer(property_pattern, content, re.MULTILINE)
-
-    for match in matches:
-        property_name = match.group(1)
-        type_definition = match.group(2).strip()
-
-        # Check if there's descriptive text after the code block
-        end_pos = match.end()
-        remaining_content = content[end_pos:].strip()
-
-        # Look for the next ### or end of file
-        next_section = re.search(r'\n###\s+\w+', remaining_content)
-        if next_section:
-            description_section = remaining_content[:next_section.start()].strip()
-        else:
-            description_section = remaining_content.strip()
-
+    # Property sections: ### propertyName followed by ```ts code block
+    for heading, code_block, description_section in document.property_sections():
         # If description section is empty or very short, it's likely missing
         if not description_section or len(description_section) < 10:
             missing_descriptions.append({
-                'property': property_name,
-                'type': type_definition,
+                'property': heading['text'],
+                'type': document.code(code_block).strip(),
                 'file': str(file_path),
+                'line': document.lines.line(heading['start']),
                 'interface_name': interface_name,
                 'source_files': source_files,
                 'source_count': len(source_files)
@@ -88,78 +58,119 @@ def analyze_markdown_file_detailed(file_path):
 
 def check_jsdoc_in_source_file(file_path, interface_name, property_name):
     """Check if a property has proper JSDoc in the source file."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Find the interface
-        interface_pattern = rf'export\s+interface\s+{re.escape(interface_name)}\s*[<\{{]'
-        interface_match = re.search(interface_pattern, content)
-
-        if not interface_match:
-            return {'found_interface': False}
-
-        # Find the property within the interface
-        # This is a simplified approach - in practice, you'd need a proper TypeScript parser
-        property_pattern = rf'{re.escape(property_name)}\s*[?:]'
-        property_match = re.search(property_pattern, content[interface_match.start():])
-
-        if not property_match:
-            return {'found_interface': True, 'found_property': False}
-
-        # Check for JSDoc before the property
-        prop_start = interface_match.start() + property_match.start()
-        before_prop = content[:prop_start]
-
-        # Look for JSDoc comment immediately before the property
-        jsdoc_pattern = r'/\*\*[\s\S]*?\*/'
-        jsdoc_matches = list(re.finditer(jsdoc_pattern, before_prop))
-
-        if jsdoc_matches:
-            last_jsdoc = jsdoc_matches[-1]
-            # Check if the JSDoc is close to the property (within 100 characters)
-            if prop_start - last_jsdoc.end() < 100:
-                jsdoc_content = last_jsdoc.group(0)
-                # Check if it contains @type or other problematic annotations
-                has_annotations = bool(re.search(r'@(type|property|method|param|returns)', jsdoc_content))
-                return {
-                    'found_interface': True,
-                    'found_property': True,
-                    'has_jsdoc': True,
-                    'has_annotations': has_annotations,
-                    'jsdoc_content': jsdoc_content
-                }
+    # Members come from the interface body itself, so a property of a later interface never matches
+    members = get_source_index().members(file_path, interface_name)
+    if members is None:
+        return {'found_interface': False}
+
+    member = members.get(property_name)
+    if member is None:
+        return {'found_interface': True, 'found_property': False}
 
+    if not member['jsdoc']:
         return {
             'found_interface': True,
             'found_property': True,
             'has_jsdoc': False
         }
 
-    except Exception as e:
-        return {'error': str(e)}
-
-def analyze_docs_directory_detailed():
-    """Analyze all markdown files with detailed source file mapping."""
+    return {
+        'found_interface': True,
+        'found_property': True,
+        'has_jsdoc': True,
+        # Check if it contains @type or other problematic annotations
+        'has_annotations': bool(ANNOTATION_TAGS.intersection(member['tags'])),
+        'jsdoc': member['jsdoc']
+    }
+
+def source_state(src_file, interface_name, property_name):
+    """Return the JSDoc state of a property in one source file."""
+    jsdoc_info = check_jsdoc_in_source_file(src_file, interface_name, property_name)
+    if not jsdoc_info.get('found_property'):
+        return 'NOT_FOUND'
+    if not jsdoc_info.get('has_jsdoc'):
+        return 'ADD_JSDOC'
+    if jsdoc_info.get('has_annotations'):
+        return 'FIX_NEEDED'
+    return 'OK'
+
+def source_status(src_file, interface_name, property_name):
+    """Describe the JSDoc state of a property in one source file."""
+    state = source_state(src_file, interface_name, property_name)
+    if state == 'NOT_FOUND':
+        return f"[NOT_FOUND] Property not found in {src_file}"
+    if state == 'ADD_JSDOC':
+        return "[ADD_JSDOC] Missing JSDoc"
+    if state == 'FIX_NEEDED':
+        return "[FIX_NEEDED] JSDoc with annotations"
+    return "[OK] Has proper JSDoc"
+
+def with_source_states(item):
+    """Return a finding with the JSDoc state of the property in each source file."""
+    conflict = get_source_index().conflict(item['interface_name'])
+    return {
+        **item,
+        'sources': [
+            {'file': src_file, 'state': source_state(src_file, item['interface_name'], item['property'])}
+            for src_file in item['source_files']
+        ],
+        'conflict': conflict['conflict'] if conflict else None,
+    }
+
+def describe_missing(item):
+    """Return the one-line form of a finding, with its source state, used by watch mode."""
+    statuses = [f"{src_file} {source_status(src_file, item['interface_name'], item['property'])}" for src_file in item['source_files']]
+    return f"{format_location(item['file'], item['line'])} {item['interface_name']}.{item['property']} | {'; '.join(statuses) or 'no source file'}"
+
+def pages_depending_on(changed):
+    """Return the interface pages whose source files or types.d.ts declaration changed."""
+    pages = set()
+    for md_file in list_files('docs/interfaces', '*.md'):
+        if DTS_PATH in changed or set(find_source_file_for_interface(Path(md_file).stem)) & changed:
+            pages.add(md_file)
+    return pages
+
+def iter_missing_detailed():
+    """Yield the missing descriptions of the interface pages as they are found."""
     base_path = Path('docs')
     category_path = base_path / 'interfaces'
 
     if not category_path.exists():
-        print(f"Directory {category_path} not found")
-        return []
-
-    all_missing = []
+        progress(f"Directory {category_path} not found")
+        return
 
     # Find all .md files in interfaces
-    md_files = list(category_path.glob('*.md'))
+    with PROFILER.stage('walk'):
+        md_files = [Path(md_file) for md_file in list_files(category_path, '*.md')]
+    scope = get_git_scope()
+    if scope is not None:
+        md_files = scope.filter(md_files)
 
-    print(f"\nAnalyzing {len(md_files)} interface files...")
+    progress(f"\nAnalyzing {len(md_files)} interface files...")
+
+    cache = FileCache('analyze_docs_precise', tool_version(__file__, TOOL_VERSION), cache_enabled())
 
     for md_file in md_files:
-        missing = analyze_markdown_file_detailed(md_file)
-        all_missing.extend(missing)
+        with PROFILER.file(md_file):
+            hit, missing = cache.lookup(md_file)
+            if hit:
+                # Source locations come from the index, which tracks src/ edits on its own
+                source_files = find_source_file_for_interface(md_file.stem)
+                for item in missing:
+                    item['source_files'] = source_files
+                    item['source_count'] = len(source_files)
+            else:
+                missing = analyze_markdown_file_detailed(md_file, scope)
+                cache.store(md_file, missing)
+        yield from missing
+
+    if scope is None:
+        cache.retain(md_files)
+    cache.save()
 
-    return all_missing
+def analyze_docs_directory_detailed():
+    """Analyze all markdown files with detailed source file mapping."""
+    return list(iter_missing_detailed())
 
 def print_detailed_results(results):
     """Print detailed results with source file analysis."""
@@ -195,26 +206,23 @@ def print_detailed_results(results):
         else:
             print(f"[ERROR] No source file found!")
 
+        # Other declarations of the name, of any kind, that the page may mix up
+        conflict = get_source_index().conflict(interface_name)
+        if conflict:
+            print(f"[CONFLICT] {conflict['conflict']}")
+            for definition in conflict['definitions']:
+                print(f"   - {describe_definition(definition)}")
+
         print()
 
         for item in items:
             print(f"  [MISSING] {item['property']}")
             print(f"     Type: {item['type']}")
-            print(f"     Docs: {item['file']}")
+            print(f"     Docs: {format_location(item['file'], item['line'])}")
 
             # Analyze source files for this property
             for src_file in item['source_files']:
-                jsdoc_info = check_jsdoc_in_source_file(src_file, interface_name, item['property'])
-                if jsdoc_info.get('found_property'):
-                    if jsdoc_info.get('has_jsdoc'):
-                        if jsdoc_info.get('has_annotations'):
-                            print(f"     [FIX_NEEDED] JSDoc with annotations")
-                        else:
-                            print(f"     [OK] Has proper JSDoc")
-                    else:
-                        print(f"     [ADD_JSDOC] Missing JSDoc")
-                else:
-                    print(f"     [NOT_FOUND] Property not found in {src_file}")
+                print(f"     {source_status(src_file, interface_name, item['property'])}")
 
             print()
             total_missing += 1
@@ -225,10 +233,24 @@ def print_detailed_results(results):
 
 def main():
     """Main function."""
+    if watch_enabled():
+        watch(
+            lambda: list_files('docs/interfaces', '*.md'),
+            lambda md_file: analyze_markdown_file_detailed(Path(md_file)),
+            describe_missing,
+            pages_depending_on,
+        )
+        return
+
+    fmt = output_format()
+    if fmt != 'text':
+        emit((with_source_states(item) for item in iter_missing_detailed()), fmt, 'analyze_docs_precise')
+        return
+
     print("[ANALYZING] Detailed analysis of markdown documentation for missing descriptions...")
 
     results = analyze_docs_directory_detailed()
     print_detailed_results(results)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_profiled('analyze_docs_precise', main)
\ No newline at end of file
@@ -3,50 +3,87 @@ import os
 import re
 from pathlib import Path
 
+from file_cache import FileCache, cache_enabled, tool_version
+from git_scope import get_git_scope
+from markdown_model import load_document
+from profiling import PROFILER, run_profiled
+from reporting import emit, output_format, progress
+from repo_files import list_files
+
+TOOL_VERSION = 1
+
 # Directory containing the markdown files
 docs_dir = Path("docs")
 
-# Pattern to find code blocks and check for descriptions
-pattern = r'```ts\s*\n([^`]+)\n```\s*\n?'
+def check_md_file(md_file, scope=None):
+    """Return the status line for a single markdown file"""
+    document = load_document(md_file, scope)
 
-def analyze_md_files():
-    """Analyze all markdown files in docs directory for missing descriptions"""
+    # Find code blocks
+    matches = [
+        block for block in document.code_blocks('ts')
+        if document.is_plain_code(block)
+    ]
+
+    if not matches:
+        return f"[NO_CODE_BLOCK] {md_file.name} - No TypeScript code block found"
+
+    # Check if there's any text between the first code block and the next one
+    end = matches[1]['start'] if len(matches) > 1 else len(document.data)
+    after_code = document.stripped_text(matches[0]['end'], end)
+    if not after_code or len(after_code) < 10:
+        return f"[NEEDS_FIX] {md_file.name} - Missing or too short JSDoc description"
+    return f"[OK] {md_file.name} - Has description"
+
+def iter_md_statuses():
+    """Yield the status of every analyzed markdown file as it is checked"""
     types_dir = docs_dir / "types"
     interfaces_dir = docs_dir / "interfaces"
     classes_dir = docs_dir / "classes"
 
     all_dirs = [types_dir, interfaces_dir, classes_dir]
 
-    issues_found = []
-    files_analyzed = 0
+    analyzed_files = []
+    cache = FileCache('analyze_types_docs', tool_version(__file__, TOOL_VERSION), cache_enabled())
+    scope = get_git_scope()
 
     for directory in all_dirs:
         if not directory.exists():
             continue
 
-        print(f"\n=== Analyzing {directory} ===")
+        progress(f"\n=== Analyzing {directory} ===")
 
-        for md_file in directory.glob("*.md"):
-            files_analyzed += 1
-            content = md_file.read_text(encoding='utf-8')
+        md_files = [Path(md_file) for md_file in list_files(directory, "*.md")]
+        for md_file in md_files if scope is None else scope.filter(md_files):
+            analyzed_files.append(md_file)
 
-            # Find code blocks
-            matches = re.findall(pattern, content)
+            with PROFILER.file(md_file):
+                hit, status = cache.lookup(md_file)
+                if not hit:
+                    status = check_md_file(md_file, scope)
+                    cache.store(md_file, status)
 
-            if not matches:
-                issues_found.append(f"[NO_CODE_BLOCK] {md_file.name} - No TypeScript code block found")
-                continue
+            yield {
+                'file': str(md_file),
+                'status': status[1:status.index(']')],
+                'message': status
+            }
 
-            # Check if there's any text after the code block
-            parts = re.split(pattern, content)
-            if len(parts) >= 3:
-                after_code = parts[2].strip()
-                if not after_code or len(after_code) < 10:
-                    issues_found.append(f"[NEEDS_FIX] {md_file.name} - Missing or too short JSDoc description")
-                else:
-                    print(f"[OK] {md_file.name} - Has description")
-            else:
-                issues_found.append(f"[NEEDS_FIX] {md_file.name} - Missing JSDoc description")
+    if scope is None:
+        cache.retain(analyzed_files)
+    cache.save()
+
+def analyze_md_files():
+    """Analyze all markdown files in docs directory for missing descriptions"""
+    issues_found = []
+    files_analyzed = 0
+
+    for result in iter_md_statuses():
+        files_analyzed += 1
+        if result['status'] == 'OK':
+            print(result['message'])
+        else:
+            issues_found.append(result['message'])
 
     print(f"\n=== SUMMARY ===")
     print(f"Files analyzed: {files_analyzed}")
@@ -59,5 +96,14 @@ def analyze_md_files():
     else:
         print("\n[OK] All files have proper descriptions!")
 
+def main():
+    """Report the markdown files with missing descriptions in the selected format"""
+    fmt = output_format()
+    if fmt != 'text':
+        emit((result for result in iter_md_statuses() if result['status'] != 'OK'), fmt, 'analyze_types_docs')
+        return
+
+    analyze_md_files()
+
 if __name__ == "__main__":
-    analyze_md_files()
\ No newline at end of file
+    run_profiled('analyze_types_docs', main)
\ No newline at end of file
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Atomic file writes for the mutator scripts.
+
+Mirrors src/utils/writeFileAtomic.ts: new contents go to a temporary file in
+the target's directory, are flushed to disk and then renamed over the target,
+so a file is never left half-written. write_files_atomic extends this to a
+batch: every temporary file is written before the first rename, and a failure
+or Ctrl-C at any point leaves the whole tree as it was.
+"""
+import os
+import secrets
+import shutil
+
+TMP_FILE_PREFIX = '.tmp-'
+
+def _write_temp(file_path, content):
+    """Write content to a temporary file next to file_path and return its path."""
+    directory, filename = os.path.split(file_path)
+    tmp_path = os.path.join(directory, f"{TMP_FILE_PREFIX}{secrets.token_hex(6)}-{filename}")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(file_path):
+            shutil.copymode(file_path, tmp_path)
+    except BaseException:
+        _discard(tmp_path)
+        raise
+    return tmp_path
+
+def _discard(tmp_path):
+    try:
+        os.unlink(tmp_path)
+    except OSError:
+        pass
+
+def write_file_atomic(file_path, content):
+    """Replace a file with new contents through a temporary file and a rename."""
+    os.replace(_write_temp(file_path, content), file_path)
+
+def write_files_atomic(rewrites):
+    """Apply {path: (old contents, new contents)} all-or-nothing.
+
+    Every temporary file is written first; if that fails nothing is renamed.
+    If a rename fails, the files already replaced get their old contents back.
+    """
+    tmp_paths = {}
+    try:
+        for file_path, (_, new_content) in rewrites.items():
+            tmp_paths[file_path] = _write_temp(file_path, new_content)
+    except BaseException:
+        for tmp_path in tmp_paths.values():
+            _discard(tmp_path)
+        raise
+
+    replaced = []
+    try:
+        for file_path, tmp_path in tmp_paths.items():
+            os.replace(tmp_path, file_path)
+            replaced.append(file_path)
+    except BaseException:
+        for file_path in replaced:
+            write_file_atomic(file_path, rewrites[file_path][0])
+        for file_path, tmp_path in tmp_paths.items():
+            if file_path not in replaced:
+                _discard(tmp_path)
+        raise
\ No newline at end of file
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the docs scripts.
+
+Generates synthetic corpora shaped like this repository (src/functions/*,
+src/lib/services/*, src/interfaces/*, a types.d.ts rollup and the generated
+docs/interfaces, docs/functions, docs/types and docs/classes pages) at
+several multiples of its size. The core function of every script is timed
+on each corpus in a fresh process with cold caches, and the results are
+recorded as JSON.
+
+The run fails when a timing regresses past --threshold against a baseline
+results file, or when a script grows faster than --max-exponent with the
+corpus size (1.0 is linear, 2.0 quadratic).
+
+Usage:
+    python scripts/docs/benchmark.py [--scales 1,10,100] [--only NAME,...]
+                                     [--baseline FILE] [--threshold 1.5]
+                                     [--max-exponent 1.5] [--output FILE] [--keep]
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:
+    # POSIX only; peak memory is reported as n/a on Windows
+    resource = None
+
+from file_cache import CACHE_DIR
+
+# Entities per 1x corpus, close to the counts of this repository
+FUNCTIONS = 100
+SERVICES = 100
+INTERFACE_FILES = 40
+INTERFACES_PER_FILE = 4
+TYPES = 100
+
+FUNCTION_GROUPS = ['setup', 'commit', 'target', 'common', 'dump', 'history', 'test', 'alias']
+SERVICE_GROUPS = ['connection', 'public', 'schema', 'validation', 'meta', 'base']
+
+# Timings below this are too noisy to compare
+MIN_SECONDS = 0.05
+
+DEFAULT_OUTPUT = CACHE_DIR / 'benchmark.json'
+
+def _jsdoc(lines, indent=''):
+    return '\n'.join([f'{indent}/**'] + [f'{indent} * {line}' for line in lines] + [f'{indent} */'])
+
+def _function_source(i, rng):
+    params = [('clientId', 'string'), ('schema', f'IWidget{i % (INTERFACE_FILES * INTERFACES_PER_FILE)}Schema')]
+    params += [(f'option{n}', rng.choice(['number', 'Record<string, unknown>', 'boolean'])) for n in range(rng.randint(0, 2))]
+
+    description = [f'Performs widget operation {i} for the given client.', 'Resolves once the swarm has processed the request.']
+    roll = rng.random()
+    if roll < 0.1:
+        description.append(f'@type {{Function}}')
+    if roll > 0.15:
+        description.extend(f'@param {{{type_}}} {name} - The {name} argument.' for name, type_ in params)
+    description.append('@returns {Promise<string>} The operation result.')
+
+    signature = ', '.join(f'{name}: {type_}' for name, type_ in params)
+    return '\n'.join([
+        f'import {{ IWidget{i}Schema }} from "../../interfaces/Widget{i}.interface";',
+        f'import swarm from "../../lib";',
+        '',
+        f'const METHOD_NAME = "function.widget.doWidget{i}";',
+        '',
+        _jsdoc(description),
+        f'export async function doWidget{i}({signature}) {{',
+        f'  swarm.loggerService.log(METHOD_NAME, {{ clientId }});',
+        f'  const result = await swarm.widgetPublicService.run(`${{clientId}}:{i}`, schema);',
+        f'  return String(result);',
+        '}',
+        '',
+        f'export default doWidget{i};',
+        '',
+    ])
+
+def _service_source(i, rng):
+    lines = [
+        'import { inject } from "../../core/di";',
+        'import TYPES from "../../core/types";',
+        '',
+        _jsdoc([f'Service managing widget {i} connections in the swarm system.', '@implements {IWidgetService}']),
+        f'export class Widget{i}Service {{',
+    ]
+    for n in range(4):
+        lines += [
+            _jsdoc([f'Dependency {n} injected via DI.', '@private'], '  '),
+            f'  private readonly dependency{n} = inject<Dependency{n}>(TYPES.dependency{n});',
+            '',
+        ]
+    for n in range(rng.randint(3, 8)):
+        tags = [f'Handles request kind {n} for a client.']
+        if rng.random() < 0.7:
+            tags += ['@param clientId - The client identifier.', '@param payload - The request payload.']
+        lines += [
+            _jsdoc(tags, '  '),
+            f'  public handle{n} = async (clientId: string, payload: {{ value: number; label?: string }}) => {{',
+            f'    if (payload.value > {n}) {{',
+            f'      return this.dependency{n % 4}.run(clientId, payload);',
+            '    }',
+            '    return null;',
+            '  };',
+            '',
+        ]
+    lines += ['}', '', f'export default Widget{i}Service;', '']
+    return '\n'.join(lines)
+
+def _interface_members(name, rng):
+    members = []
+    for n in range(rng.randint(4, 9)):
+        member = rng.choice(['name', 'value', 'callbacks', 'timeout', 'handler', 'label', 'items', 'options']) + str(n)
+        type_ = rng.choice(['string', 'number', 'string[]', f'(clientId: string, {member}: number) => Promise<void>', 'Partial<IWidgetCallbacks>'])
+        members.append((member, type_, rng.random() < 0.85, rng.random() < 0.1))
+    return members
+
+def _interface_source(file_index, interfaces):
+    lines = ['import { IWidgetCallbacks } from "./Callbacks.interface";', '']
+    for name, members in interfaces:
+        lines += [_jsdoc([f'Schema of {name}.']), f'export interface {name} {{']
+        for member, type_, documented, annotated in members:
+            if documented:
+                lines.append(_jsdoc([f'The {member} of the widget.'] + (['@property'] if annotated else []), '  '))
+            lines.append(f'  {member}: {type_};')
+        lines += ['}', '']
+    return '\n'.join(lines)
+
+def _front_matter(kind, name):
+    return f'---\ntitle: docs/api-reference/{kind}/{name}\ngroup: docs\n---\n\n# {name}\n'
+
+def _interface_page(name, members, rng):
+    parts = [_front_matter('interface', name), '## Properties\n']
+    for member, type_, documented, _ in members:
+        parts.append(f'### {member}\n\n```ts\n{member}: {type_}\n```\n')
+        if documented and rng.random() < 0.9:
+            parts.append(f'The {member} of the widget, used by the swarm when it is set.\n')
+    return '\n'.join(parts)
+
+def _function_page(i, rng):
+    rows = '\n'.join(
+        f'| `{name}` | {"" if rng.random() < 0.1 else f"The {name} argument."} |'
+        for name in ['clientId', 'schema']
+    )
+    return '\n'.join([
+        _front_matter('function', f'doWidget{i}'),
+        f'```ts\ndeclare function doWidget{i}(clientId: string, schema: IWidget{i}Schema): Promise<string>;\n```\n',
+        f'Performs widget operation {i} for the given client.\n',
+        '## Parameters\n',
+        '| Parameter | Description |\n|-----------|-------------|\n' + rows + '\n',
+    ])
+
+def _type_page(i, rng):
+    description = '' if rng.random() < 0.1 else f'Kind of widget {i}, used to route requests.\n'
+    return '\n'.join([
+        _front_matter('type', f'WidgetKind{i}'),
+        f'```ts\ntype WidgetKind{i} = "alpha" | "beta" | "gamma{i}";\n```\n',
+        description,
+    ])
+
+def _class_page(i, rng):
+    parts = [_front_matter('class', f'Widget{i}Service'), '## Constructor\n', '```ts\nconstructor();\n```\n', '## Properties\n']
+    for n in range(rng.randint(3, 8)):
+        parts.append(f'### handle{n}\n\n```ts\nhandle{n}: (clientId: string, payload: any) => Promise<any>\n```\n')
+        if rng.random() < 0.8:
+            parts.append(f'Handles request kind {n} for a client.\n')
+    return '\n'.join(parts)
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+    return len(text)
+
+def generate_corpus(root, scale, seed=0):
+    """Write a synthetic corpus scale times the size of this repository and return its statistics."""
+    rng = random.Random(seed)
+    root = Path(root)
+    total_bytes = 0
+    src_files = 0
+    docs_files = 0
+    dts = []
+
+    interface_index = 0
+    for file_index in range(INTERFACE_FILES * scale):
+        interfaces = []
+        for _ in range(INTERFACES_PER_FILE):
+            name = f'IWidget{interface_index}Schema'
+            interfaces.append((name, _interface_members(name, rng)))
+            interface_index += 1
+        source = _interface_source(file_index, interfaces)
+        total_bytes += _write(root / 'src' / 'interfaces' / f'Widget{file_index}.interface.ts', source)
+        src_files += 1
+        for name, members in interfaces:
+            total_bytes += _write(root / 'docs' / 'interfaces' / f'{name}.md', _interface_page(name, members, rng))
+            docs_files += 1
+        dts.append(source.split('\n', 2)[2].replace('export interface', 'interface'))
+
+    for i in range(FUNCTIONS * scale):
+        group = FUNCTION_GROUPS[i % len(FUNCTION_GROUPS)]
+        source = _function_source(i, rng)
+        total_bytes += _write(root / 'src' / 'functions' / group / f'doWidget{i}.ts', source)
+        total_bytes += _write(root / 'docs' / 'functions' / f'doWidget{i}.md', _function_page(i, rng))
+        src_files += 1
+        docs_files += 1
+        start = source.index('/**')
+        end = source.index(') {', start)
+        dts.append(source[start:end + 1].replace('export async function', 'declare function') + ': Promise<string>;')
+
+    for i in range(SERVICES * scale):
+        group = SERVICE_GROUPS[i % len(SERVICE_GROUPS)]
+        total_bytes += _write(root / 'src' / 'lib' / 'services' / group / f'Widget{i}Service.ts', _service_source(i, rng))
+        total_bytes += _write(root / 'docs' / 'classes' / f'Widget{i}Service.md', _class_page(i, rng))
+        src_files += 1
+        docs_files += 1
+        dts.append(f'/**\n * Service managing widget {i} connections in the swarm system.\n */\ndeclare class Widget{i}Service {{\n    private readonly dependency0;\n}}')
+
+    for i in range(TYPES * scale):
+        total_bytes += _write(root / 'docs' / 'types' / f'WidgetKind{i}.md', _type_page(i, rng))
+        docs_files += 1
+        dts.append(f'/**\n * Kind of widget {i}.\n */\ntype WidgetKind{i} = "alpha" | "beta" | "gamma{i}";')
+
+    exports = [f'doWidget{i}' for i in range(FUNCTIONS * scale)]
+    dts.append(f'export {{ {", ".join(exports)} }};')
+    total_bytes += _write(root / 'types.d.ts', '\n'.join(dts) + '\n')
+
+    return {'src_files': src_files, 'docs_files': docs_files, 'bytes': total_bytes}
+
+def _bench_source_index():
+    from source_index import build_source_index
+    build_source_index(rebuild=True)
+
+def _bench_dts_index():
+    from dts_index import build_dts_index
+    index = build_dts_index(use_cache=False)
+    for declaration in index.iter_declarations():
+        index.source_symbols(declaration)
+
+def _bench_check_jsdoc_annotations():
+    from check_jsdoc_annotations import scan_directory
+    for directory in ['src/functions', 'src/types', 'src/classes']:
+        scan_directory(directory)
+
+def _bench_find_functions_without_params():
+    from find_functions_without_params import find_functions_without_params
+    find_functions_without_params()
+
+def _bench_analyze_docs():
+    from analyze_docs import analyze_docs_directory
+    analyze_docs_directory()
+
+def _bench_analyze_docs_precise():
+    from analyze_docs_precise import analyze_docs_directory_detailed, print_detailed_results
+    print_detailed_results(analyze_docs_directory_detailed())
+
+def _bench_analyze_types_docs():
+    from analyze_types_docs import analyze_md_files
+    analyze_md_files()
+
+def _bench_find_empty_param_descriptions():
+    from find_empty_param_descriptions import find_empty_param_descriptions
+    find_empty_param_descriptions()
+
+def _bench_jsdoc_rules():
+    from jsdoc_rules import RULE_ORDER, apply_rules
+    from repo_files import iter_source_files
+    for file_path in iter_source_files('src'):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            apply_rules(f.read(), RULE_ORDER)
+
+def _bench_verify_changes():
+    from repo_files import iter_source_files
+    from verify_changes import analyze_diff_lines
+    for file_path in iter_source_files('src'):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            # Every JSDoc line of the file shows up as added
+            lines = []
+            in_jsdoc = False
+            for line in f.read().split('\n'):
+                in_jsdoc = in_jsdoc or line.strip().startswith('/**')
+                lines.append(('+' if in_jsdoc else ' ') + line)
+                in_jsdoc = in_jsdoc and '*/' not in line
+        analyze_diff_lines(lines)
+
+BENCHMARKS = {
+    'source_index': _bench_source_index,
+    'dts_index': _bench_dts_index,
+    'check_jsdoc_annotations': _bench_check_jsdoc_annotations,
+    'find_functions_without_params': _bench_find_functions_without_params,
+    'analyze_docs': _bench_analyze_docs,
+    'analyze_docs_precise': _bench_analyze_docs_precise,
+    'analyze_types_docs': _bench_analyze_types_docs,
+    'find_empty_param_descriptions': _bench_find_empty_param_descriptions,
+    'jsdoc_rules': _bench_jsdoc_rules,
+    'verify_changes': _bench_verify_changes,
+}
+
+def peak_rss_kb():
+    """Return the peak resident set size of this process in KB, or None where it is unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def run_one(name):
+    """Time one benchmark in the current directory and print the result as JSON."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        BENCHMARKS[name]()
+        seconds = time.perf_counter() - start
+    print(json.dumps({'seconds': seconds, 'peak_kb': peak_rss_kb()}))
+
+def time_benchmark(name, corpus):
+    """Run one benchmark on a corpus in a fresh process with cold caches."""
+    cache_dir = Path(corpus) / '.cache'
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--run', name, '--no-cache'],
+        cwd=corpus,
+        env={**os.environ, 'DOCS_CACHE_DIR': str(cache_dir)},
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{name} failed: {result.stderr.strip()}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def check_results(results, scales, baseline=None, threshold=1.5, max_exponent=1.5):
+    """Return the list of regressions and superlinear scaling failures."""
+    failures = []
+    for name, timings in results.items():
+        for scale in scales:
+            current = timings.get(str(scale))
+            previous = ((baseline or {}).get(name) or {}).get(str(scale))
+            if current and previous and current['seconds'] >= MIN_SECONDS:
+                if current['seconds'] > previous['seconds'] * threshold:
+                    failures.append(
+                        f"{name} @ {scale}x: {current['seconds']:.3f}s vs baseline {previous['seconds']:.3f}s"
+                    )
+
+        for small, large in zip(scales, scales[1:]):
+            before = timings.get(str(small))
+            after = timings.get(str(large))
+            if not before or not after or before['seconds'] < MIN_SECONDS:
+                continue
+            exponent = math.log(after['seconds'] / before['seconds']) / math.log(large / small)
+            timings[str(large)]['exponent'] = round(exponent, 2)
+            if exponent > max_exponent:
+                failures.append(
+                    f"{name} {small}x -> {large}x: grows as size^{exponent:.2f} (limit {max_exponent})"
+                )
+    return failures
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the docs scripts on synthetic corpora')
+    parser.add_argument('--scales', default='1,10,100', help='corpus sizes as multiples of this repository (default: 1,10,100)')
+    parser.add_argument('--only', help='comma-separated benchmarks to run (default: all)')
+    parser.add_argument('--baseline', help='results file to compare against')
+    parser.add_argument('--threshold', type=float, default=1.5, help='allowed slowdown against the baseline (default: 1.5)')
+    parser.add_argument('--max-exponent', type=float, default=1.5, help='allowed growth exponent between scales (default: 1.5)')
+    parser.add_argument('--output', default=str(DEFAULT_OUTPUT), help=f'results file (default: {DEFAULT_OUTPUT})')
+    parser.add_argument('--corpus-dir', help='directory for the generated corpora (default: a temporary directory)')
+    parser.add_argument('--keep', action='store_true', help='keep the generated corpora')
+    parser.add_argument('--run', help=argparse.SUPPRESS)
+    parser.add_argument('--no-cache', action='store_true', help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+def main():
+    """Generate the corpora, run every benchmark and check the results"""
+    args = parse_args()
+    if args.run:
+        run_one(args.run)
+        return
+
+    scales = sorted(int(scale) for scale in args.scales.split(','))
+    names = args.only.split(',') if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        print(f"Unknown benchmarks: {', '.join(unknown)}")
+        sys.exit(2)
+
+    corpus_root = Path(args.corpus_dir or tempfile.mkdtemp(prefix='docs-benchmark-'))
+    results = {name: {} for name in names}
+    corpora = {}
+
+    try:
+        for scale in scales:
+            corpus = corpus_root / f'{scale}x'
+            shutil.rmtree(corpus, ignore_errors=True)
+            print(f"\n[GENERATING] {scale}x corpus in {corpus}")
+            corpora[str(scale)] = generate_corpus(corpus, scale)
+            stats = corpora[str(scale)]
+            print(f"  {stats['src_files']} source files, {stats['docs_files']} docs pages, {stats['bytes'] // 1024} KB")
+
+            for name in names:
+                result = time_benchmark(name, corpus)
+                results[name][str(scale)] = result
+                memory = 'n/a' if result['peak_kb'] is None else f"{result['peak_kb'] // 1024} MB"
+                print(f"  {name:<32} {result['seconds']:>9.3f}s {memory:>9}")
+
+            if not args.keep:
+                shutil.rmtree(corpus, ignore_errors=True)
+    finally:
+        if not args.keep and not args.corpus_dir:
+            shutil.rmtree(corpus_root, ignore_errors=True)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+
+    failures = check_results(results, scales, baseline, args.threshold, args.max_exponent)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'scales': scales,
+            'corpora': corpora,
+            'results': results,
+            'failures': failures,
+        }, f, indent=2)
+
+    print(f"\n=== SUMMARY ===")
+    print(f"Results: {output}")
+    if failures:
+        print(f"\n=== FAILURES ===")
+        for failure in failures:
+            print(failure)
+        sys.exit(1)
+    print("[OK] No regressions")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
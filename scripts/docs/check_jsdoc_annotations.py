@@ -6,80 +6,135 @@ import os
 import re
 from pathlib import Path
 
-def find_problematic_jsdoc(file_path):
-    """Find JSDoc comments with potentially problematic annotations."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-    except:
-        return []
-
-    issues = []
+from file_cache import FileCache, cache_enabled, tool_version
+from git_scope import get_git_scope
+from line_index import LineIndex, format_location
+from mapped_file import decode
+from profiling import PROFILER, run_profiled
+from reporting import emit, output_format, progress
+from repo_files import list_files
+from ts_lexer import scan_jsdoc_blocks
+from watch import watch, watch_enabled
 
-    # Find JSDoc comments with problematic annotations
-    jsdoc_pattern = r'/\*\*[\s\S]*?\*/'
+TOOL_VERSION = 1
 
-    for match in re.finditer(jsdoc_pattern, content):
-        jsdoc_content = match.group(0)
+PROBLEMATIC_ANNOTATIONS = ['@type', '@property', '@method', '@description', '@param', '@returns']
 
-        # Check for specific problematic annotations
-        problematic_annotations = ['@type', '@property', '@method', '@description', '@param', '@returns']
-        found_annotations = []
+TAG_PATTERN = re.compile(r'@\w+')
 
-        for annotation in problematic_annotations:
-            if annotation in jsdoc_content:
-                found_annotations.append(annotation)
+def find_problematic_jsdoc(file_path, data=None):
+    """Find JSDoc comments with potentially problematic annotations.
 
-        if found_annotations:
-            # Get context around the JSDoc
-            start = max(0, match.start() - 50)
-            end = min(len(content), match.end() + 100)
-            context = content[start:end]
+    data holds the file contents when they do not come from disk (--staged).
+    Only the JSDoc blocks are scanned; the code is never tokenized, and the
+    line table is built only for files with findings.
+    """
+    try:
+        if data is None:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+    except OSError:
+        return []
 
-            issues.append({
-                'file': str(file_path),
-                'annotations': found_annotations,
-                'content': jsdoc_content[:200] + '...' if len(jsdoc_content) > 200 else jsdoc_content,
-                'line': content[:match.start()].count('\n') + 1
-            })
+    issues = []
+    lines = None
+    # latin-1 keeps the offsets of the scan equal to byte offsets
+    for jsdoc in scan_jsdoc_blocks(str(data, 'latin-1')):
+        tags = set(TAG_PATTERN.findall(jsdoc.value))
+        found_annotations = [annotation for annotation in PROBLEMATIC_ANNOTATIONS if annotation in tags]
+        if not found_annotations:
+            continue
+
+        if lines is None:
+            lines = LineIndex(data)
+        line, column = lines.position(jsdoc.start)
+        jsdoc_content = decode(data, jsdoc.start, jsdoc.end)
+        issues.append({
+            'file': str(file_path),
+            'annotations': found_annotations,
+            'content': jsdoc_content[:200] + '...' if len(jsdoc_content) > 200 else jsdoc_content,
+            'line': line,
+            'column': column
+        })
 
     return issues
 
+def iter_directory_issues(directory):
+    """Yield the problematic JSDoc blocks of a directory as its files are checked."""
+    prefix = os.path.join(directory, '')
+    scope = get_git_scope()
+    if scope is not None:
+        # Only the selected files are scanned
+        for ts_file in scope.files(prefix, '.ts'):
+            with PROFILER.file(ts_file):
+                file_issues = find_problematic_jsdoc(ts_file, scope.read(ts_file))
+            yield from file_issues
+        return
+
+    cache = FileCache('check_jsdoc_annotations', tool_version(__file__, TOOL_VERSION), cache_enabled())
+    with PROFILER.stage('walk'):
+        ts_files = list_files(directory, '**/*.ts')
+
+    for ts_file in ts_files:
+        with PROFILER.file(ts_file):
+            hit, file_issues = cache.lookup(ts_file)
+            if not hit:
+                file_issues = find_problematic_jsdoc(ts_file)
+                cache.store(ts_file, file_issues)
+        yield from file_issues
+
+    cache.save()
+
 def scan_directory(directory):
     """Scan directory for TypeScript files with problematic JSDoc."""
-    issues = []
-    ts_files = list(Path(directory).rglob('*.ts'))
+    return list(iter_directory_issues(directory))
 
-    for ts_file in ts_files:
-        file_issues = find_problematic_jsdoc(ts_file)
-        issues.extend(file_issues)
+def iter_issues(directories):
+    """Yield the issues of every existing directory in order."""
+    for directory in directories:
+        if Path(directory).exists():
+            progress(f"\n[SCANNING] {directory}...")
+            yield from iter_directory_issues(directory)
 
-    return issues
+def describe_issue(issue):
+    """Return the one-line form of an issue used by watch mode."""
+    return f"{format_location(issue['file'], issue['line'], issue.get('column'))} {', '.join(issue['annotations'])}"
+
+def watch_directories(directories):
+    """Re-scan the directories whenever their sources change."""
+    watch(
+        lambda: [ts_file for directory in directories for ts_file in list_files(directory, '**/*.ts')],
+        find_problematic_jsdoc,
+        describe_issue,
+    )
 
 def main():
     """Main function."""
-    print("[SCANNING] TypeScript files for potentially problematic JSDoc annotations...")
-
     # Scan specific directories
     directories = ['src/functions', 'src/types', 'src/classes']
-    all_issues = []
+    if watch_enabled():
+        watch_directories(directories)
+        return
 
-    for directory in directories:
-        if Path(directory).exists():
-            print(f"\n[SCANNING] {directory}...")
-            issues = scan_directory(directory)
-            all_issues.extend(issues)
+    fmt = output_format()
+    if fmt != 'text':
+        emit(iter_issues(directories), fmt, 'check_jsdoc_annotations')
+        return
+
+    print("[SCANNING] TypeScript files for potentially problematic JSDoc annotations...")
+
+    all_issues = list(iter_issues(directories))
 
     # Group and display results
     if all_issues:
         print(f"\n[FOUND] {len(all_issues)} potential JSDoc annotation issues:")
 
         for issue in all_issues:
-            print(f"\n📁 {issue['file']}:{issue['line']}")
+            print(f"\n📁 {format_location(issue['file'], issue['line'], issue.get('column'))}")
             print(f"   Annotations: {', '.join(issue['annotations'])}")
             print(f"   Preview: {issue['content'][:100]}...")
     else:
         print("\n✅ No problematic JSDoc annotations found!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_profiled('check_jsdoc_annotations', main)
\ No newline at end of file
@@ -3,94 +3,86 @@ import os
 import re
 from pathlib import Path
 
-def clean_jsdoc_annotations(file_path):
-    """Remove problematic JSDoc annotations from a file"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        original_content = content
-
-        # Remove @type, @description, @param, @returns, @callback annotations
-        # Pattern to match JSDoc comments with these annotations
-        jsdoc_pattern = r'/\*\*\s*\n(\s*\*[^\n]*\n)*\s*\*/'
-
-        def clean_jsdoc_block(match):
-            block = match.group(0)
-            lines = block.split('\n')
-
-            # Check if this block contains problematic annotations
-            has_problematic_annotations = any(
-                '@type' in line or '@description' in line or
-                '@param' in line or '@returns' in line or '@callback' in line
-                for line in lines
-            )
-
-            if has_problematic_annotations:
-                # Extract the description without annotations
-                description_lines = []
-                in_description = False
-
-                for line in lines:
-                    if line.strip().startswith('/**'):
-                        description_lines.append(line)
-                        in_description = True
-                    elif line.strip().startswith('*/'):
-                        description_lines.append(line)
-                        break
-                    elif line.strip().startswith('*') and not any(
-                        f'@{tag}' in line for tag in ['type', 'description', 'param', 'returns', 'callback']
-                    ):
-                        # This is a description line without annotations
-                        description_lines.append(line)
-                    elif line.strip().startswith('* @description'):
-                        # Convert @description line to regular description
-                        desc_text = line.replace('* @description', '*')
-                        if desc_text.strip() != '*':
-                            description_lines.append(desc_text)
-                        in_description = True
-                    elif not line.strip().startswith('* @'):
-                        # Regular line (might be part of description)
-                        if in_description and line.strip().startswith('*'):
-                            description_lines.append(line)
-
-                return '\n'.join(description_lines)
+from file_cache import tool_version
+from jsdoc_rules import rewrite_file
+from profiling import run_profiled
+from reporting import progress
+from runner import run_mutator
+
+TOOL_VERSION = 1
+
+# Remove @type, @description, @param, @returns, @callback annotations
+# Pattern to match JSDoc comments with these annotations
+JSDOC_PATTERN = re.compile(r'/\*\*\s*\n(\s*\*[^\n]*\n)*\s*\*/')
+
+def clean_jsdoc_block(block):
+    """Return the edits removing problematic annotations from a single JSDoc block"""
+    if not JSDOC_PATTERN.fullmatch(block.text):
+        return []
+
+    lines = block.text.split('\n')
+
+    # Check if this block contains problematic annotations
+    has_problematic_annotations = any(
+        '@type' in line or '@description' in line or
+        '@param' in line or '@returns' in line or '@callback' in line
+        for line in lines
+    )
+
+    if not has_problematic_annotations:
+        return []
+
+    # Keep the description without annotations; the first line is always the /** opener,
+    # so every dropped line is removed together with the newline before it
+    edits = []
+    in_description = False
+    line_start = 0
+
+    for line in lines:
+        line_end = line_start + len(line)
+        if line.strip().startswith('/**'):
+            in_description = True
+        elif line.strip().startswith('*/'):
+            if line_end < len(block.text):
+                edits.append((line_end, len(block.text), ''))
+            break
+        elif line.strip().startswith('*') and not any(
+            f'@{tag}' in line for tag in ['type', 'description', 'param', 'returns', 'callback']
+        ):
+            # This is a description line without annotations
+            pass
+        elif line.strip().startswith('* @description'):
+            # Convert @description line to regular description
+            desc_text = line.replace('* @description', '*')
+            if desc_text.strip() != '*':
+                edits.append((line_start, line_end, desc_text))
+            else:
+                edits.append((line_start - 1, line_end, ''))
+            in_description = True
+        elif not line.strip().startswith('* @') and in_description and line.strip().startswith('*'):
+            # Regular line (might be part of description)
+            pass
+        else:
+            edits.append((line_start - 1, line_end, ''))
+        line_start = line_end + 1
+
+    return edits
 
-            return block
-
-        # Apply the cleaning to all JSDoc blocks
-        content = re.sub(jsdoc_pattern, clean_jsdoc_block, content, flags=re.MULTILINE)
-
-        if content != original_content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            return True
-
-        return False
-
-    except Exception as e:
-        print(f"Error processing {file_path}: {e}")
-        return False
+def clean_jsdoc_annotations(file_path):
+    """Return the old and new contents of a file with problematic JSDoc annotations removed"""
+    return rewrite_file(file_path, ['clean'])
 
 def main():
     """Clean remaining problematic annotations from all TypeScript files"""
-    files_processed = 0
-    files_changed = 0
-
-    # Process all .ts files in src directory
-    for root, dirs, files in os.walk('src'):
-        for file in files:
-            if file.endswith('.ts'):
-                file_path = os.path.join(root, file)
-                files_processed += 1
-
-                if clean_jsdoc_annotations(file_path):
-                    files_changed += 1
-                    print(f"[CLEANED] {file_path}")
+    summary = run_mutator('clean_remaining_annotations', clean_jsdoc_annotations, 'CLEANED', tool_version(__file__, TOOL_VERSION), main.__doc__)
+    files_processed = summary['processed']
+    files_changed = summary['changed']
+    files_cached = summary['cached']
 
-    print(f"\n=== SUMMARY ===")
-    print(f"Files processed: {files_processed}")
-    print(f"Files changed: {files_changed}")
+    progress(f"\n=== SUMMARY ===")
+    progress(f"Files processed: {files_processed}")
+    progress(f"Files changed: {files_changed}")
+    progress(f"Files cached: {files_cached}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_profiled('clean_remaining_annotations', main)
\ No newline at end of file
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Declaration index of the types.d.ts rollup.
+
+types.d.ts contains every public declaration of the library in one file, so
+documentation coverage can be checked against it in a single pass instead of
+walking src/. The file is read as bytes and split at its top-level
+declaration boundaries; every declaration is indexed by name and kind and
+mapped back to the src/ file it was rolled up from. Names the bundler
+renamed to avoid collisions (`Action$1`) are resolved by comparing the JSDoc
+and body of the candidate source declarations.
+
+Usage:
+    python scripts/docs/dts_index.py [--missing] [--no-cache]
+"""
+import os
+import re
+import sys
+
+from file_cache import FileCache, cache_enabled, tool_version
+from line_index import format_location
+from profiling import run_profiled
+from repo_files import DTS_PATH
+from source_index import get_source_index, read_span, scan_source
+
+INDEX_VERSION = 1
+
+# `export { a, b as c, type D };` at the end of the rollup
+EXPORT_PATTERN = re.compile(rb'^export\s*\{([^}]*)\}\s*;', re.MULTILINE)
+# Suffix added by the bundler to deduplicate colliding names
+RENAME_SUFFIX = re.compile(r'\$[0-9a-z]+$')
+
+def _fingerprint(text):
+    """Collapse whitespace so a rolled-up declaration compares equal to its source."""
+    return ' '.join(text.split())
+
+def parse_exports(data):
+    """Return {local name: public name} for the export lists of a declaration file."""
+    exports = {}
+    for match in EXPORT_PATTERN.finditer(data):
+        for item in match.group(1).decode('utf-8').split(','):
+            words = item.split()
+            if words and words[0] == 'type':
+                words = words[1:]
+            if not words:
+                continue
+            exports[words[0]] = words[2] if len(words) == 3 and words[1] == 'as' else words[0]
+    return exports
+
+def scan_dts(dts_path=DTS_PATH):
+    """Scan a declaration file and return its top-level declarations."""
+    with open(dts_path, 'rb') as f:
+        data = f.read()
+    # The lexer needs the whole file as text, so a memory map would save nothing here
+    symbols, _ = scan_source(data)
+    exports = parse_exports(data)
+
+    for symbol in symbols:
+        symbol['exported'] = symbol['name'] in exports
+        symbol['public_name'] = exports.get(symbol['name'])
+        symbol['source_name'] = RENAME_SUFFIX.sub('', symbol['name'])
+    return symbols
+
+class DeclarationIndex:
+    """Top-level declarations of a .d.ts rollup, keyed by name."""
+
+    def __init__(self, dts_path, declarations, src_path='src'):
+        self.dts_path = dts_path
+        self.src_path = src_path
+        self.declarations = declarations
+        self.names = {}
+        for declaration in declarations:
+            self.names.setdefault(declaration['name'], []).append(declaration)
+            if declaration['public_name'] and declaration['public_name'] != declaration['name']:
+                self.names.setdefault(declaration['public_name'], []).append(declaration)
+        self._sources = {}
+
+    def lookup(self, name, kind=None):
+        """Return the declarations of name, optionally filtered by kind."""
+        return [
+            declaration for declaration in self.names.get(name, [])
+            if kind is None or declaration['kind'] == kind
+        ]
+
+    def iter_declarations(self, kind=None):
+        """Yield every declaration in file order."""
+        for declaration in self.declarations:
+            if kind is None or declaration['kind'] == kind:
+                yield declaration
+
+    def text(self, declaration, field='span'):
+        """Return the text of a declaration span ('span', 'body' or 'jsdoc')."""
+        return read_span(self.dts_path, declaration[field])
+
+    def source_symbols(self, declaration):
+        """Return the src/ symbols a declaration was rolled up from."""
+        key = tuple(declaration['span'])
+        if key not in self._sources:
+            self._sources[key] = self._resolve_source(declaration)
+        return self._sources[key]
+
+    def source_files(self, name, kind=None):
+        """Return the src/ files defining the declarations of name."""
+        files = []
+        for declaration in self.lookup(name, kind):
+            for symbol in self.source_symbols(declaration):
+                if symbol['file'] not in files:
+                    files.append(symbol['file'])
+        return files
+
+    def invalidate_sources(self):
+        """Forget the resolved source locations after src/ changed."""
+        self._sources = {}
+
+    def _resolve_source(self, declaration):
+        candidates = get_source_index(self.src_path).lookup(declaration['source_name'])
+        same_kind = [symbol for symbol in candidates if symbol['kind'] == declaration['kind']]
+        if same_kind:
+            candidates = same_kind
+        if len(candidates) > 1 and not RENAME_SUFFIX.search(declaration['name']):
+            exported = [symbol for symbol in candidates if symbol['exported']]
+            candidates = exported or candidates
+
+        # Several sources share the name: keep those whose JSDoc, then body, match the rollup
+        for field in ('jsdoc', 'body'):
+            if len(candidates) <= 1 or not declaration[field]:
+                break
+            expected = _fingerprint(self.text(declaration, field))
+            matching = [
+                symbol for symbol in candidates
+                if symbol[field] and _fingerprint(read_span(symbol['file'], symbol[field])) == expected
+            ]
+            if matching:
+                candidates = matching
+
+        return candidates
+
+def build_dts_index(dts_path=DTS_PATH, src_path='src', use_cache=True):
+    """Load the declaration index, rescanning the rollup only when it changed."""
+    cache = FileCache('dts_index', tool_version(__file__, INDEX_VERSION), use_cache)
+    hit, declarations = cache.lookup(dts_path)
+    if not hit:
+        declarations = scan_dts(dts_path)
+        cache.store(dts_path, declarations)
+    cache.retain([dts_path])
+    cache.save()
+    return DeclarationIndex(dts_path, declarations, src_path)
+
+_indexes = {}
+
+def reset_dts_index(dts_path=DTS_PATH):
+    """Drop the process-wide index of dts_path so the next lookup rescans it."""
+    _indexes.pop(dts_path, None)
+
+def invalidate_sources():
+    """Forget the resolved source locations of the loaded indexes after src/ changed."""
+    for index in _indexes.values():
+        if index is not None:
+            index.invalidate_sources()
+
+def get_dts_index(dts_path=DTS_PATH, src_path='src'):
+    """Return the process-wide index of dts_path, or None if the rollup was not built."""
+    if dts_path not in _indexes:
+        _indexes[dts_path] = build_dts_index(dts_path, src_path) if os.path.exists(dts_path) else None
+    return _indexes[dts_path]
+
+def main():
+    """Index types.d.ts and report its JSDoc coverage."""
+    if not os.path.exists(DTS_PATH):
+        print(f"{DTS_PATH} not found, run the build first")
+        return
+
+    index = build_dts_index(use_cache=cache_enabled())
+    show_missing = '--missing' in sys.argv[1:]
+
+    counts = {}
+    missing = []
+    unmapped = 0
+    for declaration in index.iter_declarations():
+        total, documented = counts.get(declaration['kind'], (0, 0))
+        counts[declaration['kind']] = (total + 1, documented + bool(declaration['jsdoc']))
+        if not declaration['jsdoc']:
+            missing.append(declaration)
+        if not index.source_symbols(declaration):
+            unmapped += 1
+
+    print(f"[INDEXED] {len(index.declarations)} declarations in {DTS_PATH}")
+    for kind in sorted(counts):
+        total, documented = counts[kind]
+        print(f"  {kind}: {documented}/{total} documented")
+    print(f"  not mapped to src/: {unmapped}")
+
+    if show_missing and missing:
+        print(f"\n=== DECLARATIONS WITHOUT JSDOC ===")
+        for declaration in missing:
+            sources = ', '.join(symbol['file'] for symbol in index.source_symbols(declaration)) or 'no source found'
+            print(f"[MISSING] {declaration['kind']} {declaration['name']}")
+            print(f"     File: {format_location(DTS_PATH, declaration['line'], declaration['column'])}")
+            print(f"     Source: {sources}")
+
+if __name__ == "__main__":
+    run_profiled('dts_index', main)
\ No newline at end of file
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Offset-splice edits shared by the mutator scripts.
+
+Transforms describe their changes as (start, end, replacement) edits against
+the text they were given instead of rebuilding it with re.sub or list
+splicing. apply_edits checks that the edits do not overlap and produces the
+result in a single pass, and since an edit list is plain data it can be
+inspected or serialized as a patch before anything is written.
+TrackedText runs chained substitutions, each seeing the text the previous
+ones left, and folds them into one edit list against the original text.
+"""
+import os
+
+class EditConflict(ValueError):
+    """Raised when edits overlap or fall outside the text they apply to."""
+
+def apply_edits(text, edits):
+    """Return text with every (start, end, replacement) edit applied.
+
+    Edits refer to offsets in the original text and may be given in any
+    order; insertions at the same offset keep their relative order.
+    """
+    if not edits:
+        return text
+
+    parts = []
+    position = 0
+    for start, end, replacement in sorted(edits, key=lambda edit: (edit[0], edit[1])):
+        if start < position or end < start or end > len(text):
+            raise EditConflict(f"Edit {start}:{end} overlaps a previous edit or is out of range")
+        parts.append(text[position:start])
+        parts.append(replacement)
+        position = end
+    parts.append(text[position:])
+    return ''.join(parts)
+
+def pattern_edits(pattern, text, replacement):
+    """Return the edits pattern.sub(replacement, text) would make.
+
+    replacement is a template such as r'\\1' or a function of the match, as
+    for re.sub; matches it leaves unchanged produce no edit.
+    """
+    edits = []
+    for match in pattern.finditer(text):
+        new = replacement(match) if callable(replacement) else match.expand(replacement)
+        if new != match.group(0):
+            edits.append((match.start(), match.end(), new))
+    return edits
+
+def line_offset(lines, index):
+    """Return the offset of lines[index] in '\\n'.join(lines)."""
+    return sum(len(line) + 1 for line in lines[:index])
+
+def insert_lines(lines, index, new_lines):
+    """Return the edit inserting new_lines before lines[index] of '\\n'.join(lines)."""
+    return (line_offset(lines, index), line_offset(lines, index), '\n'.join(new_lines) + '\n')
+
+class TrackedText:
+    """Text rewritten step by step, with the changes kept as edits against the original.
+
+    Each substitution sees the text as the earlier ones left it, as with
+    chained re.sub calls. The edits stay sorted, and overlapping or adjacent
+    ones are merged, so they can be passed to apply_edits in one go.
+    """
+
+    def __init__(self, original):
+        self.original = original
+        self.text = original
+        self.edits = []
+
+    def replace(self, start, end, replacement):
+        """Replace text[start:end] of the current text and fold the change into the edits."""
+        # Leave the unchanged ends of the replaced span out of the edit
+        old = self.text[start:end]
+        prefix = len(os.path.commonprefix([old, replacement]))
+        start += prefix
+        old, replacement = old[prefix:], replacement[prefix:]
+        suffix = len(os.path.commonprefix([old[::-1], replacement[::-1]]))
+        end -= suffix
+        replacement = replacement[:len(replacement) - suffix]
+        if start == end and not replacement:
+            return
+        before, touched, after = [], [], []
+        # Length change of the edits before start, and of those up to end
+        delta_before = delta_through = 0
+        position = 0
+        for edit in self.edits:
+            edit_start, edit_end, edit_text = edit
+            current_start = edit_start + position
+            current_end = current_start + len(edit_text)
+            growth = len(edit_text) - (edit_end - edit_start)
+            if current_end < start:
+                before.append(edit)
+                delta_before += growth
+                delta_through += growth
+            elif current_start > end:
+                after.append(edit)
+            else:
+                touched.append((edit, current_start, current_end))
+                delta_through += growth
+            position += growth
+
+        merged_start, merged_end = start, end
+        original_start = start - delta_before
+        original_end = end - delta_through
+        if touched:
+            (first, first_start, _), (last, _, last_end) = touched[0], touched[-1]
+            if first_start <= start:
+                merged_start, original_start = first_start, first[0]
+            if last_end >= end:
+                merged_end, original_end = last_end, last[1]
+
+        merged_text = self.text[merged_start:start] + replacement + self.text[end:merged_end]
+        self.edits = before + [(original_start, original_end, merged_text)] + after
+        self.text = self.text[:start] + replacement + self.text[end:]
+
+    def sub(self, pattern, replacement):
+        """Apply pattern.sub(replacement) to the current text."""
+        # From the last match back, so the earlier offsets stay valid
+        for start, end, new in reversed(pattern_edits(pattern, self.text, replacement)):
+            self.replace(start, end, new)
\ No newline at end of file
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Content-hash incremental cache shared by the docs scripts.
+
+Every tool keeps its own cache file in scripts/docs/.cache with one entry per
+processed file: the file size, modification time, content hash and the
+per-file result (findings for analyzers, "already normalized" for mutators).
+The cache is invalidated as a whole when the tool version or any of the
+scripts changes, so stale results never survive an edit to the tooling.
+
+Cache files are written with marshal, which encodes the plain dicts and
+lists of the results several times faster than json and more compactly.
+Its format is tied to the Python version, so that is part of the key too,
+and a cache is only rewritten when one of its entries changed.
+"""
+import hashlib
+import marshal
+import os
+import sys
+from pathlib import Path
+
+# DOCS_CACHE_DIR relocates the cache, e.g. for the benchmark corpora
+CACHE_DIR = Path(os.environ.get('DOCS_CACHE_DIR') or Path(__file__).resolve().parent / '.cache')
+
+CACHE_SUFFIX = '.marshal'
+
+PYTHON_VERSION = '.'.join(map(str, sys.version_info[:2]))
+
+def cache_path(tool):
+    """Return the path of a tool's cache file."""
+    return CACHE_DIR / f'{tool}{CACHE_SUFFIX}'
+
+def content_hash(data):
+    """Return the hex digest used to identify file contents."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def tool_version(script_path, version):
+    """Combine a tool's declared version with a hash of the scripts it is built from.
+
+    Every module in the script's directory is hashed, so editing a shared
+    helper invalidates the results of the tools that depend on it.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for module_path in sorted(Path(script_path).resolve().parent.glob('*.py')):
+        try:
+            digest.update(module_path.read_bytes())
+        except OSError:
+            continue
+    return f"{version}:{digest.hexdigest()}"
+
+class FileCache:
+    """Per-tool cache of per-file results keyed on content hash."""
+
+    def __init__(self, tool, version, enabled=True):
+        self.path = cache_path(tool)
+        self.version = version
+        self.enabled = enabled
+        self.entries = {}
+        self.dirty = False
+        self._pending = {}
+
+        if enabled and self.path.exists():
+            try:
+                with open(self.path, 'rb') as f:
+                    stored = marshal.load(f)
+                if stored.get('version') == version and stored.get('python') == PYTHON_VERSION:
+                    self.entries = stored['entries']
+            except (OSError, ValueError, EOFError, TypeError, KeyError, AttributeError):
+                self.entries = {}
+
+    def lookup(self, file_path):
+        """Return (hit, result) for a file, trusting size and mtime before hashing."""
+        if not self.enabled:
+            return False, None
+
+        file_path = str(file_path)
+        stat = os.stat(file_path)
+        entry = self.entries.get(file_path)
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return True, entry['result']
+
+        with open(file_path, 'rb') as f:
+            digest = content_hash(f.read())
+        self._pending[file_path] = (stat.st_mtime_ns, stat.st_size, digest)
+
+        if entry and entry['hash'] == digest:
+            # Touched but not edited: refresh the stat signature and reuse the result
+            entry['mtime_ns'] = stat.st_mtime_ns
+            entry['size'] = stat.st_size
+            self.dirty = True
+            return True, entry['result']
+
+        return False, None
+
+    def store(self, file_path, result):
+        """Record the result for the current contents of a file."""
+        if not self.enabled:
+            return
+
+        file_path = str(file_path)
+        stat = os.stat(file_path)
+        pending = self._pending.pop(file_path, None)
+        if pending and pending[0] == stat.st_mtime_ns and pending[1] == stat.st_size:
+            digest = pending[2]
+        else:
+            with open(file_path, 'rb') as f:
+                digest = content_hash(f.read())
+
+        self.entries[file_path] = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'hash': digest,
+            'result': result,
+        }
+        self.dirty = True
+
+    def discard(self, file_path):
+        """Forget the result recorded for a file."""
+        if self.entries.pop(str(file_path), None) is not None:
+            self.dirty = True
+
+    def retain(self, file_paths):
+        """Drop entries for files that are no longer part of the run."""
+        keep = {str(file_path) for file_path in file_paths}
+        for file_path in list(self.entries):
+            if file_path not in keep:
+                del self.entries[file_path]
+                self.dirty = True
+
+    def save(self):
+        """Write the cache back to disk if anything changed."""
+        if not self.enabled or not self.dirty:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # A per-process temporary file lets concurrent runs save without clobbering each other
+        tmp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            marshal.dump({'version': self.version, 'python': PYTHON_VERSION, 'entries': self.entries}, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+def cache_enabled(argv=None):
+    """Return False when the caller asked to bypass the cache with --no-cache.
+
+    --staged runs read the index, whose contents the cache does not describe.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    return '--no-cache' not in argv and '--staged' not in argv
+
+def clear_cache():
+    """Remove every cached result."""
+    if CACHE_DIR.exists():
+        for pattern in ('*.json', f'*{CACHE_SUFFIX}'):
+            for cache_file in CACHE_DIR.glob(pattern):
+                cache_file.unlink()
+
+if __name__ == "__main__":
+    clear_cache()
+    print(f"[CLEARED] {CACHE_DIR}")
\ No newline at end of file
@@ -3,43 +3,169 @@ import os
 import re
 from pathlib import Path
 
-def find_empty_param_descriptions():
-    """Find markdown files with empty parameter descriptions"""
+from file_cache import FileCache, cache_enabled, tool_version
+from git_scope import get_git_scope
+from line_index import format_location
+from markdown_model import load_document
+from profiling import PROFILER, run_profiled
+from reporting import emit, output_format, progress
+from repo_files import list_files
+from source_index import get_source_index
+
+TOOL_VERSION = 2
+
+# Why a documented parameter has no description, by join outcome
+CAUSES = {
+    'missing_param': 'no @param tag',
+    'empty_description': 'empty @param description',
+    'name_mismatch': 'named differently in the source',
+    'stale_docs': 'described in the source, rebuild the docs',
+    'not_found': 'no exported signature in src/',
+}
+
+def find_empty_params(document):
+    """Return the parameters with empty descriptions in a function page, with their position and line"""
+
+    # Check if file has Parameters table
+    if not document.has_heading('Parameters', 2):
+        return []
+
+    # Find empty parameter descriptions (| `param` | |)
+    empty_params = []
+    for table in document.tables():
+        for position, (row, row_start) in enumerate(zip(table['rows'], table['row_starts'])):
+            if len(row) >= 2 and not row[-1] and re.fullmatch(r'`[^`]+`', row[-2]):
+                empty_params.append({
+                    'param': row[-2][1:-1],
+                    'position': position,
+                    'line': document.lines.line(row_start),
+                })
+    return empty_params
+
+def iter_empty_param_descriptions():
+    """Yield the function pages with empty parameter descriptions as they are found"""
 
     docs_functions_dir = Path("docs/functions")
     if not docs_functions_dir.exists():
-        print("docs/functions directory not found")
-        return []
+        progress("docs/functions directory not found")
+        return
 
-    empty_param_files = []
+    with PROFILER.stage('walk'):
+        md_files = [Path(md_file) for md_file in list_files(docs_functions_dir, "*.md")]
+    scope = get_git_scope()
+    if scope is not None:
+        md_files = scope.filter(md_files)
+    cache = FileCache('find_empty_param_descriptions', tool_version(__file__, TOOL_VERSION), cache_enabled())
 
-    for md_file in docs_functions_dir.glob("*.md"):
+    for md_file in md_files:
         try:
-            content = md_file.read_text(encoding='utf-8')
+            with PROFILER.file(md_file):
+                hit, empty_params = cache.lookup(md_file)
+                if not hit:
+                    empty_params = find_empty_params(load_document(md_file, scope))
+                    cache.store(md_file, empty_params)
 
-            # Check if file has Parameters table
-            if "## Parameters" not in content:
-                continue
+        except Exception as e:
+            progress(f"Error reading {md_file}: {e}")
+            continue
 
-            # Find empty parameter descriptions (| `param` | |)
-            empty_param_pattern = r'\|\s*`([^`]+)`\s*\|\s*\|\s*$'
-            empty_params = re.findall(empty_param_pattern, content, re.MULTILINE)
+        if empty_params:
+            yield {
+                'file': str(md_file),
+                'function': md_file.stem,
+                'empty_params': empty_params
+            }
 
-            if empty_params:
-                empty_param_files.append({
-                    'file': str(md_file),
-                    'function': md_file.stem,
-                    'empty_params': empty_params
-                })
+    if scope is None:
+        cache.retain(md_files)
+    cache.save()
 
-        except Exception as e:
-            print(f"Error reading {md_file}: {e}")
+def find_empty_param_descriptions():
+    """Find markdown files with empty parameter descriptions"""
+    return list(iter_empty_param_descriptions())
+
+def signature_table(index):
+    """Return {function name: [signature]} for every exported function in the index that has a parameter list"""
+    table = {}
+    for symbol in index.iter_symbols():
+        if symbol['exported'] and 'param_names' in symbol:
+            table.setdefault(symbol['name'], []).append(symbol)
+    return table
+
+def jsdoc_line(index, file_path, span):
+    """Return the line of the JSDoc block recorded at span"""
+    for block in index.jsdoc_blocks(file_path):
+        if block['span'] == span:
+            return block['line']
+    return None
+
+def classify(signature, param, position):
+    """Return (cause, source parameter name) for an empty docs row joined to one source signature"""
+    names = signature['param_names']
+    if param not in names:
+        return 'name_mismatch', names[position] if position < len(names) else None
+    if param not in signature['param_tags']:
+        return 'missing_param', param
+    if not signature['param_tags'][param]:
+        return 'empty_description', param
+    return 'stale_docs', param
+
+def iter_empty_param_findings(pages=None):
+    """Yield one finding per empty docs row and source signature, joining the rows against the indexed signatures"""
+    index = get_source_index()
+    with PROFILER.stage('join'):
+        signatures = signature_table(index)
+
+    for page in iter_empty_param_descriptions() if pages is None else pages:
+        for row in page['empty_params']:
+            finding = {
+                'file': page['file'],
+                'line': row['line'],
+                'function': page['function'],
+                'param': row['param'],
+            }
+            if page['function'] not in signatures:
+                yield {**finding, 'cause': 'not_found', 'source': None}
+                continue
 
-    return empty_param_files
+            for signature in signatures[page['function']]:
+                cause, source_param = classify(signature, row['param'], row['position'])
+                yield {
+                    **finding,
+                    'cause': cause,
+                    'source': {
+                        'file': signature['file'],
+                        'line': signature['line'],
+                        'column': signature['column'],
+                        'param': source_param,
+                        'jsdoc': {
+                            'span': signature['jsdoc'],
+                            'line': jsdoc_line(index, signature['file'], signature['jsdoc']),
+                        } if signature['jsdoc'] else None,
+                    },
+                }
+
+def describe_finding(finding):
+    """Return the one-line form of a finding, pointing at the JSDoc block to edit"""
+    source = finding['source']
+    if source is None:
+        return f"{format_location(finding['file'], finding['line'])} {finding['function']}({finding['param']}) [{finding['cause'].upper()}] {CAUSES[finding['cause']]}"
+
+    target = format_location(source['file'], source['jsdoc']['line']) if source['jsdoc'] else format_location(source['file'], source['line'], source['column'])
+    where = 'JSDoc' if source['jsdoc'] else 'declaration without JSDoc'
+    message = CAUSES[finding['cause']]
+    if finding['cause'] == 'name_mismatch':
+        message = f"named {source['param'] or 'a destructured parameter'} in the source"
+    return f"{target} ({where}) {finding['function']}({finding['param']}) [{finding['cause'].upper()}] {message}"
 
 def main():
     """Find and report functions with empty parameter descriptions"""
 
+    fmt = output_format()
+    if fmt != 'text':
+        emit(iter_empty_param_findings(), fmt, 'find_empty_param_descriptions')
+        return
+
     empty_files = find_empty_param_descriptions()
 
     if not empty_files:
@@ -52,14 +178,17 @@ def main():
     for func_info in empty_files:
         print(f"Function: {func_info['function']}")
         print(f"File: {func_info['file']}")
-        print(f"Empty params: {', '.join(func_info['empty_params'])}")
+        print(f"Empty params: {', '.join(row['param'] for row in func_info['empty_params'])}")
         print("-" * 40)
 
-    # Also suggest the source files that need to be fixed
-    print("\nSource files that likely need @param annotations fixed:")
-    for func_info in empty_files:
-        function_name = func_info['function']
-        print(f"- src/functions/**/{function_name}.ts")
+    # Point at the JSDoc blocks that need fixing and say why each row is empty
+    print("\nSource JSDoc blocks that need @param annotations fixed:")
+    counts = {}
+    for finding in iter_empty_param_findings(empty_files):
+        counts[finding['cause']] = counts.get(finding['cause'], 0) + 1
+        print(f"- {describe_finding(finding)}")
+
+    print(f"\n[CAUSES] {', '.join(f'{counts[cause]} {cause}' for cause in CAUSES if cause in counts)}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_profiled('find_empty_param_descriptions', main)
\ No newline at end of file
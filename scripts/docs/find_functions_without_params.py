@@ -2,57 +2,126 @@
 import os
 import re
 
-def find_functions_without_params():
-    """Find all exported functions that have parameters but no @param annotations"""
+from file_cache import FileCache, cache_enabled, tool_version
+from git_scope import get_git_scope
+from line_index import format_location
+from profiling import PROFILER, run_profiled
+from reporting import emit, output_format, progress
+from source_index import get_source_index, read_span, scan_source
+from watch import watch, watch_enabled
+
+TOOL_VERSION = 1
+
+def find_functions_in_file(file_path, symbols, data=None):
+    """Return the exported functions of one file that lack @param annotations"""
+
+    found = []
+
+    for symbol in symbols:
+        if not symbol['exported'] or not symbol['jsdoc'] or not symbol['params']:
+            continue
+
+        params = read_span(file_path, symbol['params'], data)
+
+        # Skip if function has no real parameters (just whitespace)
+        if not params.strip():
+            continue
+
+        # Check if JSDoc has @param
+        jsdoc = read_span(file_path, symbol['jsdoc'], data)
+        if '@param' not in jsdoc:
+            found.append({
+                'file': file_path,
+                'line': symbol['line'],
+                'column': symbol['column'],
+                'function': symbol['name'],
+                'params': params.strip(),
+                'jsdoc_length': len(jsdoc.split('\n'))
+            })
 
-    functions_without_params = []
+    return found
 
-    for root, dirs, files in os.walk('src'):
-        for file in files:
-            if file.endswith('.ts'):
-                file_path = os.path.join(root, file)
+def iter_functions_without_params():
+    """Yield the exported functions that have parameters but no @param annotations"""
 
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
+    scope = get_git_scope()
+    if scope is not None:
+        # Only the selected files are scanned, without loading the whole index
+        for file_path in scope.files('src', '.ts'):
+            with PROFILER.file(file_path):
+                data = scope.read(file_path)
+                symbols, _ = scan_source(data)
+                found = find_functions_in_file(file_path, [symbol for symbol in symbols if symbol['kind'] == 'function'], data)
+            yield from found
+        return
 
-                    # Find exported functions with JSDoc
-                    pattern = r'(/\*\*[\s\S]*?\*/)\s*export\s+(async\s+)?function\s+(\w+)\s*(?:<[^>]*>)?\s*\(([^)]+)\)'
-                    matches = re.findall(pattern, content)
+    index = get_source_index()
+    cache = FileCache('find_functions_without_params', tool_version(__file__, TOOL_VERSION), cache_enabled())
 
-                    for jsdoc, async_kw, func_name, params in matches:
-                        # Skip if function has no real parameters (just whitespace)
-                        if not params.strip():
-                            continue
+    symbols_by_file = {}
+    for symbol in index.iter_symbols('function'):
+        symbols_by_file.setdefault(symbol['file'], []).append(symbol)
 
-                        # Check if JSDoc has @param
-                        if '@param' not in jsdoc:
-                            functions_without_params.append({
-                                'file': file_path,
-                                'function': func_name,
-                                'params': params.strip(),
-                                'jsdoc_length': len(jsdoc.split('\n'))
-                            })
+    for file_path, symbols in symbols_by_file.items():
+        try:
+            with PROFILER.file(file_path):
+                hit, found = cache.lookup(file_path)
+                if not hit:
+                    found = find_functions_in_file(file_path, symbols)
+                    cache.store(file_path, found)
 
-                except Exception as e:
-                    print(f"Error reading {file_path}: {e}")
+        except Exception as e:
+            progress(f"Error reading {file_path}: {e}")
+            continue
 
-    return functions_without_params
+        yield from found
+
+    cache.retain(symbols_by_file)
+    cache.save()
+
+def find_functions_without_params():
+    """Find all exported functions that have parameters but no @param annotations"""
+    return list(iter_functions_without_params())
+
+def describe_function(func):
+    """Return the one-line form of a finding used by watch mode"""
+    return f"{format_location(func['file'], func['line'], func['column'])} {func['function']}({func['params']})"
+
+def watch_functions():
+    """Re-check functions whenever their sources change"""
+    def function_symbols(file_path):
+        record = get_source_index().files.get(file_path)
+        return [symbol for symbol in record['symbols'] if symbol['kind'] == 'function'] if record else []
+
+    watch(
+        lambda: [file_path for file_path in get_source_index().files if function_symbols(file_path)],
+        lambda file_path: find_functions_in_file(file_path, function_symbols(file_path)),
+        describe_function,
+    )
 
 def main():
     """Find and list functions without @param annotations"""
 
+    if watch_enabled():
+        watch_functions()
+        return
+
+    fmt = output_format()
+    if fmt != 'text':
+        emit(iter_functions_without_params(), fmt, 'find_functions_without_params')
+        return
+
     functions = find_functions_without_params()
 
     print(f"Found {len(functions)} functions without @param annotations:")
     print("=" * 80)
 
     for func in functions:
-        print(f"File: {func['file']}")
+        print(f"File: {format_location(func['file'], func['line'], func['column'])}")
         print(f"Function: {func['function']}")
         print(f"Parameters: {func['params']}")
         print(f"JSDoc lines: {func['jsdoc_length']}")
         print("-" * 40)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_profiled('find_functions_without_params', main)
\ No newline at end of file
@@ -3,63 +3,63 @@ import os
 import re
 from pathlib import Path
 
-def fix_jsdoc_annotations(file_path):
-    """Remove problematic JSDoc annotations from a file"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        original_content = content
+from edits import TrackedText
+from file_cache import tool_version
+from jsdoc_rules import rewrite_file
+from profiling import run_profiled
+from reporting import progress
+from runner import run_mutator
 
-        # Remove problematic annotations
-        patterns_to_remove = [
-            r'^\s*\*\s*@type\s+.*$',
-            r'^\s*\*\s*@typedef\s+.*$',
-            r'^\s*\*\s*@description\s+.*$',
-            r'^\s*\*\s*@param\s+\{[^}]*\}\s+\w+\s+-\s+.*$',
-            r'^\s*\*\s*@returns?\s+\{[^}]*\}\s+.*$',
-            r'^\s*\*\s*@callback\s+.*$',
-            r'^\s*\*\s*@property\s+.*$',
-        ]
+TOOL_VERSION = 1
 
-        for pattern in patterns_to_remove:
-            content = re.sub(pattern, '', content, flags=re.MULTILINE)
+# Problematic annotations removed from every JSDoc block
+PATTERNS_TO_REMOVE = [
+    re.compile(pattern, re.MULTILINE) for pattern in [
+        r'^\s*\*\s*@type\s+.*$',
+        r'^\s*\*\s*@typedef\s+.*$',
+        r'^\s*\*\s*@description\s+.*$',
+        r'^\s*\*\s*@param\s+\{[^}]*\}\s+\w+\s+-\s+.*$',
+        r'^\s*\*\s*@returns?\s+\{[^}]*\}\s+.*$',
+        r'^\s*\*\s*@callback\s+.*$',
+        r'^\s*\*\s*@property\s+.*$',
+    ]
+]
 
-        # Clean up extra blank lines in JSDoc blocks
-        content = re.sub(r'(/\*\*[^*]*)\n\s*\*\s*\n\s*\*\s*\n', r'\1\n *\n', content)
-        content = re.sub(r'\n\s*\*\s*\n\s*\*/', r'\n */', content)
+# Runs of blank lines after the summary, and blank lines before the closing */
+BLANK_LINE_CLEANUP = [
+    (re.compile(r'(/\*\*[^*]*)\n\s*\*\s*\n\s*\*\s*\n'), r'\1\n *\n'),
+    (re.compile(r'\n\s*\*\s*\n\s*\*/'), r'\n */'),
+]
 
-        if content != original_content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            return True
+def fix_jsdoc_block(block):
+    """Return the edits removing problematic annotations from a single JSDoc block"""
+    # Each pattern sees the lines the previous ones emptied, so its leading \s*
+    # can absorb them; the edits still refer to the original block text
+    text = TrackedText(block.text)
+    for pattern in PATTERNS_TO_REMOVE:
+        text.sub(pattern, '')
 
-        return False
+    # Clean up extra blank lines in JSDoc blocks
+    for pattern, replacement in BLANK_LINE_CLEANUP:
+        text.sub(pattern, replacement)
+    return text.edits
 
-    except Exception as e:
-        print(f"Error processing {file_path}: {e}")
-        return False
+def fix_jsdoc_annotations(file_path):
+    """Return the old and new contents of a file with problematic JSDoc annotations removed"""
+    return rewrite_file(file_path, ['fix'])
 
 def main():
     """Remove problematic JSDoc annotations from all TypeScript files"""
-    files_processed = 0
-    files_changed = 0
-
-    # Process all .ts files in src directory
-    for root, dirs, files in os.walk('src'):
-        for file in files:
-            if file.endswith('.ts'):
-                file_path = os.path.join(root, file)
-                files_processed += 1
-
-                if fix_jsdoc_annotations(file_path):
-                    files_changed += 1
-                    print(f"[FIXED] {file_path}")
+    summary = run_mutator('fix_jsdoc_annotations', fix_jsdoc_annotations, 'FIXED', tool_version(__file__, TOOL_VERSION), main.__doc__)
+    files_processed = summary['processed']
+    files_changed = summary['changed']
+    files_cached = summary['cached']
 
-    print(f"\n=== SUMMARY ===")
-    print(f"Files processed: {files_processed}")
-    print(f"Files changed: {files_changed}")
-    print(f"[COMPLETED] Fixed {files_changed} files")
+    progress(f"\n=== SUMMARY ===")
+    progress(f"Files processed: {files_processed}")
+    progress(f"Files changed: {files_changed}")
+    progress(f"Files cached: {files_cached}")
+    progress(f"[COMPLETED] Fixed {files_changed} files")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_profiled('fix_jsdoc_annotations', main)
\ No newline at end of file
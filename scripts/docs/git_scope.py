@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Git-scoped runs of the docs scripts.
+
+`--changed-since <ref>` limits a script to the files that differ between ref
+and the working tree, including new files git does not track yet, and
+`--staged` to the files staged in the index. Both take the file set from a
+single `git diff --raw` call over src/ and docs/; --changed-since adds the
+untracked, not ignored files from `git ls-files --others`.
+With --staged file contents come from the index blobs, read through one
+`git cat-file --batch` process, so a pre-commit hook checks exactly what is
+about to be committed even when a file is only partly staged. The mutators
+rewrite the working tree, so for them a scope only selects the files.
+"""
+import os
+import sys
+
+from git_tools import EMPTY_TREE, BlobReader, iter_raw_changes, run_git
+
+SCOPED_PATHS = ('src/', 'docs/')
+
+def scope_options(argv=None):
+    """Return (ref, staged) selected with --changed-since and --staged."""
+    argv = sys.argv[1:] if argv is None else argv
+    ref = None
+    for i, arg in enumerate(argv):
+        if arg == '--changed-since' and i + 1 < len(argv):
+            ref = argv[i + 1]
+        elif arg.startswith('--changed-since='):
+            ref = arg.split('=', 1)[1]
+
+    staged = '--staged' in argv
+    if ref and staged:
+        sys.exit("--changed-since and --staged cannot be combined")
+    return ref, staged
+
+def add_scope_arguments(parser):
+    """Add --changed-since and --staged to an argparse parser."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--changed-since', metavar='REF',
+                       help='only process files that differ between REF and the working tree, or are untracked')
+    group.add_argument('--staged', action='store_true',
+                       help='only process files staged in the index')
+
+class GitScope:
+    """Files changed since a ref or staged in the index, and their contents."""
+
+    def __init__(self, blobs, staged):
+        # path -> index blob with --staged, None when the working tree is read
+        self.blobs = blobs
+        self.staged = staged
+        self._contents = None
+
+    def includes(self, file_path):
+        return os.path.normpath(file_path) in self.blobs
+
+    def filter(self, file_paths):
+        """Return the paths that are part of the scope, keeping their order."""
+        return [file_path for file_path in file_paths if self.includes(file_path)]
+
+    def files(self, prefix='', suffix=''):
+        """Return the scoped paths under a directory prefix with a suffix, sorted."""
+        prefix = os.path.normpath(prefix) + os.sep if prefix else ''
+        return sorted(
+            file_path for file_path in self.blobs
+            if file_path.startswith(prefix) and file_path.endswith(suffix)
+        )
+
+    def read(self, file_path):
+        """Return the bytes of a scoped file, from the index with --staged."""
+        file_path = os.path.normpath(file_path)
+        if not self.staged:
+            with open(file_path, 'rb') as f:
+                return f.read()
+
+        if self._contents is None:
+            # Every staged blob is read in one batch; pre-commit sets are small
+            with BlobReader() as reader:
+                self._contents = {path: reader.read(sha) for path, sha in self.blobs.items()}
+        return self._contents[file_path]
+
+def list_changes(ref, staged):
+    """Return {path: new blob sha} for the files changed since ref or staged, without deletions.
+
+    Without --staged the untracked files are included too, mapped to None
+    like every path whose contents come from the working tree.
+    """
+    try:
+        changes = list(iter_raw_changes(ref, None, SCOPED_PATHS, cached=staged))
+    except RuntimeError:
+        if not staged:
+            raise
+        # Nothing is committed yet, so everything staged is new
+        changes = list(iter_raw_changes(EMPTY_TREE, None, SCOPED_PATHS, cached=True))
+
+    blobs = {
+        os.path.normpath(path): new_sha if staged else None
+        for path, _, new_sha, status in changes
+        if status != 'D'
+    }
+    if not staged:
+        # git diff only compares tracked files; new files are read from the working tree
+        output = run_git(['ls-files', '-z', '--others', '--exclude-standard', '--', *SCOPED_PATHS])
+        for path in output.decode('utf-8', errors='surrogateescape').split('\0'):
+            if path:
+                blobs[os.path.normpath(path)] = None
+    return blobs
+
+_scopes = {}
+
+def git_scope(changed_since=None, staged=False):
+    """Return the scope selected by the options, or None to process every file."""
+    if not changed_since and not staged:
+        return None
+    key = ('HEAD', True) if staged else (changed_since, False)
+    if key not in _scopes:
+        _scopes[key] = GitScope(list_changes(*key), staged)
+    return _scopes[key]
+
+def get_git_scope(argv=None):
+    """Return the scope selected on the command line, or None."""
+    return git_scope(*scope_options(argv))
\ No newline at end of file
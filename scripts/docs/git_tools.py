@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Git plumbing helpers shared by the docs scripts.
+
+Every helper runs a single git process: changed blobs come from one
+`git diff --raw`, and blob contents are read in bulk through one
+`git cat-file --batch` process instead of one subprocess per file.
+"""
+import subprocess
+
+NULL_SHA = '0' * 40
+# Tree of a repository without commits
+EMPTY_TREE = '4b825dc642cb6eb9a060e54bf8d69288fbee4904'
+
+def run_git(args, check=True):
+    """Run a git command and return its stdout as bytes."""
+    result = subprocess.run(['git', *args], capture_output=True)
+    if check and result.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)} failed: {result.stderr.decode(errors='replace').strip()}")
+    return result.stdout
+
+def diff_revisions(base, head='HEAD', cached=False):
+    """Return the git diff arguments comparing base with head, or with the index or working tree if head is None."""
+    if head is not None:
+        return [f'{base}..{head}']
+    return ['--cached', base] if cached else [base]
+
+def iter_raw_changes(base, head='HEAD', paths=('src/',), cached=False):
+    """Yield (path, old_sha, new_sha, status) for every file changed between two refs.
+
+    With head=None base is compared with the index (cached) or the working
+    tree, where git reports the null sha for contents that are not in a blob.
+    """
+    output = run_git(['diff', '--raw', '-z', '--no-abbrev', '--no-renames', *diff_revisions(base, head, cached), '--', *paths])
+    fields = output.split(b'\0')
+    for i in range(0, len(fields) - 1, 2):
+        meta = fields[i].decode()
+        if not meta.startswith(':'):
+            continue
+        _, _, old_sha, new_sha, status = meta[1:].split(' ')
+        yield fields[i + 1].decode('utf-8', errors='surrogateescape'), old_sha, new_sha, status
+
+class BlobReader:
+    """Reads blob contents through one long-running `git cat-file --batch` process."""
+
+    def __init__(self):
+        self.process = subprocess.Popen(
+            ['git', 'cat-file', '--batch'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+
+    def read(self, sha):
+        """Return the contents of a blob (empty for the null sha of added/deleted files)."""
+        if sha == NULL_SHA:
+            return b''
+
+        self.process.stdin.write(sha.encode() + b'\n')
+        self.process.stdin.flush()
+
+        header = self.process.stdout.readline().split()
+        if len(header) < 3 or header[1] == b'missing':
+            raise KeyError(sha)
+
+        size = int(header[2])
+        data = self.process.stdout.read(size)
+        self.process.stdout.read(1)  # trailing newline
+        return data
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.stdout.close()
+        self.process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
\ No newline at end of file
@@ -3,6 +3,15 @@ import os
 import re
 from pathlib import Path
 
+from edits import pattern_edits
+from file_cache import tool_version
+from jsdoc_rules import rewrite_file
+from profiling import run_profiled
+from reporting import progress
+from runner import run_mutator
+
+TOOL_VERSION = 1
+
 # Common parameter descriptions
 PARAM_DESCRIPTIONS = {
     'clientId': 'The unique identifier of the client session.',
@@ -37,78 +46,57 @@ PARAM_DESCRIPTIONS = {
     'silent': 'Whether to suppress output or logging.',
 }
 
-def improve_param_descriptions(file_path):
-    """Improve @param descriptions with more meaningful content"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        original_content = content
-
-        # Pattern to find @param lines with generic descriptions
-        param_pattern = r'(\s*\*\s*@param\s+\{[^}]+\}\s+)(\w+)(\s+-\s+The\s+\w+\s+parameter\.)'
+# Pattern to find @param lines with generic descriptions
+PARAM_PATTERN = re.compile(r'(\s*\*\s*@param\s+\{[^}]+\}\s+)(\w+)(\s+-\s+The\s+\w+\s+parameter\.)')
 
-        def improve_param(match):
-            prefix = match.group(1)
-            param_name = match.group(2)
-            suffix = match.group(3)
+def improve_param(match):
+    """Return an improved @param line for a generic description"""
+    prefix = match.group(1)
+    param_name = match.group(2)
+    suffix = match.group(3)
 
-            # Get better description for known parameters
-            if param_name in PARAM_DESCRIPTIONS:
-                new_description = PARAM_DESCRIPTIONS[param_name]
-                return f"{prefix}{param_name} - {new_description}"
-            elif param_name.endswith('Name'):
-                base_name = param_name[:-4].lower()
-                return f"{prefix}{param_name} - The name of the {base_name}."
-            elif param_name.endswith('Id'):
-                base_name = param_name[:-2].lower()
-                return f"{prefix}{param_name} - The unique identifier of the {base_name}."
-            elif param_name.endswith('Config'):
-                base_name = param_name[:-6].lower()
-                return f"{prefix}{param_name} - The configuration for {base_name}."
-            elif param_name.endswith('Schema'):
-                base_name = param_name[:-6].lower()
-                return f"{prefix}{param_name} - The schema definition for {base_name}."
-            elif param_name.startswith('on') and len(param_name) > 2:
-                event_name = param_name[2:].lower()
-                return f"{prefix}{param_name} - Callback function triggered on {event_name} events."
-            else:
-                # Keep original if no better description found
-                return match.group(0)
+    # Get better description for known parameters
+    if param_name in PARAM_DESCRIPTIONS:
+        new_description = PARAM_DESCRIPTIONS[param_name]
+        return f"{prefix}{param_name} - {new_description}"
+    elif param_name.endswith('Name'):
+        base_name = param_name[:-4].lower()
+        return f"{prefix}{param_name} - The name of the {base_name}."
+    elif param_name.endswith('Id'):
+        base_name = param_name[:-2].lower()
+        return f"{prefix}{param_name} - The unique identifier of the {base_name}."
+    elif param_name.endswith('Config'):
+        base_name = param_name[:-6].lower()
+        return f"{prefix}{param_name} - The configuration for {base_name}."
+    elif param_name.endswith('Schema'):
+        base_name = param_name[:-6].lower()
+        return f"{prefix}{param_name} - The schema definition for {base_name}."
+    elif param_name.startswith('on') and len(param_name) > 2:
+        event_name = param_name[2:].lower()
+        return f"{prefix}{param_name} - Callback function triggered on {event_name} events."
+    else:
+        # Keep original if no better description found
+        return match.group(0)
 
-        # Apply improvements
-        content = re.sub(param_pattern, improve_param, content)
+def improve_params_block(block):
+    """Return the edits improving the generic @param descriptions of a single JSDoc block"""
+    return pattern_edits(PARAM_PATTERN, block.text, improve_param)
 
-        if content != original_content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            return True
-
-        return False
-
-    except Exception as e:
-        print(f"Error processing {file_path}: {e}")
-        return False
+def improve_param_descriptions(file_path):
+    """Return the old and new contents of a file with improved @param descriptions"""
+    return rewrite_file(file_path, ['improve-params'])
 
 def main():
     """Improve @param descriptions in all TypeScript files"""
-    files_processed = 0
-    files_changed = 0
-
-    # Process all .ts files in src directory
-    for root, dirs, files in os.walk('src'):
-        for file in files:
-            if file.endswith('.ts'):
-                file_path = os.path.join(root, file)
-                files_processed += 1
-
-                if improve_param_descriptions(file_path):
-                    files_changed += 1
-                    print(f"[IMPROVED] {file_path}")
+    summary = run_mutator('improve_param_descriptions', improve_param_descriptions, 'IMPROVED', tool_version(__file__, TOOL_VERSION), main.__doc__)
+    files_processed = summary['processed']
+    files_changed = summary['changed']
+    files_cached = summary['cached']
 
-    print(f"\n=== SUMMARY ===")
-    print(f"Files processed: {files_processed}")
-    print(f"Files changed: {files_changed}")
+    progress(f"\n=== SUMMARY ===")
+    progress(f"Files processed: {files_processed}")
+    progress(f"Files changed: {files_changed}")
+    progress(f"Files cached: {files_cached}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_profiled('improve_param_descriptions', main)
\ No newline at end of file
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Single-pass rule engine for the JSDoc mutator scripts.
+
+Each mutator script provides a block transform that is registered here as a
+named rule over a shared model of the JSDoc blocks in a file. A file is read
+once, every enabled rule is applied to every block in the order of
+RULE_ORDER, and the file is rewritten at most once. Rules return offset-splice
+edits against the block text, and the changed blocks are spliced into the
+original file contents in a single pass.
+
+Usage:
+    python scripts/docs/jsdoc_rules.py [--rules fix,clean,...] [--jobs N] [--dry-run]
+"""
+import importlib
+import sys
+from functools import partial
+
+from edits import apply_edits
+from file_cache import tool_version
+from profiling import PROFILER, run_profiled
+from reporting import progress
+from runner import create_parser, run_mutator
+from ts_lexer import iter_jsdoc_blocks, scan_jsdoc_blocks
+
+# Documented execution order of the cleanup sweep
+RULE_ORDER = ['fix', 'clean', 'restore-params', 'improve-params', 'add-params']
+
+# Rule name -> (module, block transform); the transform returns edits against the block text
+RULES = {
+    'fix': ('fix_jsdoc_annotations', 'fix_jsdoc_block'),
+    'clean': ('clean_remaining_annotations', 'clean_jsdoc_block'),
+    'restore-params': ('restore_param_annotations', 'restore_params_block'),
+    'improve-params': ('improve_param_descriptions', 'improve_params_block'),
+    'add-params': ('add_missing_param_annotations', 'add_missing_params_block'),
+}
+
+# Rule name -> tag of the progress line printed for every file it changes
+RULE_TAGS = {
+    'fix': 'FIXED',
+    'clean': 'CLEANED',
+    'restore-params': 'UPDATED',
+    'improve-params': 'IMPROVED',
+    'add-params': 'UPDATED',
+}
+
+# Rules that read the signature of the declaration a block documents; the
+# others only look at the block text and skip tokenizing the code
+SIGNATURE_RULES = {'restore-params', 'add-params'}
+
+class JSDocBlock:
+    """A JSDoc comment and the declaration that follows it."""
+
+    def __init__(self, start, end, text, declaration=None):
+        self.start = start
+        self.end = end
+        self.original = text
+        self.text = text
+        self.declaration = declaration
+
+    @property
+    def changed(self):
+        return self.text != self.original
+
+    def apply(self, edits):
+        """Apply a rule's edits to the current block text."""
+        if edits:
+            self.text = apply_edits(self.text, edits)
+
+class SourceDocument:
+    """A source file split into JSDoc blocks and the code between them."""
+
+    def __init__(self, content, declarations=True):
+        self.content = content
+        self.blocks = parse_blocks(content, declarations)
+
+    @property
+    def changed(self):
+        return any(block.changed for block in self.blocks)
+
+    def edits(self):
+        """Return the changed blocks as edits against the original contents."""
+        return [(block.start, block.end, block.text) for block in self.blocks if block.changed]
+
+    def render(self):
+        """Return the file contents with every block's current text."""
+        return apply_edits(self.content, self.edits())
+
+def parse_blocks(content, declarations=True):
+    """Return every JSDoc block in content, with its attached declaration if declarations is set."""
+    if not declarations:
+        return [JSDocBlock(token.start, token.end, token.value) for token in scan_jsdoc_blocks(content)]
+    return [
+        JSDocBlock(token.start, token.end, token.value, declaration)
+        for token, declaration in iter_jsdoc_blocks(content)
+    ]
+
+def load_rules(rule_names):
+    """Import the modules defining the requested rules and return (name, transform) in execution order."""
+    unknown = [name for name in rule_names if name not in RULES]
+    if unknown:
+        raise ValueError(f"Unknown rules: {', '.join(unknown)}")
+
+    rules = []
+    imported = False
+    for name in RULE_ORDER:
+        if name in rule_names:
+            module_name, function_name = RULES[name]
+            imported = imported or module_name not in sys.modules
+            rules.append((name, getattr(importlib.import_module(module_name), function_name)))
+
+    if imported and PROFILER.enabled:
+        # Rule modules are imported lazily, after profiling started
+        PROFILER.instrument_patterns()
+    return rules
+
+def apply_rules(content, rule_names):
+    """Apply the given rules to every JSDoc block of content and return the result."""
+    rules = load_rules(rule_names)
+    with PROFILER.stage('parse'):
+        document = SourceDocument(content, not SIGNATURE_RULES.isdisjoint(rule_names))
+
+    with PROFILER.stage('transform'):
+        for block in document.blocks:
+            for name, rule in rules:
+                with PROFILER.rule(name):
+                    block.apply(rule(block))
+
+    return document.render()
+
+def rewrite_file(file_path, rule_names):
+    """Apply rules to a file and return its (old, new) contents if something changed.
+
+    Returns False if the file is already normalized and None if it could not
+    be processed; writing the new contents is left to the caller.
+    """
+    try:
+        with PROFILER.stage('read'):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+
+        new_content = apply_rules(content, rule_names)
+
+        if new_content != content:
+            return content, new_content
+
+        return False
+
+    except Exception as e:
+        print(f"Error processing {file_path}: {e}")
+        return None
+
+def rules_version(rule_names):
+    """Return a cache version covering the engine and every enabled rule module."""
+    versions = [tool_version(__file__, 1)]
+    for name in RULE_ORDER:
+        if name in rule_names:
+            module = importlib.import_module(RULES[name][0])
+            versions.append(tool_version(module.__file__, module.TOOL_VERSION))
+    return '|'.join(versions)
+
+def main():
+    """Apply every enabled JSDoc rule to all TypeScript files in one pass"""
+    parser = create_parser(main.__doc__)
+    parser.add_argument('--rules', default=','.join(RULE_ORDER),
+                        help=f"comma-separated rules to apply (default: {','.join(RULE_ORDER)})")
+    args = parser.parse_args()
+
+    rule_names = [name.strip() for name in args.rules.split(',') if name.strip()]
+    unknown = [name for name in rule_names if name not in RULES]
+    if unknown:
+        parser.error(f"unknown rules: {', '.join(unknown)}")
+
+    summary = run_mutator(
+        'jsdoc_rules',
+        partial(rewrite_file, rule_names=tuple(rule_names)),
+        'UPDATED',
+        rules_version(rule_names),
+        args=args,
+    )
+
+    progress(f"\n=== SUMMARY ===")
+    progress(f"Rules applied: {', '.join(name for name in RULE_ORDER if name in rule_names)}")
+    progress(f"Files processed: {summary['processed']}")
+    progress(f"Files changed: {summary['changed']}")
+    progress(f"Files cached: {summary['cached']}")
+
+if __name__ == "__main__":
+    run_profiled('jsdoc_rules', main)
\ No newline at end of file
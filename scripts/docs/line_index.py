@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Line-offset table for turning buffer offsets into file:line:column locations.
+
+The table is built once per file in a single pass and queried with bisect,
+so reporting the position of every finding in a file costs O(log n) each
+instead of rescanning the file prefix. Works on both str and bytes buffers;
+columns are counted in characters so locations are clickable in editors.
+"""
+import re
+from bisect import bisect_right
+
+class LineIndex:
+    """Offsets of the line starts of a text or bytes buffer."""
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        newline = '\n' if isinstance(buffer, str) else b'\n'
+        self.starts = [0]
+        self.starts.extend(match.end() for match in re.finditer(newline, buffer))
+
+    def line(self, offset):
+        """Return the 1-based line number containing offset."""
+        return bisect_right(self.starts, offset)
+
+    def position(self, offset):
+        """Return the 1-based (line, column) of offset."""
+        line = bisect_right(self.starts, offset)
+        prefix = self.buffer[self.starts[line - 1]:offset]
+        if not isinstance(prefix, str):
+            prefix = bytes(prefix).decode('utf-8', errors='replace')
+        return line, len(prefix) + 1
+
+    def location(self, file_path, offset):
+        """Return an editor-clickable file:line:column string for offset."""
+        line, column = self.position(offset)
+        return f"{file_path}:{line}:{column}"
+
+def format_location(file_path, line, column=None):
+    """Format a file:line[:column] location."""
+    if column is None:
+        return f"{file_path}:{line}"
+    return f"{file_path}:{line}:{column}"
\ No newline at end of file
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Bytes-level file reader shared by the docs scripts.
+
+Large inputs such as the biggest generated docs pages are memory-mapped
+instead of being read and decoded into a str. The markdown model scans the
+lines of the mapped bytes in a single pass and decodes only the spans it
+reports, through decode(); its line patterns are str patterns run over those
+decoded spans. Small files are read with a single read(), which is cheaper
+than mapping them. The TypeScript lexer works on text, so the source and
+types.d.ts scanners read plain bytes instead.
+"""
+import mmap
+import os
+from contextlib import contextmanager
+
+# Files at least this large are memory-mapped
+MMAP_THRESHOLD = 64 * 1024
+
+def open_buffer(file_path):
+    """Return a read-only bytes-like buffer with the contents of a file.
+
+    The result is a memory map for large files and bytes otherwise; a map
+    stays valid until it is closed or garbage collected.
+    """
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            return f.read()
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+@contextmanager
+def read_buffer(file_path):
+    """Yield the contents of a file as a bytes-like buffer, unmapping it on exit."""
+    buffer = open_buffer(file_path)
+    try:
+        yield buffer
+    finally:
+        if isinstance(buffer, mmap.mmap):
+            buffer.close()
+
+def decode(buffer, start=0, end=None):
+    """Decode a UTF-8 span of a buffer."""
+    return str(buffer[start:end], 'utf-8', errors='replace')
\ No newline at end of file
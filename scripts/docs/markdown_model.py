@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Structured model of the generated markdown pages under docs/.
+
+A page is parsed once, in a single forward scan over the lines of its raw
+bytes, into its front-matter and a flat list of blocks in document order:
+headings, fenced code blocks, description paragraphs and tables. Every block
+records the byte offsets of its source span; only headings and table cells
+are decoded up front, code and descriptions are decoded when queried. Large
+pages are parsed through a memory map from mapped_file, which is closed once
+the page is parsed; the model keeps the raw bytes for those queries. Parsed
+documents are memoized per process, so every analyzer run in the same
+process shares one parse of each page.
+"""
+import os
+import re
+
+from line_index import LineIndex
+from mapped_file import decode, read_buffer
+from profiling import PROFILER
+
+NAME_PATTERN = re.compile(r'\w+')
+CELL_SEPARATOR = re.compile(r'(?<!\\)\|')
+WHITESPACE = frozenset(b' \t\r\n\x0b\x0c')
+
+class MarkdownDocument:
+    """Front-matter and blocks of a markdown page."""
+
+    def __init__(self, data, file_path=None):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self.data = data
+        self.file_path = file_path
+        self.front_matter = {}
+        self.blocks = []
+        self._lines = None
+        self._parse()
+        self._section_ends = self._find_section_ends()
+
+    @property
+    def lines(self):
+        if self._lines is None:
+            self._lines = LineIndex(self.data)
+        return self._lines
+
+    @property
+    def title(self):
+        """Return the text of the first level 1 heading."""
+        for heading in self.headings(1):
+            return heading['text']
+        return None
+
+    def headings(self, level=None):
+        """Return the headings, optionally only those of one level."""
+        return [
+            block for block in self.blocks
+            if block['kind'] == 'heading' and (level is None or block['level'] == level)
+        ]
+
+    def code_blocks(self, lang=None):
+        """Return the fenced code blocks, optionally only those of one language."""
+        return [
+            block for block in self.blocks
+            if block['kind'] == 'code' and (lang is None or block['lang'] == lang)
+        ]
+
+    def paragraphs(self):
+        """Return the description paragraphs."""
+        return [block for block in self.blocks if block['kind'] == 'paragraph']
+
+    def tables(self, heading=None):
+        """Return the tables, optionally only those under a heading with the given text."""
+        return [
+            block for block in self.blocks
+            if block['kind'] == 'table' and (heading is None or block['heading'] == heading)
+        ]
+
+    def has_heading(self, text, level=None):
+        return any(block['text'] == text for block in self.headings(level))
+
+    def decode(self, start=0, end=None):
+        """Decode a byte span of the page."""
+        return decode(self.data, start, end)
+
+    def text(self, block):
+        """Return the source text of a block."""
+        return self.decode(block['start'], block['end'])
+
+    def code(self, block):
+        """Return the contents of a code block without its fences."""
+        return self.decode(block['code_start'], block['code_end'])
+
+    def is_plain_code(self, block):
+        """Return True for a non-empty code block without backticks in its contents."""
+        return block['code_start'] < block['code_end'] and self.data.find(b'`', block['code_start'], block['code_end']) == -1
+
+    def stripped_text(self, start, end):
+        """Decode a span with surrounding whitespace trimmed by offset, without copying the rest."""
+        data = self.data
+        while start < end and data[start] in WHITESPACE:
+            start += 1
+        while end > start and data[end - 1] in WHITESPACE:
+            end -= 1
+        return self.decode(start, end)
+
+    def section_end(self, index):
+        """Return the offset where the section containing block index ends."""
+        return self._section_ends[index]
+
+    def property_sections(self):
+        """Yield (heading, code_block, description) for every `### name` followed by a ts code block."""
+        blocks = self.blocks
+        for i, heading in enumerate(blocks[:-1]):
+            code = blocks[i + 1]
+            if heading['kind'] != 'heading' or heading['level'] != 3 or not NAME_PATTERN.fullmatch(heading['text']):
+                continue
+            if code['kind'] != 'code' or code['lang'] != 'ts' or not self.is_plain_code(code):
+                continue
+
+            # Text after the code block up to the next heading, decoded once from the section bounds
+            yield heading, code, self.stripped_text(code['end'], self.section_end(i + 1))
+
+    def _parse(self):
+        data = self.data
+        size = len(data)
+        position = 0
+
+        if data[:4] == b'---\n':
+            end = data.find(b'\n---', 3)
+            if end != -1:
+                for line in self.decode(4, end).split('\n'):
+                    key, sep, value = line.partition(':')
+                    if sep:
+                        self.front_matter[key.strip()] = value.strip()
+                position = data.find(b'\n', end + 1)
+                position = size if position == -1 else position + 1
+
+        heading = None
+        block = None  # paragraph or table being accumulated
+
+        while position < size:
+            line_end = data.find(b'\n', position)
+            if line_end == -1:
+                line_end = size
+            next_position = line_end + 1
+            stripped = data[position:line_end].strip()
+
+            if stripped.startswith(b'```'):
+                block = None
+                code_start = min(next_position, size)
+                fence_end = code_start
+                code_end = size
+                while fence_end < size:
+                    close_end = data.find(b'\n', fence_end)
+                    if close_end == -1:
+                        close_end = size
+                    if data[fence_end:close_end].strip() == b'```':
+                        code_end = fence_end
+                        break
+                    fence_end = close_end + 1
+                else:
+                    close_end = size
+
+                end = min(close_end, size)
+                self.blocks.append({
+                    'kind': 'code',
+                    'lang': stripped[3:].strip().decode('utf-8', errors='replace'),
+                    'code_start': code_start,
+                    'code_end': max(code_start, code_end - 1),
+                    'start': position,
+                    'end': end,
+                    'heading': heading,
+                })
+                next_position = end + 1
+
+            elif stripped.startswith(b'#') and stripped.lstrip(b'#')[:1] in (b' ', b'\t'):
+                block = None
+                level = len(stripped) - len(stripped.lstrip(b'#'))
+                heading = stripped[level:].strip().decode('utf-8', errors='replace')
+                self.blocks.append({
+                    'kind': 'heading',
+                    'level': level,
+                    'text': heading,
+                    'start': position,
+                    'end': line_end,
+                })
+
+            elif not stripped:
+                block = None
+
+            elif stripped.startswith(b'|'):
+                row = stripped.decode('utf-8', errors='replace')
+                cells = [cell.strip() for cell in CELL_SEPARATOR.split(row)[1:-1]]
+                if block is None or block['kind'] != 'table':
+                    block = {
+                        'kind': 'table',
+                        'header': cells,
+                        'rows': [],
+                        'row_starts': [],
+                        'start': position,
+                        'end': line_end,
+                        'heading': heading,
+                    }
+                    self.blocks.append(block)
+                else:
+                    # The |---|---| delimiter row separates the header from the rows
+                    if not (len(block['rows']) == 0 and all(set(cell) <= set('-:') for cell in cells)):
+                        block['rows'].append(cells)
+                        block['row_starts'].append(position)
+                    block['end'] = line_end
+
+            else:
+                if block is None or block['kind'] != 'paragraph':
+                    block = {
+                        'kind': 'paragraph',
+                        'start': position,
+                        'end': line_end,
+                        'heading': heading,
+                    }
+                    self.blocks.append(block)
+                else:
+                    block['end'] = line_end
+
+            position = next_position
+
+    def _find_section_ends(self):
+        """Map every block to the start of the next heading of level 3 or above, in one backward scan."""
+        section_ends = [0] * len(self.blocks)
+        boundary = len(self.data)
+        for i in range(len(self.blocks) - 1, -1, -1):
+            section_ends[i] = boundary
+            block = self.blocks[i]
+            if block['kind'] == 'heading' and block['level'] <= 3:
+                boundary = block['start']
+        return section_ends
+
+_documents = {}
+
+def load_document(file_path, scope=None):
+    """Return the parsed model of a markdown page, parsing it at most once per process.
+
+    With a staged GitScope that includes the page, the page is parsed as it
+    is in the index.
+    """
+    file_path = str(file_path)
+    if scope is not None and scope.staged and scope.includes(file_path):
+        # --staged checks the page as it is in the index
+        return MarkdownDocument(scope.read(file_path), file_path)
+
+    stat = os.stat(file_path)
+    key = (stat.st_size, stat.st_mtime_ns)
+
+    cached = _documents.get(file_path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    with read_buffer(file_path) as data:
+        with PROFILER.stage('parse'):
+            document = MarkdownDocument(data, file_path)
+        if not isinstance(data, bytes):
+            # The map is closed on exit; memoized pages keep bytes instead of an open file
+            with PROFILER.stage('read'):
+                document.data = bytes(data)
+    _documents[file_path] = (key, document)
+    return document
\ No newline at end of file
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Incremental runner for the documentation sweep.
+
+The sweep is declared as a DAG of stages. Each stage names the stages it runs
+after and its inputs: the src/ sources, the docs/ pages, single files such as
+types.d.ts, or git refs. Before a stage starts, the contents of its inputs and
+the scripts it is built from are combined into a fingerprint, and a stage
+whose fingerprint matches its last successful run is skipped. The JSDoc rules
+run in this process through a DocsSession; once their dependencies are done,
+the npm builds and the reporting scripts run in parallel worker processes and
+their output is printed stage by stage.
+
+The rules form a single stage and run in jsdoc_rules.RULE_ORDER, like the
+rule engine. fix and clean strip the @param tags that restore-params and
+add-params write, so the rules only reach a fixed point as a sequence. A
+stage per rule would rerun the whole chain on every run. The stage also
+remembers the files it swept and skips them until they change again.
+
+A stage's fingerprint is taken when it starts, so a file edited by hand while
+the run is in progress is not recorded as seen by stages that never read it.
+The rules stage rewrites its own inputs, so its fingerprint is taken again
+right after its writes.
+
+Usage:
+    python scripts/docs/pipeline.py [--force] [--jobs N] [--no-cache] [--profile] [--profile-memory]
+"""
+import argparse
+import contextlib
+import hashlib
+import importlib
+import io
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from file_cache import CACHE_DIR, FileCache, cache_enabled, tool_version
+from git_tools import run_git
+from jsdoc_rules import RULE_ORDER, RULE_TAGS, rules_version
+from profiling import PROFILER, run_profiled
+from repo_files import iter_source_files, list_files
+
+TOOL_VERSION = 1
+
+STATE_PATH = CACHE_DIR / 'pipeline.json'
+
+# Stage name -> what it runs after, what it reads and what it runs: the JSDoc rules in
+# order, a reporting script, or a command
+STAGES = {
+    'jsdoc-rules': {'after': [], 'inputs': ['src'], 'rules': RULE_ORDER},
+    'build': {
+        'after': ['jsdoc-rules'],
+        'inputs': ['src', 'package.json', 'rollup.config.mjs', 'tsconfig.json'],
+        'command': ['npm', 'run', 'build'],
+    },
+    'build-docs': {
+        'after': ['build'],
+        'inputs': ['types.d.ts', 'scripts/dts-docs.cjs'],
+        'command': ['npm', 'run', 'build:docs'],
+    },
+    'analyze_docs': {'after': ['build-docs'], 'inputs': ['docs'], 'script': 'analyze_docs'},
+    'analyze_docs_precise': {'after': ['build-docs'], 'inputs': ['docs', 'src', 'types.d.ts'], 'script': 'analyze_docs_precise'},
+    'find_empty_param_descriptions': {'after': ['build-docs'], 'inputs': ['docs', 'src'], 'script': 'find_empty_param_descriptions'},
+    # verify_changes compares commits, so it only depends on the refs it diffs
+    'verify_changes': {'after': [], 'inputs': ['git:HEAD', 'git:BASE'], 'script': 'verify_changes'},
+}
+
+def load_state():
+    """Return {stage: fingerprint} of the last successful runs."""
+    try:
+        with open(STATE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_state(state):
+    """Write the fingerprints of the successful runs."""
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = STATE_PATH.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, STATE_PATH)
+
+def iter_input_files(name):
+    """Yield the files behind an input name in a stable order."""
+    if name == 'src':
+        yield from iter_source_files('src')
+    elif name == 'docs':
+        yield from list_files('docs', '**/*.md')
+    else:
+        yield name
+
+class Fingerprinter:
+    """Hashes stage inputs, trusting size and mtime before rehashing a file."""
+
+    def __init__(self):
+        self.cache = FileCache('pipeline_inputs', tool_version(__file__, TOOL_VERSION))
+
+    def file_digest(self, file_path):
+        if not os.path.exists(file_path):
+            return 'missing'
+        hit, _ = self.cache.lookup(file_path)
+        if not hit:
+            self.cache.store(file_path, True)
+        return self.cache.entries[file_path]['hash']
+
+    def ref_digest(self, ref):
+        if ref == 'BASE':
+            from verify_changes import DEFAULT_BASE
+            ref = DEFAULT_BASE
+        return run_git(['rev-parse', '--verify', '--quiet', f'{ref}^{{commit}}'], check=False).decode().strip() or 'missing'
+
+    def stage(self, name):
+        """Return the fingerprint of a stage over its inputs and the code it runs."""
+        stage = STAGES[name]
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(json.dumps({key: value for key, value in stage.items() if key != 'after'}, sort_keys=True).encode())
+        digest.update(tool_version(__file__, TOOL_VERSION).encode())
+
+        for input_name in stage['inputs']:
+            if input_name.startswith('git:'):
+                digest.update(f"{input_name}\0{self.ref_digest(input_name[4:])}\0".encode())
+                continue
+            for file_path in iter_input_files(input_name):
+                digest.update(f"{file_path}\0{self.file_digest(file_path)}\0".encode())
+        return digest.hexdigest()
+
+    def save(self):
+        self.cache.save()
+
+def run_worker_stage(name):
+    """Run a reporting script or command stage and return (succeeded, output)."""
+    stage = STAGES[name]
+    if 'command' in stage:
+        try:
+            result = subprocess.run(stage['command'], capture_output=True, text=True)
+        except OSError as e:
+            return False, f"{' '.join(stage['command'])}: {e}\n"
+        return result.returncode == 0, result.stdout + result.stderr
+
+    output = io.StringIO()
+    succeeded = True
+    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+        try:
+            module = importlib.import_module(stage['script'])
+            if PROFILER.enabled:
+                PROFILER.instrument_patterns()
+            with PROFILER.stage(name):
+                module.main([]) if stage['script'] == 'verify_changes' else module.main()
+        except SystemExit as e:
+            succeeded = e.code in (None, 0)
+        except Exception as e:
+            print(f"Error running {name}: {e}")
+            succeeded = False
+    return succeeded, output.getvalue()
+
+def run_rule_stage(session, name):
+    """Apply the JSDoc rules of a stage in order and write their changes; return (succeeded, output).
+
+    Only the files that changed since the stage last swept them are processed,
+    and the stage fails if a rule raised on any file.
+    """
+    rule_names = STAGES[name]['rules']
+    output = io.StringIO()
+    succeeded = True
+    with contextlib.redirect_stdout(output), PROFILER.stage(name):
+        try:
+            cache = FileCache('pipeline_rules', rules_version(rule_names), session.use_cache)
+            file_paths = [file_path for file_path in session.file_paths if not cache.lookup(file_path)[0]]
+            for rule_name in rule_names:
+                summary = session.run_rule(rule_name, RULE_TAGS[rule_name], file_paths)
+                print(f"[{rule_name.upper()}] {summary['changed']} changed, {summary['cached']} cached, {summary['processed']} files")
+                if summary['errors']:
+                    print(f"[ERROR] {rule_name} failed on {summary['errors']} files")
+                    succeeded = False
+            session.flush()
+        except Exception as e:
+            print(f"Error running {name}: {e}")
+            return False, output.getvalue()
+
+        if succeeded:
+            # The written contents are what the sweep produces; they are not swept again
+            for file_path in file_paths:
+                cache.store(file_path, True)
+            cache.retain(session.file_paths)
+            cache.save()
+    return succeeded, output.getvalue()
+
+def topological_order(stages=STAGES):
+    """Return the stage names with every stage after the stages it depends on."""
+    order = []
+    visiting = set()
+
+    def visit(name):
+        if name in order:
+            return
+        if name in visiting:
+            raise ValueError(f"Stage cycle through {name}")
+        visiting.add(name)
+        for dependency in stages[name]['after']:
+            visit(dependency)
+        visiting.discard(name)
+        order.append(name)
+
+    for name in stages:
+        visit(name)
+    return order
+
+def run_pipeline(force=False, jobs=None):
+    """Run the stages whose inputs changed and return {stage: 'ran' | 'skipped' | 'failed' | 'blocked'}."""
+    from session import DocsSession
+
+    order = topological_order()
+    state = load_state()
+    fingerprints = Fingerprinter()
+    session = DocsSession(use_cache=cache_enabled())
+    results = {}
+    running = {}
+    jobs = jobs or os.cpu_count() or 1
+    # Timings are collected in this process only
+    executor = None if PROFILER.enabled or jobs <= 1 else ProcessPoolExecutor(max_workers=jobs)
+
+    def finish(name, succeeded, output, fingerprint):
+        print(f"\n=== STAGE {name} ===")
+        print(output, end='')
+        results[name] = 'ran' if succeeded else 'failed'
+        if succeeded:
+            state[name] = fingerprint
+        else:
+            state.pop(name, None)
+            print(f"[FAILED] {name}")
+
+    try:
+        while len(results) < len(order):
+            for name in order:
+                if name in results or name in running:
+                    continue
+                dependencies = [results.get(dependency) for dependency in STAGES[name]['after']]
+                if any(status in ('failed', 'blocked') for status in dependencies):
+                    results[name] = 'blocked'
+                    state.pop(name, None)
+                    print(f"[BLOCKED] {name}")
+                    continue
+                if not all(status in ('ran', 'skipped') for status in dependencies):
+                    continue
+
+                # The inputs as the stage is about to see them
+                fingerprint = fingerprints.stage(name)
+                if not force and state.get(name) == fingerprint:
+                    results[name] = 'skipped'
+                    print(f"[SKIPPED] {name} (inputs unchanged)")
+                elif 'rules' in STAGES[name]:
+                    succeeded, output = run_rule_stage(session, name)
+                    # The stage rewrote its own inputs; the next run compares against its output
+                    finish(name, succeeded, output, fingerprints.stage(name))
+                elif executor is not None:
+                    running[name] = (executor.submit(run_worker_stage, name), fingerprint)
+                else:
+                    finish(name, *run_worker_stage(name), fingerprint)
+
+            if running:
+                done, _ = wait([future for future, _ in running.values()], return_when=FIRST_COMPLETED)
+                for name in [name for name, (future, _) in running.items() if future in done]:
+                    future, fingerprint = running.pop(name)
+                    finish(name, *future.result(), fingerprint)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        save_state(state)
+        fingerprints.save()
+
+    return results
+
+def main():
+    """Run the documentation sweep, skipping stages whose inputs did not change"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--force', action='store_true', help='run every stage even if its inputs did not change')
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help='worker processes for the independent stages (0 uses every CPU)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='process every file in the mutator and reporting stages')
+    parser.add_argument('--profile', action='store_true',
+                        help='record per-stage timings (runs the stages serially)')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='like --profile, and record the peak memory of each stage (slows the timings down)')
+    args = parser.parse_args()
+
+    results = run_pipeline(force=args.force, jobs=args.jobs)
+
+    counts = {}
+    for status in results.values():
+        counts[status] = counts.get(status, 0) + 1
+    print(f"\n=== SUMMARY ===")
+    for status in ('ran', 'skipped', 'failed', 'blocked'):
+        print(f"Stages {status}: {counts.get(status, 0)}")
+
+    if counts.get('failed') or counts.get('blocked'):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    run_profiled('pipeline', main)
\ No newline at end of file
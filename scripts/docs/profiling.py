@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Opt-in profiling instrumentation shared by the docs scripts.
+
+`--profile` records the wall time of every processed file, every JSDoc rule
+and every compiled regex of the scripts, the wall time of each stage (walk,
+read, parse, transform, write, ...), and the overall files/s throughput. The
+run ends with a table of the slowest files and patterns, and the full report
+is written as JSON to scripts/docs/.cache/profile/<tool>.json.
+
+`--profile-memory` adds the peak traced memory of each stage. tracemalloc
+slows every allocation down, so its timings are inflated; take timings from
+a run with plain `--profile`.
+
+When profiling is off every hook is a no-op, so the instrumented code paths
+cost nothing in normal runs.
+"""
+import json
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+from file_cache import CACHE_DIR
+from reporting import machine_output
+
+PROFILE_DIR = CACHE_DIR / 'profile'
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+TOP_N = 10
+
+_disabled = nullcontext()
+
+class TimedPattern:
+    """Proxy for a compiled regex that records the time spent in each of its calls."""
+
+    def __init__(self, pattern, profiler):
+        self._pattern = pattern
+        self._profiler = profiler
+        self._key = pattern.pattern if isinstance(pattern.pattern, str) else pattern.pattern.decode('latin-1')
+
+    def _timed(self, method, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return getattr(self._pattern, method)(*args, **kwargs)
+        finally:
+            self._profiler.add('patterns', self._key, time.perf_counter() - start)
+
+    def search(self, *args, **kwargs):
+        return self._timed('search', *args, **kwargs)
+
+    def match(self, *args, **kwargs):
+        return self._timed('match', *args, **kwargs)
+
+    def fullmatch(self, *args, **kwargs):
+        return self._timed('fullmatch', *args, **kwargs)
+
+    def findall(self, *args, **kwargs):
+        return self._timed('findall', *args, **kwargs)
+
+    def split(self, *args, **kwargs):
+        return self._timed('split', *args, **kwargs)
+
+    def sub(self, *args, **kwargs):
+        return self._timed('sub', *args, **kwargs)
+
+    def subn(self, *args, **kwargs):
+        return self._timed('subn', *args, **kwargs)
+
+    def finditer(self, *args, **kwargs):
+        iterator = self._pattern.finditer(*args, **kwargs)
+        while True:
+            start = time.perf_counter()
+            match = next(iterator, None)
+            self._profiler.add('patterns', self._key, time.perf_counter() - start)
+            if match is None:
+                return
+            yield match
+
+    def __getattr__(self, name):
+        return getattr(self._pattern, name)
+
+class Profiler:
+    """Collects per-file, per-rule, per-pattern and per-stage measurements."""
+
+    def __init__(self):
+        self.enabled = False
+        self.tool = None
+        self.started = None
+        self.stats = {'files': {}, 'rules': {}, 'patterns': {}}
+        self.stages = {}
+        self.memory = False
+        self._stage_stack = []
+        # Names of the modules whose patterns are already wrapped
+        self._instrumented = set()
+
+    def start(self, tool, memory=False):
+        """Enable profiling and instrument the compiled patterns of the loaded scripts."""
+        self.enabled = True
+        self.tool = tool
+        self.memory = memory
+        self.started = time.perf_counter()
+        if memory:
+            # tracemalloc is only imported for --profile-memory
+            import tracemalloc
+            tracemalloc.start()
+        self.instrument_patterns()
+
+    def instrument_patterns(self):
+        """Replace module-level compiled regexes of the scripts with timing proxies.
+
+        Regexes held in module-level lists, tuples and dicts, such as
+        (pattern, replacement) tables, are wrapped as well. Each module is
+        instrumented once; later calls only pick up the modules imported since.
+        """
+        for module_name, module in list(sys.modules.items()):
+            if module_name in self._instrumented:
+                continue
+            module_file = getattr(module, '__file__', None)
+            if not module_file or os.path.dirname(os.path.abspath(module_file)) != SCRIPTS_DIR:
+                continue
+            self._instrumented.add(module_name)
+            for name, value in list(vars(module).items()):
+                timed = self._timed_patterns(value)
+                if timed is not value:
+                    setattr(module, name, timed)
+
+    def _timed_patterns(self, value):
+        """Return value with its compiled regexes wrapped; lists and dicts are updated in place."""
+        if isinstance(value, re.Pattern):
+            return TimedPattern(value, self)
+        if isinstance(value, tuple):
+            items = tuple(self._timed_patterns(item) for item in value)
+            return items if any(new is not old for new, old in zip(items, value)) else value
+        if isinstance(value, list):
+            value[:] = [self._timed_patterns(item) for item in value]
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                value[key] = self._timed_patterns(item)
+        return value
+
+    def add(self, category, key, seconds):
+        entry = self.stats[category].setdefault(key, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    @contextmanager
+    def _timer(self, category, key):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(category, key, time.perf_counter() - start)
+
+    def file(self, file_path):
+        """Time the processing of one file."""
+        return self._timer('files', str(file_path)) if self.enabled else _disabled
+
+    def rule(self, name):
+        """Time one application of a JSDoc rule."""
+        return self._timer('rules', name) if self.enabled else _disabled
+
+    def stage(self, name):
+        """Time a pipeline stage and, with memory profiling, record its peak traced memory."""
+        if not self.enabled:
+            return _disabled
+        return self._memory_stage(name) if self.memory else self._stage(name)
+
+    @contextmanager
+    def _stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stage = self.stages.setdefault(name, {'calls': 0, 'seconds': 0.0})
+            stage['calls'] += 1
+            stage['seconds'] += time.perf_counter() - start
+
+    @contextmanager
+    def _memory_stage(self, name):
+        import tracemalloc
+        # Nested stages report their own peak and fold it into the enclosing stage
+        if self._stage_stack:
+            self._stage_stack[-1][1] = max(self._stage_stack[-1][1], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        frame = [name, 0]
+        self._stage_stack.append(frame)
+        try:
+            with self._stage(name):
+                yield
+        finally:
+            peak = max(frame[1], tracemalloc.get_traced_memory()[1])
+            self._stage_stack.pop()
+            if self._stage_stack:
+                self._stage_stack[-1][1] = max(self._stage_stack[-1][1], peak)
+            stage = self.stages[name]
+            stage['peak_kb'] = max(stage.get('peak_kb', 0), peak // 1024)
+
+    def report(self):
+        """Build the JSON report of the run."""
+        wall = time.perf_counter() - self.started
+        peak_kb = None
+        if self.memory:
+            import tracemalloc
+            peak_kb = tracemalloc.get_traced_memory()[1] // 1024
+        files = self.stats['files']
+
+        def table(category):
+            return sorted(
+                ({'name': key, 'calls': calls, 'seconds': round(seconds, 6)} for key, (calls, seconds) in self.stats[category].items()),
+                key=lambda row: row['seconds'],
+                reverse=True,
+            )
+
+        return {
+            'tool': self.tool,
+            'wall_seconds': round(wall, 6),
+            'files': len(files),
+            'files_per_second': round(len(files) / wall, 2) if wall else None,
+            'peak_kb': peak_kb,
+            'stages': {name: {**stage, 'seconds': round(stage['seconds'], 6)} for name, stage in self.stages.items()},
+            'rules': table('rules'),
+            'patterns': table('patterns'),
+            'files_by_time': table('files'),
+        }
+
+    def finish(self, top=TOP_N):
+        """Print the top-N tables and write the JSON report."""
+        report = self.report()
+        if self.memory:
+            import tracemalloc
+            tracemalloc.stop()
+        self.enabled = False
+
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        report_path = PROFILE_DIR / f'{self.tool}.json'
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+        # Keep stdout parseable when findings are streamed as JSON
+        out = sys.stderr if machine_output() else sys.stdout
+        print(f"\n=== PROFILE ({self.tool}) ===", file=out)
+        print(f"Wall time: {report['wall_seconds']:.3f}s, {report['files']} files, {report['files_per_second']} files/s", file=out)
+
+        if report['stages']:
+            peak = f" {'Peak KB':>10}" if self.memory else ''
+            print(f"\n{'Stage':<24} {'Calls':>8} {'Seconds':>10}{peak}", file=out)
+            for name, stage in report['stages'].items():
+                peak = f" {stage['peak_kb']:>10}" if self.memory else ''
+                print(f"{name:<24} {stage['calls']:>8} {stage['seconds']:>10.3f}{peak}", file=out)
+
+        for title, rows in (('Slowest files', report['files_by_time']), ('Rules', report['rules']), ('Slowest patterns', report['patterns'])):
+            if not rows:
+                continue
+            print(f"\n{title}:", file=out)
+            for row in rows[:top]:
+                name = ' '.join(row['name'].split())
+                name = name if len(name) <= 70 else name[:67] + '...'
+                print(f"  {row['seconds']:>9.4f}s {row['calls']:>8}x  {name}", file=out)
+
+        print(f"\n[PROFILE] {report_path}", file=out)
+
+PROFILER = Profiler()
+
+def profile_memory(argv=None):
+    """Return True if --profile-memory was passed on the command line."""
+    return '--profile-memory' in (sys.argv[1:] if argv is None else argv)
+
+def profile_enabled(argv=None):
+    """Return True if --profile or --profile-memory was passed on the command line."""
+    return '--profile' in (sys.argv[1:] if argv is None else argv) or profile_memory(argv)
+
+def run_profiled(tool, main):
+    """Run a script's main function, profiling it when --profile was passed."""
+    if not profile_enabled():
+        return main()
+
+    PROFILER.start(tool, memory=profile_memory())
+    try:
+        return main()
+    finally:
+        PROFILER.finish()
\ No newline at end of file
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+File enumeration shared by the docs scripts.
+
+list_files takes the files under a directory from one
+`git ls-files -z --cached --others --exclude-standard` call, so tracked and
+new files are listed without walking ignored trees such as build output,
+docs/wwwroot or node_modules. Outside a git checkout it falls back to an
+os.scandir walk that prunes the directories matched by the .gitignore files.
+Either way the paths are filtered by a glob relative to the directory and
+returned sorted, so every script sees the same file list.
+"""
+import os
+import re
+
+from git_tools import run_git
+
+GITIGNORE = '.gitignore'
+
+# The declaration rollup generated by the build
+DTS_PATH = 'types.d.ts'
+
+def glob_regex(pattern):
+    """Translate a glob with `*`, `?`, `[...]` and `**` into a regex over '/'-separated paths."""
+    regex = ''
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith('**/', i):
+            regex += '(?:.*/)?'
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            regex += '.*'
+            i += 2
+            continue
+
+        if char == '*':
+            regex += '[^/]*'
+        elif char == '?':
+            regex += '[^/]'
+        elif char == '[' and ']' in pattern[i + 2:]:
+            end = pattern.index(']', i + 2)
+            body = pattern[i + 1:end]
+            regex += '[' + ('^' + body[1:] if body.startswith('!') else body).replace('\\', '\\\\') + ']'
+            i = end
+        elif char == '\\' and i + 1 < len(pattern):
+            i += 1
+            regex += re.escape(pattern[i])
+        else:
+            regex += re.escape(char)
+        i += 1
+    return regex
+
+def parse_gitignore(file_path):
+    """Return (regex, negated, directory_only) rules of a .gitignore, relative to its directory."""
+    rules = []
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return rules
+
+    for line in lines:
+        line = line.rstrip()
+        if not line or line.startswith('#'):
+            continue
+        negated = line.startswith('!')
+        if negated:
+            line = line[1:]
+        directory_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            continue
+        # A pattern with a slash is anchored to the .gitignore directory
+        anchored = '/' in line
+        regex = glob_regex(line.lstrip('/'))
+        rules.append((re.compile(('' if anchored else '(?:.*/)?') + regex + '$'), negated, directory_only))
+    return rules
+
+class IgnoreRules:
+    """The .gitignore rules in effect while walking a tree outside git."""
+
+    def __init__(self):
+        # (directory, rules) in the order the .gitignore files were loaded
+        self.sources = []
+
+    def load(self, directory):
+        rules = parse_gitignore(os.path.join(directory, GITIGNORE))
+        if rules:
+            self.sources.append((directory, rules))
+
+    def ignored(self, path, is_dir):
+        """Return True if the last rule matching a path ignores it."""
+        result = False
+        for directory, rules in self.sources:
+            relative = os.path.relpath(path, directory).replace(os.sep, '/')
+            if relative.startswith('../'):
+                continue
+            for regex, negated, directory_only in rules:
+                if (is_dir or not directory_only) and regex.match(relative):
+                    result = not negated
+        return result
+
+def walk_files(root):
+    """Return the '/'-separated paths of the files under root that .gitignore does not exclude."""
+    rules = IgnoreRules()
+    # The .gitignore files above root apply as well, up to the working directory
+    parents = []
+    directory = os.path.normpath(root)
+    while directory not in ('', '.', os.sep) and not directory.startswith('..'):
+        directory = os.path.dirname(directory)
+        parents.append(directory or '.')
+    for directory in reversed(parents):
+        rules.load(directory)
+
+    paths = []
+    pending = [os.path.normpath(root)]
+    while pending:
+        directory = pending.pop()
+        rules.load(directory)
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name == '.git':
+                continue
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if rules.ignored(entry.path, is_dir):
+                continue
+            if is_dir:
+                pending.append(entry.path)
+            else:
+                paths.append(entry.path.replace(os.sep, '/'))
+    return paths
+
+def git_files(root):
+    """Return the tracked and untracked, not ignored files under root, or None outside git."""
+    try:
+        # -t tags deleted files with R, so they can be dropped without a stat per file
+        output = run_git(['ls-files', '-z', '-t', '--cached', '--deleted', '--others', '--exclude-standard', '--', root])
+    except (OSError, RuntimeError):
+        return None
+
+    paths = set()
+    deleted = set()
+    for entry in output.split(b'\0'):
+        if not entry:
+            continue
+        tag, path = entry[:1], entry[2:].decode('utf-8', errors='surrogateescape')
+        (deleted if tag == b'R' else paths).add(path)
+    return paths - deleted
+
+def list_files(root, pattern='**/*'):
+    """Return the sorted paths of the files under root whose path relative to root matches pattern."""
+    root = os.path.normpath(root)
+    if not os.path.isdir(root):
+        return []
+
+    paths = git_files(root)
+    if paths is None:
+        paths = walk_files(root)
+
+    prefix = '' if root == '.' else root.replace(os.sep, '/') + '/'
+    regex = re.compile(glob_regex(pattern) + '$')
+    return [
+        os.path.normpath(path)
+        for path in sorted(paths)
+        if path.startswith(prefix) and regex.match(path[len(prefix):])
+    ]
+
+def iter_source_files(src_path='src'):
+    """Yield every .ts file under src_path in a stable order."""
+    yield from list_files(src_path, '**/*.ts')
\ No newline at end of file
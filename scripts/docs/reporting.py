@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Output formats shared by the analyzers.
+
+`--format text` (the default) prints the human-oriented report. With
+`--format ndjson` every finding is written as one JSON object per line as
+soon as it is produced, and `--format json` streams the same objects as a
+single JSON array, so CI can consume results before the scan finishes
+without the analyzers holding every finding in memory. In the machine
+formats progress messages go to stderr and stdout only carries findings;
+the same holds for the patch the mutators print with --dry-run.
+Inside json_array() the tools of a chained run share a single JSON array.
+"""
+import contextlib
+import json
+import sys
+
+FORMATS = ('text', 'json', 'ndjson')
+
+# Findings written so far while several tools share one JSON array
+_shared_array = None
+
+def output_format(argv=None):
+    """Return the format selected with --format (text by default)."""
+    argv = sys.argv[1:] if argv is None else argv
+    selected = 'text'
+    for i, arg in enumerate(argv):
+        if arg == '--format' and i + 1 < len(argv):
+            selected = argv[i + 1]
+        elif arg.startswith('--format='):
+            selected = arg.split('=', 1)[1]
+
+    if selected not in FORMATS:
+        sys.exit(f"Unknown --format {selected!r}, expected one of: {', '.join(FORMATS)}")
+    return selected
+
+def patch_output(argv=None):
+    """Return True if --dry-run was passed, so stdout carries a patch."""
+    return '--dry-run' in (sys.argv[1:] if argv is None else argv)
+
+def machine_output(argv=None):
+    """Return True if stdout is reserved for JSON findings or a --dry-run patch."""
+    return output_format(argv) != 'text' or patch_output(argv)
+
+def progress(message, stderr=False):
+    """Print a progress message, keeping stdout clean in the machine formats."""
+    print(message, file=sys.stderr if stderr or machine_output() else sys.stdout)
+
+def emit(findings, fmt, tool):
+    """Stream findings to stdout as JSON or NDJSON and return how many were written."""
+    global _shared_array
+    out = sys.stdout
+    shared = fmt == 'json' and _shared_array is not None
+    count = 0
+    if fmt == 'json' and not shared:
+        out.write('[')
+
+    for finding in findings:
+        line = json.dumps({'tool': tool, **finding}, ensure_ascii=False, default=str)
+        if fmt == 'json':
+            written = _shared_array + count if shared else count
+            out.write(f"{',' if written else ''}\n  {line}")
+        else:
+            out.write(f"{line}\n")
+            out.flush()
+        count += 1
+
+    if shared:
+        _shared_array += count
+    elif fmt == 'json':
+        out.write('\n]\n' if count else ']\n')
+    out.flush()
+    return count
+
+@contextlib.contextmanager
+def json_array(fmt):
+    """Write the findings of every tool that emits inside the block as one JSON array."""
+    global _shared_array
+    if fmt != 'json':
+        yield
+        return
+
+    sys.stdout.write('[')
+    _shared_array = 0
+    try:
+        yield
+    finally:
+        sys.stdout.write('\n]\n' if _shared_array else ']\n')
+        sys.stdout.flush()
+        _shared_array = None
\ No newline at end of file
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Shared driver for the scripts that rewrite files under src/.
+
+The driver enumerates the source files in sorted order, skips files the
+content-hash cache knows are already normalized, and runs the per-file
+function of a script either serially or across a process pool (--jobs N).
+Worker output is captured and replayed in file order, so serial and parallel
+runs print identical logs.
+
+The per-file function returns the old and new contents of a changed file
+instead of writing it. The driver writes every changed file in one atomic
+batch at the end of the run, or with --dry-run prints a unified diff and
+leaves the tree untouched.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+from atomic_write import write_files_atomic
+from file_cache import FileCache
+from git_scope import add_scope_arguments, git_scope
+from profiling import PROFILER
+from repo_files import iter_source_files
+from reporting import progress
+
+def _call_captured(func, file_path):
+    """Run func on one file and return its result together with anything it printed."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output), PROFILER.file(file_path):
+        result = func(file_path)
+    return result, output.getvalue()
+
+def map_files(func, file_paths, jobs=1):
+    """Apply func to every file and return (result, output) pairs in input order."""
+    if jobs <= 1 or len(file_paths) < 2:
+        return [_call_captured(func, file_path) for file_path in file_paths]
+
+    # Serial runs skip importing multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunksize = max(1, len(file_paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(_call_captured, [func] * len(file_paths), file_paths, chunksize=chunksize))
+
+def create_parser(description):
+    """Return the argument parser shared by the mutator scripts."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of worker processes (0 uses every CPU)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='process every file even if the cache marks it as normalized')
+    parser.add_argument('--profile', action='store_true',
+                        help='record per-file, per-rule and per-pattern timings (runs serially)')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='like --profile, and record the peak memory of each stage (slows the timings down)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='print the changes as a unified diff instead of writing them')
+    add_scope_arguments(parser)
+    return parser
+
+def format_patch(file_path, old_content, new_content):
+    """Return the unified diff of one file in the form git apply accepts."""
+    import difflib
+
+    lines = []
+    for line in difflib.unified_diff(
+        old_content.splitlines(keepends=True),
+        new_content.splitlines(keepends=True),
+        f"a/{file_path}",
+        f"b/{file_path}",
+    ):
+        lines.append(line)
+        if not line.endswith('\n'):
+            lines.append('\n\\ No newline at end of file\n')
+    return ''.join(lines)
+
+def run_mutator(tool, process_file, tag, version, description=None, argv=None, args=None):
+    """Run a per-file mutator over src/ and return the summary counts."""
+    if args is None:
+        args = create_parser(description).parse_args(argv)
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    if PROFILER.enabled:
+        # Timings are collected in this process only
+        jobs = 1
+
+    cache = FileCache(tool, version, not args.no_cache)
+    with PROFILER.stage('walk'):
+        file_paths = list(iter_source_files('src'))
+    # Mutators rewrite the working tree, so a scope only selects the files
+    scope = git_scope(args.changed_since, args.staged)
+    if scope is not None:
+        file_paths = scope.filter(file_paths)
+
+    pending = []
+    files_cached = 0
+    for file_path in file_paths:
+        hit, _ = cache.lookup(file_path)
+        if hit:
+            files_cached += 1
+        else:
+            pending.append(file_path)
+
+    # With --dry-run stdout only carries the patch
+    log = sys.stderr if args.dry_run else sys.stdout
+    rewrites = {}
+    for file_path, (rewrite, output) in zip(pending, map_files(process_file, pending, jobs)):
+        if output:
+            log.write(output)
+        if rewrite:
+            rewrites[file_path] = rewrite
+            progress(f"[{tag}] {file_path}", stderr=args.dry_run)
+        elif rewrite is False:
+            # Only files the pass left untouched are known to be normalized
+            cache.store(file_path, True)
+
+    if args.dry_run:
+        for file_path, (old_content, new_content) in rewrites.items():
+            sys.stdout.write(format_patch(file_path, old_content, new_content))
+    else:
+        with PROFILER.stage('write'):
+            write_files_atomic(rewrites)
+
+    if scope is None:
+        cache.retain(file_paths)
+    cache.save()
+
+    return {
+        'processed': len(file_paths),
+        'changed': len(rewrites),
+        'cached': files_cached,
+    }
\ No newline at end of file
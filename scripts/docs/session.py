@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+In-process session shared by the subcommands of `python -m scripts.docs`.
+
+A session walks src/ once and keeps the contents of the source files it
+touched in memory. Mutator subcommands apply their rule to the in-memory
+contents, so a chain such as `fix clean add-params` reads every file once and
+writes the changed files in one atomic batch, either when the chain ends or
+when a reporting subcommand needs the tree on disk. The process-wide source
+and markdown indexes are shared by every subcommand and only the written
+files are rescanned.
+"""
+import importlib
+import sys
+
+from file_cache import FileCache, tool_version
+from profiling import PROFILER
+from reporting import progress
+
+class DocsSession:
+    """Source files and pending rewrites shared by the subcommands of one invocation."""
+
+    def __init__(self, src_path='src', dry_run=False, use_cache=True, scope=None):
+        self.src_path = src_path
+        self.dry_run = dry_run
+        self.use_cache = use_cache
+        self.scope = scope
+        self.originals = {}
+        self.contents = {}
+        self._file_paths = None
+
+    @property
+    def file_paths(self):
+        """Return the source files, walking src/ on first use."""
+        if self._file_paths is None:
+            from repo_files import iter_source_files
+            with PROFILER.stage('walk'):
+                self._file_paths = list(iter_source_files(self.src_path))
+            if self.scope is not None:
+                self._file_paths = self.scope.filter(self._file_paths)
+        return self._file_paths
+
+    def read(self, file_path):
+        """Return the current contents of a source file, reading it at most once."""
+        if file_path not in self.contents:
+            with PROFILER.stage('read'):
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    self.originals[file_path] = self.contents[file_path] = f.read()
+        return self.contents[file_path]
+
+    def modified(self, file_path):
+        """Return True if the session changed a file that is not written yet."""
+        return file_path in self.contents and self.contents[file_path] != self.originals[file_path]
+
+    def run_rule(self, rule_name, tag, file_paths=None):
+        """Apply one JSDoc rule to the source files in memory and return the summary counts.
+
+        file_paths narrows the run to some of the session's files.
+        """
+        from jsdoc_rules import RULES, apply_rules
+
+        module = importlib.import_module(RULES[rule_name][0])
+        cache = FileCache(module.__name__, tool_version(module.__file__, module.TOOL_VERSION), self.use_cache)
+        file_paths = self.file_paths if file_paths is None else file_paths
+        changed = 0
+        cached = 0
+        errors = 0
+
+        for file_path in file_paths:
+            # The cache describes the file on disk, which is stale once the session changed it
+            if not self.modified(file_path):
+                hit, _ = cache.lookup(file_path)
+                if hit:
+                    cached += 1
+                    continue
+
+            with PROFILER.file(file_path):
+                content = self.read(file_path)
+                try:
+                    new_content = apply_rules(content, (rule_name,))
+                except Exception as e:
+                    progress(f"Error processing {file_path}: {e}", stderr=self.dry_run)
+                    errors += 1
+                    continue
+
+            if new_content != content:
+                self.contents[file_path] = new_content
+                changed += 1
+                progress(f"[{tag}] {file_path}", stderr=self.dry_run)
+            elif not self.modified(file_path):
+                cache.store(file_path, True)
+
+        if self.scope is None:
+            cache.retain(self.file_paths)
+        cache.save()
+
+        return {
+            'processed': len(file_paths),
+            'changed': changed,
+            'cached': cached,
+            'errors': errors,
+        }
+
+    def pending(self):
+        """Return {path: (old, new)} for every changed file that is not written yet."""
+        return {
+            file_path: (self.originals[file_path], content)
+            for file_path, content in self.contents.items()
+            if content != self.originals[file_path]
+        }
+
+    def flush(self):
+        """Write the pending rewrites in one atomic batch and return how many files changed.
+
+        With dry_run nothing is written; the pending changes are printed as a
+        patch when the session is closed, so reporting subcommands see the
+        tree as it is on disk, and progress messages go to stderr.
+        """
+        rewrites = self.pending()
+        if not rewrites or self.dry_run:
+            return 0
+
+        from atomic_write import write_files_atomic
+        from watch import refresh_models
+
+        with PROFILER.stage('write'):
+            write_files_atomic(rewrites)
+        for file_path, (_, new_content) in rewrites.items():
+            self.originals[file_path] = new_content
+        refresh_models(set(rewrites))
+        progress(f"[WRITTEN] {len(rewrites)} files")
+        return len(rewrites)
+
+    def close(self):
+        """Write the pending rewrites, or print them as a unified diff with dry_run."""
+        if not self.dry_run:
+            return self.flush()
+
+        from runner import format_patch
+
+        rewrites = self.pending()
+        for file_path, (old_content, new_content) in rewrites.items():
+            sys.stdout.write(format_patch(file_path, old_content, new_content))
+        return len(rewrites)
\ No newline at end of file
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Persistent symbol index of the TypeScript sources in src/.
+
+The index walks src/ once and records every top-level interface, type alias,
+class, enum, function and const declaration together with its file, byte span,
+body span and the span of the JSDoc block attached to it. Interfaces also get
+a member table with the name, optional flag, type span, attached JSDoc and
+annotation tags of every property and method. It also keeps the span and the
+annotation tags of every JSDoc block in each file, so reporting tools only
+have to open the files that actually contain findings.
+
+The index is stored in scripts/docs/.cache through the shared content-hash
+cache, so only edited files are rescanned.
+"""
+import os
+import re
+import sys
+
+from file_cache import FileCache, cache_path, tool_version
+from line_index import LineIndex, format_location
+from profiling import PROFILER
+from profiling import run_profiled
+from reporting import emit, output_format
+from repo_files import iter_source_files
+from ts_lexer import (
+    STATEMENT_KEYWORDS, find_matching_bracket, iter_code_tokens, iter_declarations, iter_members,
+    iter_top_level_groups, parse_param, split_params,
+)
+
+INDEX_VERSION = 5
+
+INDEXED_KINDS = {'interface', 'type', 'class', 'function', 'enum', 'const'}
+# Kinds that reach the types.d.ts rollup even when they are not exported
+TYPE_KINDS = {'interface', 'type', 'class', 'enum'}
+TAG_PATTERN = re.compile(r'@(\w+)')
+PARAM_TAG_PATTERN = re.compile(r'\[?([\w$.]+)[^\s\]]*\]?\s*(?:-\s*)?(.*)', re.S)
+JSDOC_LINE_PREFIX = re.compile(r'^\s*(?:/\*\*|\*/|\*(?!/))?[ \t]?', re.M)
+
+# Tokens before a `(` that opens the parameters of an arrow function
+ARROW_PREFIXES = {'=', '(', ',', '>'}
+
+# Tokens after which a `{` belongs to a return type rather than the function body
+TYPE_OPERATORS = {':', '|', '&', ',', '(', '<', '=', '=>', '?'}
+
+def _find_declaration_end(text, declaration):
+    """Return (end, body) offsets of a top-level declaration whose header was parsed."""
+    kind = declaration['kind']
+    body_start = None
+    previous = None
+    end = len(text)
+
+    for token, depth in iter_top_level_groups(text, declaration['header_end']):
+        value = token.value if token.kind == 'punct' else None
+
+        if kind in ('interface', 'class', 'enum', 'function'):
+            if body_start is None:
+                if value == '{' and depth == 0 and (
+                    kind != 'function' or previous is None or previous.value not in TYPE_OPERATORS
+                ):
+                    body_start = token.start
+                elif value == ';' and depth == 0:
+                    return token.end, None
+            elif value == '}' and depth == 0:
+                return token.end, [body_start, token.end]
+        else:
+            if depth == 0 and token.line_break and token.kind == 'word' and token.value in STATEMENT_KEYWORDS:
+                end = previous.end if previous else token.start
+                break
+            if value == ';' and depth == 0:
+                end = token.end
+                break
+            if body_start is None and value == '=' and depth == 0:
+                body_start = token.end
+        previous = token
+    else:
+        end = previous.end if previous else end
+
+    if kind in ('interface', 'class', 'enum', 'function'):
+        return end, None
+    return end, [body_start, end] if body_start is not None else None
+
+def _arrow_params_span(text, body):
+    """Return the parameter span of the first arrow function in a const initializer, or None."""
+    tokens = iter_code_tokens(text, body[0], body[1])
+    previous = None
+    for token in tokens:
+        if token.value == '(' and token.kind == 'punct' and previous is not None and (
+            previous.value in ARROW_PREFIXES if previous.kind == 'punct' else previous.value == 'async'
+        ):
+            closing = find_matching_bracket(text, token.start)
+            following = next(iter_code_tokens(text, closing, body[1]), None)
+            if following is not None and following.value in ('=>', ':'):
+                return (token.end, closing - 1)
+        previous = token
+    return None
+
+def param_names(params_text):
+    """Return the names of a parameter list, with None for destructured parameters."""
+    names = []
+    for param in split_params(params_text):
+        parsed = parse_param(param)
+        names.append(None if parsed['destructured'] else parsed['name'])
+    return names
+
+def param_tags(jsdoc_text):
+    """Return {name: description} for the @param tags of a JSDoc block."""
+    tags = {}
+    for tag in re.split(r'\n(?=@)', JSDOC_LINE_PREFIX.sub('', jsdoc_text).strip()):
+        if not re.match(r'@param\s', tag):
+            continue
+        rest = tag[len('@param'):].lstrip()
+        if rest.startswith('{'):
+            # Skip the type, which may contain nested braces
+            rest = rest[find_matching_bracket(rest, 0):].lstrip()
+        match = PARAM_TAG_PATTERN.match(rest)
+        if match:
+            tags.setdefault(match.group(1), ' '.join(match.group(2).split()))
+    return tags
+
+def scan_members(text, lines, body):
+    """Return the member table of an interface body."""
+    members = []
+    for jsdoc, member in iter_members(text, body[0] + 1, body[1] - 1):
+        line, column = lines.position(member['start'])
+        members.append({
+            'name': member['name'],
+            'kind': member['kind'],
+            'optional': member.get('optional', False),
+            'line': line,
+            'column': column,
+            'span': [member['start'], member['end']],
+            'type': list(member['type_span']),
+            'jsdoc': [jsdoc.start, jsdoc.end] if jsdoc is not None else None,
+            'tags': sorted(set(TAG_PATTERN.findall(jsdoc.value))) if jsdoc is not None else [],
+        })
+    return members
+
+def scan_source(data):
+    """Scan the bytes of one TypeScript file and return its symbols and JSDoc blocks."""
+    # The lexer works on str; latin-1 maps every byte to one character, so its offsets are byte offsets
+    text = str(data, 'latin-1')
+    lines = LineIndex(data)
+    symbols = []
+    jsdoc_blocks = []
+
+    for jsdoc, declaration in iter_declarations(text):
+        if jsdoc is not None:
+            line, column = lines.position(jsdoc.start)
+            jsdoc_blocks.append({
+                'span': [jsdoc.start, jsdoc.end],
+                'line': line,
+                'column': column,
+                'tags': sorted(set(TAG_PATTERN.findall(jsdoc.value))),
+            })
+
+        if declaration is None or not declaration.get('top_level'):
+            continue
+        if declaration['kind'] not in INDEXED_KINDS or not declaration['name']:
+            continue
+
+        end, body = _find_declaration_end(text, declaration)
+        params = declaration['params_span'] if declaration['kind'] == 'function' else None
+        signature = params
+        if declaration['kind'] == 'const' and declaration['exported'] and body:
+            signature = _arrow_params_span(text, body)
+        line, column = lines.position(declaration['start'])
+        symbols.append({
+            'name': declaration['name'],
+            'kind': declaration['kind'],
+            'exported': declaration['exported'],
+            'line': line,
+            'column': column,
+            'span': [declaration['start'], end],
+            'body': body,
+            'params': list(params) if params else None,
+            'jsdoc': [jsdoc.start, jsdoc.end] if jsdoc is not None else None,
+        })
+        if declaration['kind'] == 'interface' and body:
+            symbols[-1]['members'] = scan_members(text, lines, body)
+        if signature is not None:
+            symbols[-1]['param_names'] = param_names(text[signature[0]:signature[1]])
+            symbols[-1]['param_tags'] = param_tags(jsdoc.value.encode('latin-1').decode('utf-8', errors='replace')) if jsdoc is not None else {}
+
+    return symbols, jsdoc_blocks
+
+def scan_file(file_path):
+    """Scan one source file and return its index record."""
+    with PROFILER.stage('read'):
+        with open(file_path, 'rb') as f:
+            data = f.read()
+    with PROFILER.stage('parse'):
+        symbols, jsdoc_blocks = scan_source(data)
+    return {'symbols': symbols, 'jsdoc_blocks': jsdoc_blocks}
+
+class SourceIndex:
+    """Symbol index of a source tree, keyed by symbol name."""
+
+    def __init__(self, src_path='src', files=None):
+        self.src_path = src_path
+        self.files = files or {}
+        self._index_names()
+
+    def _index_names(self):
+        self._members = {}
+        self.symbols = {}
+        for file_path, record in self.files.items():
+            for symbol in record['symbols']:
+                self.symbols.setdefault(symbol['name'], []).append({'file': file_path, **symbol})
+
+    def update(self, file_paths):
+        """Rescan the given files in memory, dropping the ones that were deleted."""
+        for file_path in file_paths:
+            if os.path.exists(file_path):
+                self.files[file_path] = scan_file(file_path)
+            else:
+                self.files.pop(file_path, None)
+        self._index_names()
+
+    def lookup(self, name, kind=None, exported=None):
+        """Return every definition of name, optionally filtered by kind and export status."""
+        return [
+            symbol for symbol in self.symbols.get(name, [])
+            if (kind is None or symbol['kind'] == kind)
+            and (exported is None or symbol['exported'] == exported)
+        ]
+
+    def conflict(self, name):
+        """Return the conflict of a name defined in more than one file, or None.
+
+        'duplicate' means several files export the name, 'shadowing' that one
+        file exports it and others declare a private symbol of the same name,
+        and 'renamed' that private types share the name, which the rollup
+        renames (Action$1). Private values sharing a name do not conflict.
+        """
+        definitions = self.symbols.get(name, [])
+        if len({symbol['file'] for symbol in definitions}) < 2:
+            return None
+
+        exported_files = {symbol['file'] for symbol in definitions if symbol['exported']}
+        if len(exported_files) > 1:
+            conflict = 'duplicate'
+        elif exported_files:
+            conflict = 'shadowing'
+        elif len({symbol['file'] for symbol in definitions if symbol['kind'] in TYPE_KINDS}) > 1:
+            conflict = 'renamed'
+        else:
+            return None
+
+        return {
+            'name': name,
+            'conflict': conflict,
+            'definitions': [
+                {key: symbol[key] for key in ('file', 'line', 'column', 'kind', 'exported')}
+                for symbol in definitions
+            ],
+        }
+
+    def conflicts(self):
+        """Yield the conflict of every conflicting name in name order."""
+        for name in sorted(self.symbols):
+            conflict = self.conflict(name)
+            if conflict is not None:
+                yield conflict
+
+    def files_defining(self, name, kind=None):
+        """Return the files exporting a symbol with the given name."""
+        return [symbol['file'] for symbol in self.lookup(name, kind, exported=True)]
+
+    def iter_symbols(self, kind=None):
+        """Yield every indexed symbol in file order."""
+        for file_path, record in self.files.items():
+            for symbol in record['symbols']:
+                if kind is None or symbol['kind'] == kind:
+                    yield {'file': file_path, **symbol}
+
+    def members(self, file_path, interface_name):
+        """Return {name: member} for an interface declared in a file, or None if it is not declared there.
+
+        Merged declarations of the interface in the same file share one table,
+        which is built on first use.
+        """
+        key = (file_path, interface_name)
+        if key not in self._members:
+            record = self.files.get(file_path)
+            table = None
+            for symbol in record['symbols'] if record else []:
+                if symbol['kind'] == 'interface' and symbol['name'] == interface_name:
+                    table = {} if table is None else table
+                    for member in symbol.get('members', []):
+                        table.setdefault(member['name'], member)
+            self._members[key] = table
+        return self._members[key]
+
+    def jsdoc_blocks(self, file_path):
+        """Return the JSDoc blocks recorded for a file."""
+        record = self.files.get(file_path)
+        return record['jsdoc_blocks'] if record else []
+
+def read_span(file_path, span, data=None):
+    """Read and decode a byte span of a source file, or of its contents in data."""
+    if not span:
+        return ''
+    if data is not None:
+        return str(data[span[0]:span[1]], 'utf-8')
+    with open(file_path, 'rb') as f:
+        f.seek(span[0])
+        return f.read(span[1] - span[0]).decode('utf-8')
+
+def build_source_index(src_path='src', rebuild=False):
+    """Load the index from disk, rescanning only files that changed since it was saved."""
+    cache = FileCache('source_index', tool_version(__file__, INDEX_VERSION))
+    if rebuild:
+        cache.entries = {}
+
+    files = {}
+    for file_path in iter_source_files(src_path):
+        hit, record = cache.lookup(file_path)
+        if not hit:
+            record = scan_file(file_path)
+            cache.store(file_path, record)
+        files[file_path] = record
+
+    cache.retain(files)
+    cache.save()
+
+    return SourceIndex(src_path, files)
+
+_indexes = {}
+# src_path -> files changed on disk since its process-wide index was last refreshed
+_stale = {}
+
+def get_source_index(src_path='src'):
+    """Return the process-wide index for src_path, building it on first use."""
+    if src_path not in _indexes:
+        _indexes[src_path] = build_source_index(src_path)
+    elif _stale.get(src_path):
+        _indexes[src_path].update(sorted(_stale.pop(src_path)))
+    return _indexes[src_path]
+
+def mark_stale(file_paths):
+    """Record changed source files; the loaded indexes rescan them on their next use."""
+    for src_path in _indexes:
+        _stale.setdefault(src_path, set()).update(file_paths)
+
+def describe_definition(definition):
+    """Return the one-line form of a definition site."""
+    exported = ' (exported)' if definition['exported'] else ''
+    return f"{definition['kind']} {format_location(definition['file'], definition['line'], definition['column'])}{exported}"
+
+def print_conflicts(index):
+    """Print every name defined in more than one file."""
+    counts = {}
+    print(f"\n=== NAME CONFLICTS ===")
+    for conflict in index.conflicts():
+        counts[conflict['conflict']] = counts.get(conflict['conflict'], 0) + 1
+        print(f"[{conflict['conflict'].upper()}] {conflict['name']}")
+        for definition in conflict['definitions']:
+            print(f"   - {describe_definition(definition)}")
+
+    summary = ', '.join(f"{counts[name]} {name}" for name in sorted(counts)) or 'none'
+    print(f"\n[CONFLICTS] {summary}")
+
+def main():
+    """Rebuild the index and print a summary."""
+    rebuild = '--rebuild' in sys.argv[1:]
+    index = build_source_index(rebuild=rebuild)
+
+    fmt = output_format()
+    if '--conflicts' in sys.argv[1:] and fmt != 'text':
+        emit(index.conflicts(), fmt, 'source_index')
+        return
+
+    counts = {}
+    for symbol in index.iter_symbols():
+        counts[symbol['kind']] = counts.get(symbol['kind'], 0) + 1
+
+    print(f"[INDEXED] {len(index.files)} files, {len(index.symbols)} names")
+    for kind in sorted(counts):
+        print(f"  {kind}: {counts[kind]}")
+    print(f"[SAVED] {cache_path('source_index')}")
+
+    if '--conflicts' in sys.argv[1:]:
+        print_conflicts(index)
+
+if __name__ == "__main__":
+    run_profiled('source_index', main)
\ No newline at end of file
@@ -0,0 +1,60 @@
+import importlib
+import os
+import re
+import sys
+import unittest
+
+from profiling import SCRIPTS_DIR, Profiler, TimedPattern
+
+def iter_patterns(value):
+    """Yield the compiled regexes and timing proxies held by a module-level value."""
+    if isinstance(value, (re.Pattern, TimedPattern)):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from iter_patterns(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from iter_patterns(item)
+
+def script_modules():
+    """Return the loaded modules of the docs scripts."""
+    return [
+        module for module in list(sys.modules.values())
+        if getattr(module, '__file__', None) and os.path.dirname(os.path.abspath(module.__file__)) == SCRIPTS_DIR
+    ]
+
+class InstrumentPatternsTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        for file_name in sorted(os.listdir(SCRIPTS_DIR)):
+            if file_name.endswith('.py') and file_name != '__main__.py':
+                importlib.import_module(file_name[:-3])
+        cls.profiler = Profiler()
+        cls.profiler.start('test_profiling')
+        cls.profiler.enabled = False
+
+    def test_every_module_regex_is_reported(self):
+        expected = set()
+        for module in script_modules():
+            for name, value in vars(module).items():
+                for pattern in iter_patterns(value):
+                    self.assertIsInstance(pattern, TimedPattern, f"{module.__name__}.{name}")
+                    pattern.search(b'' if isinstance(pattern.pattern, bytes) else '')
+                    expected.add(pattern._key)
+
+        reported = {row['name'] for row in self.profiler.report()['patterns']}
+        self.assertTrue(expected)
+        self.assertEqual(expected - reported, set())
+
+    def test_pattern_tables_are_timed(self):
+        import fix_jsdoc_annotations
+
+        for pattern, _ in fix_jsdoc_annotations.BLANK_LINE_CLEANUP:
+            self.assertIsInstance(pattern, TimedPattern)
+        for pattern in fix_jsdoc_annotations.PATTERNS_TO_REMOVE:
+            self.assertIsInstance(pattern, TimedPattern)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
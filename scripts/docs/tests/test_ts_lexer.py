@@ -0,0 +1,25 @@
+import unittest
+
+from ts_lexer import parse_param, split_params
+
+class SplitParamsTest(unittest.TestCase):
+
+    def test_comparison_in_default_value(self):
+        self.assertEqual(
+            split_params('a: number = x < y ? 1 : 2, b: string'),
+            ['a: number = x < y ? 1 : 2', 'b: string'],
+        )
+
+    def test_generic_arguments_keep_their_commas(self):
+        self.assertEqual(
+            split_params('a: Map<string, Array<number>>, cb: (x: Foo<A, B>) => Bar<C, D>, c = b > d'),
+            ['a: Map<string, Array<number>>', 'cb: (x: Foo<A, B>) => Bar<C, D>', 'c = b > d'],
+        )
+
+    def test_parse_param_after_comparison(self):
+        parsed = parse_param('a: number = x < y ? 1 : 2')
+        self.assertEqual(parsed['name'], 'a')
+        self.assertEqual(parsed['type'], 'number')
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
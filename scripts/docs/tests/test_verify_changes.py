@@ -0,0 +1,20 @@
+import unittest
+
+from verify_changes import code_fingerprint, describe_code_changes
+
+class CodeFingerprintTest(unittest.TestCase):
+
+    def test_jsdoc_only_change_keeps_fingerprint(self):
+        old = b'function f(x) {\n    return x;\n}\n'
+        new = b'function f(x) {\n    /** Returns x */\n    return x;\n}\n'
+        self.assertEqual(code_fingerprint(old), code_fingerprint(new))
+
+    def test_comment_after_return_changes_fingerprint(self):
+        # The line break inside the comment makes ASI end the return statement
+        old = b'function f(x) { return x; }\n'
+        new = b'function f(x) { return /** doc */\n x; }\n'
+        self.assertNotEqual(code_fingerprint(old), code_fingerprint(new))
+        self.assertEqual(describe_code_changes(old, new), ['CHANGED CODE: x -> \\n x'])
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
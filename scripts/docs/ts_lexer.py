@@ -0,0 +1,522 @@
+#!/usr/bin/env python3
+"""
+Small streaming lexer for TypeScript sources.
+
+The lexer makes one linear pass over the text and understands strings,
+template literals (including nested ${...} expressions), regular expression
+literals, line/block/JSDoc comments and balanced brackets. On top of the
+token stream it recognizes the declaration each JSDoc block attaches to and
+splits parameter lists at top-level commas, so generics such as
+Record<string, T>, destructured parameters and default values are handled.
+
+Offsets are indexes into the text that was passed in. To get byte offsets,
+decode the file with latin-1, which maps every byte to exactly one character.
+"""
+import re
+from collections import namedtuple
+
+Token = namedtuple('Token', ['kind', 'value', 'start', 'end', 'line_break'])
+
+CODE_PATTERN = re.compile(r'''
+    (?P<ws>\s+)
+  | (?P<jsdoc>/\*\*(?!/).*?\*/)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>"(?:[^"\\\n]|\\.)*"?|'(?:[^'\\\n]|\\.)*'?)
+  | (?P<word>[A-Za-z_$][\w$]*)
+  | (?P<number>\d[\w.]*)
+  | (?P<punct>=>|\.\.\.|\?\.|\?\?|[=!]==?|<=|>=|&&|\|\||\+\+|--|.)
+''', re.DOTALL | re.VERBOSE)
+TEMPLATE_PATTERN = re.compile(r'(?:[^`\\$]|\\.|\$(?!\{))*', re.DOTALL)
+REGEX_PATTERN = re.compile(r'/(?:[^/\\\n\[]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*')
+# Comments and string literals only, for finding JSDoc blocks without tokenizing the code
+BLOCK_SCAN_PATTERN = re.compile(r'''
+    (?=[/"'`])
+    (?:
+        (?P<jsdoc>/\*\*(?!/).*?\*/)
+      | /\*.*?\*/
+      | //[^\n]*
+      | "[^"\\\n]*(?:\\.[^"\\\n]*)*"?
+      | '[^'\\\n]*(?:\\.[^'\\\n]*)*'?
+      | `[^`\\]*(?:\\.[^`\\]*)*`?
+    )
+''', re.DOTALL | re.VERBOSE)
+
+OPEN_BRACKETS = {'(': ')', '[': ']', '{': '}'}
+CLOSE_BRACKETS = {')', ']', '}'}
+
+# Words after which a type follows, so a `<` opens its type arguments
+TYPE_KEYWORDS = {'extends', 'implements', 'as', 'satisfies', 'keyof', 'is'}
+
+# Tokens after which a `/` starts a regular expression rather than a division
+REGEX_PREFIX_WORDS = {
+    'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete',
+    'void', 'throw', 'instanceof', 'yield', 'await',
+}
+
+MODIFIERS = {
+    'export', 'default', 'declare', 'abstract', 'async', 'public', 'private',
+    'protected', 'static', 'readonly', 'override', 'get', 'set',
+}
+DECLARATION_KEYWORDS = {
+    'function', 'interface', 'class', 'type', 'enum', 'const', 'let', 'var', 'namespace',
+}
+STATEMENT_KEYWORDS = DECLARATION_KEYWORDS | {'export', 'import', 'declare', 'abstract', 'async'}
+
+def _regex_allowed(previous):
+    """Return True if a `/` after the previous significant token starts a regex literal."""
+    if previous is None:
+        return True
+    if previous.kind == 'word':
+        return previous.value in REGEX_PREFIX_WORDS
+    if previous.kind == 'punct':
+        return previous.value not in (')', ']', '}')
+    return False
+
+def tokenize(text, pos=0, end=None):
+    """Yield the tokens of text from pos, skipping whitespace."""
+    end = len(text) if end is None else end
+    # Open '{' brackets, or None for the `${` of a template literal
+    braces = []
+    previous = None
+    line_break = False
+
+    while pos < end:
+        char = text[pos]
+
+        if char == '`' or (char == '}' and braces and braces[-1] is None):
+            # Template literal text, either from its start or after a ${...} expression
+            if char == '}':
+                braces.pop()
+            chunk_end = TEMPLATE_PATTERN.match(text, pos + 1).end()
+            if text.startswith('${', chunk_end):
+                braces.append(None)
+                chunk_end += 2
+            else:
+                chunk_end = min(chunk_end + 1, end)
+            previous = Token('template', text[pos:chunk_end], pos, chunk_end, line_break)
+            yield previous
+            line_break = False
+            pos = chunk_end
+            continue
+
+        if char == '/' and text[pos + 1:pos + 2] not in ('/', '*') and _regex_allowed(previous):
+            match = REGEX_PATTERN.match(text, pos)
+            if match:
+                previous = Token('regex', match.group(0), pos, match.end(), line_break)
+                yield previous
+                line_break = False
+                pos = match.end()
+                continue
+
+        match = CODE_PATTERN.match(text, pos)
+        kind = match.lastgroup
+        value = match.group(0)
+        pos = match.end()
+
+        if kind == 'ws':
+            line_break = line_break or '\n' in value
+            continue
+
+        if kind == 'punct':
+            if value == '{':
+                braces.append('{')
+            elif value == '}' and braces:
+                braces.pop()
+
+        token = Token(kind, value, match.start(), pos, line_break)
+        yield token
+        if kind in ('comment', 'jsdoc'):
+            line_break = line_break or '\n' in value
+            continue
+        previous = token
+        line_break = False
+
+def iter_code_tokens(text, pos=0, end=None):
+    """Yield the tokens of text, skipping comments."""
+    for token in tokenize(text, pos, end):
+        if token.kind not in ('comment', 'jsdoc'):
+            yield token
+
+def find_matching_bracket(text, pos):
+    """Return the offset just past the bracket that closes the one at pos."""
+    depth = 0
+    for token in iter_code_tokens(text, pos):
+        if token.kind != 'punct':
+            continue
+        if token.value in OPEN_BRACKETS:
+            depth += 1
+        elif token.value in CLOSE_BRACKETS:
+            depth -= 1
+            if depth == 0:
+                return token.end
+    return len(text)
+
+class TokenStream:
+    """Token iterator with pushback that skips plain comments but keeps JSDoc blocks."""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.buffer = []
+
+    def next(self):
+        if self.buffer:
+            return self.buffer.pop()
+        for token in self.tokens:
+            if token.kind != 'comment':
+                return token
+        return None
+
+    def peek(self):
+        token = self.next()
+        if token is not None:
+            self.buffer.append(token)
+        return token
+
+    def push(self, token):
+        self.buffer.append(token)
+
+def _skip_group(stream, opening):
+    """Consume a balanced (), [], {} or <> group whose opening token was already read."""
+    depth = 1
+    angle = opening.value == '<'
+    while True:
+        token = stream.next()
+        if token is None:
+            return None
+        if token.kind != 'punct':
+            continue
+        if token.value in OPEN_BRACKETS or (angle and token.value == '<'):
+            depth += 1
+        elif token.value in CLOSE_BRACKETS or (angle and token.value == '>'):
+            depth -= 1
+            if depth == 0:
+                return token
+
+def _parse_signature(stream, text, declaration):
+    """Read optional generics and a parameter list into declaration."""
+    token = stream.peek()
+    if token is not None and token.value == '<':
+        stream.next()
+        closing = _skip_group(stream, token)
+        if closing is None:
+            return declaration
+        declaration['generics'] = text[token.start:closing.end]
+        declaration['header_end'] = closing.end
+        token = stream.peek()
+
+    if token is not None and token.value == '(':
+        stream.next()
+        closing = _skip_group(stream, token)
+        if closing is None:
+            return declaration
+        declaration['params_span'] = (token.end, closing.start)
+        declaration['params'] = text[token.end:closing.start]
+        declaration['header_end'] = closing.end
+
+    return declaration
+
+def parse_declaration(stream, text, first):
+    """Parse the declaration starting with token first, or return None.
+
+    Only modifiers, names and balanced generic/parameter groups are consumed,
+    so bracket depth is preserved for the caller when parsing fails.
+    """
+    token = first
+    modifiers = []
+    while token is not None and token.kind == 'word' and token.value in MODIFIERS:
+        following = stream.peek()
+        if following is None or following.kind not in ('word', 'string') and following.value != '*':
+            break
+        modifiers.append(token.value)
+        token = stream.next()
+
+    if token is None:
+        return None
+
+    declaration = {
+        'kind': None,
+        'name': None,
+        'exported': 'export' in modifiers,
+        'default': 'default' in modifiers,
+        'async': 'async' in modifiers,
+        'modifiers': modifiers,
+        'generics': '',
+        'params': None,
+        'params_span': None,
+        'start': first.start,
+        'header_end': token.end,
+    }
+
+    following = stream.peek()
+    if token.kind == 'word' and token.value in DECLARATION_KEYWORDS and following is not None and (
+        following.kind == 'word' or (token.value == 'function' and following.value in ('*', '('))
+    ):
+        declaration['kind'] = token.value
+        if following.value == '*':
+            stream.next()
+            following = stream.peek()
+        if following is not None and following.kind == 'word':
+            stream.next()
+            declaration['name'] = following.value
+            declaration['header_end'] = following.end
+        if token.value in ('function', 'class', 'interface', 'type'):
+            _parse_signature(stream, text, declaration)
+        return declaration
+
+    if token.kind in ('word', 'string') and following is not None:
+        declaration['name'] = token.value.strip('\'"')
+        declaration['name_end'] = token.end
+        if following.value == '?':
+            stream.next()
+            declaration['optional'] = True
+            following = stream.peek()
+        if following is None:
+            return None
+        if following.value in ('(', '<'):
+            declaration['kind'] = 'method'
+            return _parse_signature(stream, text, declaration)
+        if following.value in (':', ';', '=', ',', '}') or following.line_break:
+            declaration['kind'] = 'property'
+            return declaration
+
+    return None
+
+def iter_jsdoc_blocks(text):
+    """Yield (jsdoc_token, declaration) for every JSDoc block in text.
+
+    The declaration is the one directly following the block, or None when the
+    block is not attached to a recognizable declaration.
+    """
+    stream = TokenStream(tokenize(text))
+    while True:
+        token = stream.next()
+        if token is None:
+            return
+        if token.kind != 'jsdoc':
+            continue
+
+        following = stream.next()
+        if following is None:
+            yield token, None
+            return
+        if following.kind == 'jsdoc':
+            stream.push(following)
+            yield token, None
+            continue
+
+        yield token, parse_declaration(stream, text, following)
+
+def scan_jsdoc_blocks(text):
+    """Yield the token of every JSDoc block in text without tokenizing the code.
+
+    Strings, template literals and other comments are skipped so a `/**`
+    inside them is not taken for a block; the declarations are not parsed.
+    """
+    for match in BLOCK_SCAN_PATTERN.finditer(text):
+        if match.lastgroup == 'jsdoc':
+            yield Token('jsdoc', match.group(0), match.start(), match.end(), False)
+
+def iter_declarations(text):
+    """Yield (jsdoc_token, declaration) for JSDoc blocks and top-level declarations.
+
+    Every JSDoc block is reported as in iter_jsdoc_blocks. Top-level
+    declarations without a JSDoc block are reported with jsdoc_token None.
+    """
+    stream = TokenStream(tokenize(text))
+    depth = 0
+    statement_start = True
+    while True:
+        token = stream.next()
+        if token is None:
+            return
+
+        if token.kind == 'jsdoc':
+            following = stream.next()
+            if following is None:
+                yield token, None
+                return
+            if following.kind == 'jsdoc':
+                stream.push(following)
+                yield token, None
+                continue
+            declaration = parse_declaration(stream, text, following)
+            if declaration is not None:
+                declaration['top_level'] = depth == 0
+                statement_start = False
+                yield token, declaration
+                continue
+            yield token, None
+            token = following
+
+        if depth == 0 and token.kind == 'word' and token.value in STATEMENT_KEYWORDS and (
+            statement_start or token.line_break
+        ):
+            declaration = parse_declaration(stream, text, token)
+            if declaration is not None and declaration['kind'] in DECLARATION_KEYWORDS:
+                declaration['top_level'] = True
+                statement_start = False
+                yield None, declaration
+                continue
+
+        if token.kind == 'punct':
+            if token.value in OPEN_BRACKETS:
+                depth += 1
+            elif token.value in CLOSE_BRACKETS:
+                depth = max(depth - 1, 0)
+            statement_start = depth == 0 and token.value in (';', '}')
+        else:
+            statement_start = False
+
+# Tokens after which, or starting with which, a line break continues the current member
+MEMBER_CONTINUATION = {':', '|', '&', '=>', ',', '?', '=', '.', '(', '[', '{', '<'}
+
+def _skip_member(stream):
+    """Consume the rest of an interface member and return its last token."""
+    depth = 0
+    last = None
+    while True:
+        token = stream.next()
+        if token is None:
+            return last
+        if depth == 0:
+            if token.value in (';', ','):
+                return last
+            # Members may also be separated by line breaks alone
+            if token.line_break and last is not None and (token.kind == 'jsdoc' or (
+                last.value not in MEMBER_CONTINUATION and token.value not in MEMBER_CONTINUATION
+            )):
+                stream.push(token)
+                return last
+        if token.kind == 'punct':
+            if token.value in OPEN_BRACKETS or token.value == '<':
+                depth += 1
+            elif token.value in CLOSE_BRACKETS or token.value == '>':
+                depth = max(depth - 1, 0)
+        if token.kind != 'jsdoc':
+            last = token
+
+def iter_members(text, pos, end):
+    """Yield (jsdoc_token, member) for every property and method of an interface body.
+
+    pos and end delimit the text between the braces of the body. The member
+    is the declaration parse_declaration returns, extended with the 'end' of
+    the member and 'type_span', the span of a property's type or of a
+    method's signature after its name. Index and call signatures are skipped.
+    """
+    stream = TokenStream(tokenize(text, pos, end))
+    jsdoc = None
+    while True:
+        token = stream.next()
+        if token is None:
+            return
+        if token.kind == 'jsdoc':
+            jsdoc = token
+            continue
+
+        if token.kind == 'punct':
+            # Index signature, call signature or a stray separator
+            stream.push(token)
+            declaration = None
+        else:
+            declaration = parse_declaration(stream, text, token)
+            if declaration is not None and declaration['kind'] not in ('property', 'method'):
+                declaration = None
+
+        last = _skip_member(stream)
+        if declaration is not None:
+            declaration['end'] = last.end if last is not None else declaration['header_end']
+            type_start = declaration['header_end']
+            if declaration['kind'] == 'property':
+                colon = text.find(':', type_start, declaration['end'])
+                type_start = colon + 1 if colon != -1 else declaration['end']
+            else:
+                type_start = declaration['name_end']
+            declaration['type_span'] = (type_start, declaration['end'])
+            yield jsdoc, declaration
+        jsdoc = None
+
+def iter_top_level_groups(text, pos=0, end=None):
+    """Yield (token, depth) pairs, where depth counts enclosing brackets and generics.
+
+    A `<` only opens a generic in type position: after a `:` annotation or a
+    type keyword such as `extends`, and inside another generic. Elsewhere, as
+    in the default value `x < y ? 1 : 2`, it is a comparison.
+    """
+    closers = []
+    # Whether the top level and each open group are in type position
+    in_type = [False]
+    previous = None
+    for token in iter_code_tokens(text, pos, end):
+        value = token.value
+        if token.kind == 'word' and value in TYPE_KEYWORDS:
+            in_type[-1] = True
+        elif token.kind == 'punct':
+            if value in OPEN_BRACKETS or (value == '<' and in_type[-1] and previous is not None and (
+                previous.kind == 'word' or previous.value in ('<', ',', '(', ':')
+            )):
+                yield token, len(closers)
+                closers.append(OPEN_BRACKETS.get(value, '>'))
+                in_type.append(value == '<' or in_type[-1])
+                previous = token
+                continue
+            if value in CLOSE_BRACKETS and value in closers:
+                # Unclosed generics inside the group are dropped with it
+                while closers:
+                    in_type.pop()
+                    if closers.pop() == value:
+                        break
+            elif value == '>' and closers and closers[-1] == '>':
+                closers.pop()
+                in_type.pop()
+            elif value == ':':
+                in_type[-1] = True
+            elif value in ('=', ',', ';') and not (closers and closers[-1] == '>'):
+                # A default value, the next parameter or the next member follows
+                in_type[-1] = False
+        yield token, len(closers)
+        previous = token
+
+def split_params(params_text):
+    """Split a parameter list at top-level commas and return the stripped parameters."""
+    params = []
+    start = 0
+    for token, depth in iter_top_level_groups(params_text):
+        if depth == 0 and token.value == ',':
+            params.append(params_text[start:token.start].strip())
+            start = token.end
+    params.append(params_text[start:].strip())
+    return [param for param in params if param]
+
+def parse_param(param):
+    """Parse one parameter into its name, type, default value and flags."""
+    colon = None
+    equals = None
+    for token, depth in iter_top_level_groups(param):
+        if depth != 0:
+            continue
+        if token.value == ':' and colon is None and equals is None:
+            colon = token
+        elif token.value == '=' and equals is None:
+            equals = token
+            break
+
+    name_end = colon.start if colon else equals.start if equals else len(param)
+    name = param[:name_end].strip()
+    optional = name.endswith('?')
+    name = name.rstrip('?').strip()
+    rest = name.startswith('...')
+    if rest:
+        name = name[3:].strip()
+
+    param_type = None
+    if colon:
+        param_type = param[colon.end:equals.start if equals else len(param)].strip()
+
+    return {
+        'name': name,
+        'type': param_type,
+        'default': param[equals.end:].strip() if equals else None,
+        'optional': optional or equals is not None,
+        'rest': rest,
+        'destructured': name[:1] in ('{', '['),
+    }
\ No newline at end of file
@@ -1,12 +1,91 @@
 #!/usr/bin/env python3
+import argparse
+import difflib
+import hashlib
+import os
 import subprocess
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
-def analyze_file_changes(file_path):
+from git_scope import add_scope_arguments
+from git_tools import NULL_SHA, BlobReader, diff_revisions, iter_raw_changes
+from profiling import PROFILER, run_profiled
+from reporting import FORMATS, emit, progress
+from ts_lexer import iter_code_tokens
+
+DEFAULT_BASE = '1.1.156'
+
+def analyze_diff_lines(lines):
+    """Classify the diff lines of a single file as JSDoc-only or suspicious"""
+    # Track different types of changes
+    changes = {
+        "jsdoc_only": True,
+        "added_lines": [],
+        "removed_lines": [],
+        "suspicious_changes": []
+    }
+
+    in_jsdoc = False
+    jsdoc_depth = 0
+
+    for line in lines:
+        if line.startswith('@@'):
+            continue
+        if line.startswith('diff --git') or line.startswith('index') or line.startswith('+++') or line.startswith('---'):
+            continue
+
+        if line.startswith('+') or line.startswith('-'):
+            content = line[1:].strip()
+
+            # Check if we're entering/exiting JSDoc
+            if '/**' in content:
+                in_jsdoc = True
+                jsdoc_depth += content.count('/**')
+            if '*/' in content:
+                jsdoc_depth -= content.count('*/')
+                if jsdoc_depth <= 0:
+                    in_jsdoc = False
+                    jsdoc_depth = 0
+
+            # Skip empty lines and lines with only whitespace
+            if not content:
+                continue
+
+            # Check if line is JSDoc related
+            is_jsdoc_line = (
+                in_jsdoc or
+                content.startswith('*') or
+                content.startswith('/**') or
+                content.startswith('*/') or
+                '@param' in content or
+                '@returns' in content or
+                '@callback' in content or
+                '@type' in content or
+                '@description' in content or
+                '@typedef' in content or
+                '@private' in content or
+                '@module' in content
+            )
+
+            if line.startswith('+'):
+                changes["added_lines"].append(content)
+                if not is_jsdoc_line:
+                    changes["jsdoc_only"] = False
+                    changes["suspicious_changes"].append(f"ADDED NON-JSDOC: {content}")
+
+            elif line.startswith('-'):
+                changes["removed_lines"].append(content)
+                if not is_jsdoc_line:
+                    changes["jsdoc_only"] = False
+                    changes["suspicious_changes"].append(f"REMOVED NON-JSDOC: {content}")
+
+    return changes
+
+def analyze_file_changes(file_path, base=DEFAULT_BASE, head='HEAD'):
     """Analyze changes in a single file to detect non-JSDoc modifications"""
     try:
-        result = subprocess.run(['git', 'diff', '1.1.156..HEAD', '--', file_path],
+        result = subprocess.run(['git', 'diff', f'{base}..{head}', '--', file_path],
                               capture_output=True, text=True)
         if result.returncode != 0:
             return {"error": f"Git diff failed for {file_path}"}
@@ -15,80 +94,176 @@ def analyze_file_changes(file_path):
         if not diff_content.strip():
             return {"no_changes": True}
 
-        lines = diff_content.split('\n')
+        return analyze_diff_lines(diff_content.split('\n'))
 
-        # Track different types of changes
-        changes = {
-            "jsdoc_only": True,
-            "added_lines": [],
-            "removed_lines": [],
-            "suspicious_changes": []
-        }
+    except Exception as e:
+        return {"error": f"Exception analyzing {file_path}: {str(e)}"}
 
-        in_jsdoc = False
-        jsdoc_depth = 0
+def iter_file_diffs(base=DEFAULT_BASE, head='HEAD', paths=('src/',), cached=False):
+    """Stream one git diff over the whole range and yield (file_path, lines) per file"""
+    revisions = diff_revisions(base, head, cached)
+    process = subprocess.Popen(
+        ['git', '-c', 'core.quotePath=false', 'diff', '--no-renames', *revisions, '--', *paths],
+        stdout=subprocess.PIPE, text=True, encoding='utf-8', errors='replace'
+    )
 
-        for line in lines:
-            if line.startswith('@@'):
-                continue
-            if line.startswith('diff --git') or line.startswith('index') or line.startswith('+++') or line.startswith('---'):
-                continue
+    file_path = None
+    lines = []
+    try:
+        for line in process.stdout:
+            line = line.rstrip('\n')
+            if line.startswith('diff --git a/'):
+                if file_path is not None:
+                    yield file_path, lines
+                # Without rename detection both sides name the same path: "a/<path> b/<path>"
+                names = line[len('diff --git a/'):]
+                file_path = names[:(len(names) - 3) // 2]
+                lines = []
+            lines.append(line)
 
-            if line.startswith('+') or line.startswith('-'):
-                content = line[1:].strip()
-
-                # Check if we're entering/exiting JSDoc
-                if '/**' in content:
-                    in_jsdoc = True
-                    jsdoc_depth += content.count('/**')
-                if '*/' in content:
-                    jsdoc_depth -= content.count('*/')
-                    if jsdoc_depth <= 0:
-                        in_jsdoc = False
-                        jsdoc_depth = 0
-
-                # Skip empty lines and lines with only whitespace
-                if not content:
-                    continue
-
-                # Check if line is JSDoc related
-                is_jsdoc_line = (
-                    in_jsdoc or
-                    content.startswith('*') or
-                    content.startswith('/**') or
-                    content.startswith('*/') or
-                    '@param' in content or
-                    '@returns' in content or
-                    '@callback' in content or
-                    '@type' in content or
-                    '@description' in content or
-                    '@typedef' in content or
-                    '@private' in content or
-                    '@module' in content
-                )
-
-                if line.startswith('+'):
-                    changes["added_lines"].append(content)
-                    if not is_jsdoc_line:
-                        changes["jsdoc_only"] = False
-                        changes["suspicious_changes"].append(f"ADDED NON-JSDOC: {content}")
-
-                elif line.startswith('-'):
-                    changes["removed_lines"].append(content)
-                    if not is_jsdoc_line:
-                        changes["jsdoc_only"] = False
-                        changes["suspicious_changes"].append(f"REMOVED NON-JSDOC: {content}")
-
-        return changes
+        if file_path is not None:
+            yield file_path, lines
+    finally:
+        process.stdout.close()
+        if process.wait() != 0:
+            raise RuntimeError(f"git diff {' '.join(revisions)} failed")
 
-    except Exception as e:
-        return {"error": f"Exception analyzing {file_path}: {str(e)}"}
+def code_tokens(data):
+    """Return the (value, line_break) code tokens of a TypeScript source, without comments or whitespace
+
+    line_break is kept because automatic semicolon insertion depends on it:
+    `return /** doc */\n x;` returns undefined while `return x;` does not.
+    """
+    return [(token.value, token.line_break) for token in iter_code_tokens(data.decode('utf-8', errors='replace'))]
+
+def code_fingerprint(data):
+    """Hash the comment-stripped token stream of a TypeScript source"""
+    digest = hashlib.blake2b(digest_size=16)
+    for value, line_break in code_tokens(data):
+        if line_break:
+            digest.update(b'\n')
+        digest.update(value.encode('utf-8', errors='surrogatepass'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def render_tokens(tokens):
+    """Join code tokens for a report, marking the line breaks that precede them"""
+    return ' '.join(f"\\n {value}" if line_break else value for value, line_break in tokens)
 
-def main():
+def _fingerprint_pair(blobs):
+    """Fingerprint the base and head contents of one file"""
+    old_data, new_data = blobs
+    return code_fingerprint(old_data), code_fingerprint(new_data)
+
+def describe_code_changes(old_data, new_data):
+    """List the token-level code differences between two versions of a file"""
+    old_tokens = code_tokens(old_data)
+    new_tokens = code_tokens(new_data)
+    issues = []
+
+    matcher = difflib.SequenceMatcher(None, old_tokens, new_tokens)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        removed = render_tokens(old_tokens[i1:i2])[:120]
+        added = render_tokens(new_tokens[j1:j2])[:120]
+        if tag == 'delete':
+            issues.append(f"REMOVED CODE: {removed}")
+        elif tag == 'insert':
+            issues.append(f"ADDED CODE: {added}")
+        elif tag == 'replace':
+            issues.append(f"CHANGED CODE: {removed} -> {added}")
+
+    return issues
+
+def read_working_tree(file_path):
+    """Return the working tree contents of a file, empty if it was deleted"""
+    if not os.path.exists(file_path):
+        return b''
+    with open(file_path, 'rb') as f:
+        return f.read()
+
+def iter_exact_changes(files, base=DEFAULT_BASE, head='HEAD', jobs=1, cached=False):
+    """Yield (file_path, changes) proving JSDoc-only changes by comparing code token hashes"""
+    wanted = set(files)
+    changed = [
+        (path, old_sha, new_sha)
+        for path, old_sha, new_sha, status in iter_raw_changes(base, head, cached=cached)
+        if path in wanted
+    ]
+
+    # Both sides of every file are read through a single cat-file process;
+    # git has no blob for working tree contents, which are read from disk
+    from_disk = head is None and not cached
+    with PROFILER.stage('read'), BlobReader() as reader:
+        blobs = [
+            (reader.read(old_sha), read_working_tree(path) if from_disk and new_sha == NULL_SHA else reader.read(new_sha))
+            for path, old_sha, new_sha in changed
+        ]
+
+    with PROFILER.stage('tokenize'):
+        if jobs > 1 and len(blobs) > 1 and not PROFILER.enabled:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                fingerprints = list(executor.map(_fingerprint_pair, blobs, chunksize=max(1, len(blobs) // (jobs * 4))))
+        else:
+            fingerprints = []
+            for (path, _, _), pair in zip(changed, blobs):
+                with PROFILER.file(path):
+                    fingerprints.append(_fingerprint_pair(pair))
+
+    for (path, _, _), (old_data, new_data), (old_hash, new_hash) in zip(changed, blobs, fingerprints):
+        if old_hash == new_hash:
+            yield path, {"jsdoc_only": True, "suspicious_changes": []}
+        else:
+            yield path, {"jsdoc_only": False, "suspicious_changes": describe_code_changes(old_data, new_data)}
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Verify that changes since a base ref only touch JSDoc comments')
+    parser.add_argument('--base', default=DEFAULT_BASE,
+                        help=f'base ref to compare against (default: {DEFAULT_BASE})')
+    parser.add_argument('--head', default='HEAD', help='head ref to compare (default: HEAD)')
+    parser.add_argument('--exact', action='store_true',
+                        help='prove JSDoc-only changes by comparing comment-stripped token streams')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='worker processes used to tokenize files in --exact mode (0 uses every CPU)')
+    parser.add_argument('--profile', action='store_true',
+                        help='report per-file, per-pattern and per-stage timings')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='like --profile, and record the peak memory of each stage (slows the timings down)')
+    parser.add_argument('--format', choices=FORMATS, default='text',
+                        help='output format; json and ndjson stream one object per changed file (default: text)')
+    add_scope_arguments(parser)
+    return parser.parse_args(argv)
+
+def comparison(args):
+    """Return (base, head, cached): --staged compares HEAD with the index, --changed-since a ref with the working tree"""
+    if args.staged:
+        return 'HEAD', None, True
+    if args.changed_since:
+        return args.changed_since, None, False
+    return args.base, args.head, False
+
+def iter_changes(files, args):
+    """Yield (file_path, changes) for the changed files using the selected mode"""
+    base, head, cached = comparison(args)
+    if args.exact:
+        jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+        yield from iter_exact_changes(files, base, head, jobs, cached)
+        return
+
+    # One streamed diff for the whole range, analyzed section by section in path order
+    wanted = set(files)
+    for file_path, lines in iter_file_diffs(base, head, cached=cached):
+        if file_path in wanted:
+            with PROFILER.file(file_path):
+                changes = analyze_diff_lines(lines)
+            yield file_path, changes
+
+def main(argv=None):
     """Check all changed TypeScript files for non-JSDoc modifications"""
+    args = parse_args(argv)
 
     # Get all changed TypeScript files
-    result = subprocess.run(['git', 'diff', '1.1.156..HEAD', '--name-only'],
+    result = subprocess.run(['git', '-c', 'core.quotePath=false', 'diff', *diff_revisions(*comparison(args)), '--name-only'],
                           capture_output=True, text=True)
 
     if result.returncode != 0:
@@ -97,36 +272,41 @@ def main():
 
     files = [f for f in result.stdout.strip().split('\n') if f.endswith('.ts') and f.startswith('src/')]
 
-    print(f"Analyzing {len(files)} TypeScript files...")
+    progress(f"Analyzing {len(files)} TypeScript files...")
+
+    if args.format != 'text':
+        findings = (
+            {"file": file_path, "jsdoc_only": changes["jsdoc_only"], "issues": changes["suspicious_changes"]}
+            for file_path, changes in iter_changes(files, args)
+        )
+        try:
+            emit(findings, args.format, 'verify_changes')
+        except (RuntimeError, KeyError) as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
 
     suspicious_files = []
     jsdoc_only_files = 0
 
-    for file_path in files:
-        if not file_path.strip():
-            continue
-
-        changes = analyze_file_changes(file_path)
-
-        if "error" in changes:
-            print(f"ERROR: {changes['error']}")
-            continue
-
-        if "no_changes" in changes:
-            continue
+    try:
+        for file_path, changes in iter_changes(files, args):
 
-        if changes["jsdoc_only"]:
-            jsdoc_only_files += 1
-        else:
-            suspicious_files.append({
-                "file": file_path,
-                "issues": changes["suspicious_changes"]
-            })
-            print(f"\n[SUSPICIOUS] {file_path}")
-            for issue in changes["suspicious_changes"][:3]:  # Show first 3 issues
-                print(f"  - {issue}")
-            if len(changes["suspicious_changes"]) > 3:
-                print(f"  ... and {len(changes['suspicious_changes']) - 3} more issues")
+            if changes["jsdoc_only"]:
+                jsdoc_only_files += 1
+            else:
+                suspicious_files.append({
+                    "file": file_path,
+                    "issues": changes["suspicious_changes"]
+                })
+                print(f"\n[SUSPICIOUS] {file_path}")
+                for issue in changes["suspicious_changes"][:3]:  # Show first 3 issues
+                    print(f"  - {issue}")
+                if len(changes["suspicious_changes"]) > 3:
+                    print(f"  ... and {len(changes['suspicious_changes']) - 3} more issues")
+    except (RuntimeError, KeyError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
 
     print(f"\n=== SUMMARY ===")
     print(f"Total TypeScript files analyzed: {len(files)}")
@@ -141,4 +321,4 @@ def main():
         print(f"\n[OK] ALL CHANGES APPEAR TO BE JSDoc-ONLY")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_profiled('verify_changes', main)
\ No newline at end of file
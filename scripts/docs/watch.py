@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Watch mode shared by the analyzers.
+
+`--watch` keeps the source index, the types.d.ts index and the parsed docs
+pages in memory and polls src/, docs/ and types.d.ts for changed files. Only
+the changed files and the files that depend on them are re-analyzed, and
+every round prints the findings that appeared ([+]) and went away ([-]).
+"""
+import os
+import sys
+import time
+from collections import Counter
+
+# The indexes are only imported once files change
+from repo_files import DTS_PATH, list_files
+
+POLL_INTERVAL = 1.0
+
+WATCHED_ROOTS = ('src', 'docs')
+WATCHED_SUFFIXES = ('.ts', '.md')
+
+def watch_enabled(argv=None):
+    """Return True if --watch was passed on the command line."""
+    argv = sys.argv[1:] if argv is None else argv
+    return '--watch' in argv
+
+def snapshot(roots=WATCHED_ROOTS, suffixes=WATCHED_SUFFIXES):
+    """Return {path: (size, mtime)} for every watched file."""
+    state = {}
+    paths = [DTS_PATH]
+    for root in roots:
+        paths.extend(path for path in list_files(root) if path.endswith(suffixes))
+
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        state[path] = (stat.st_size, stat.st_mtime_ns)
+    return state
+
+def changed_files(before, after):
+    """Return the paths added, removed or modified between two snapshots."""
+    return {path for path in before.keys() | after.keys() if before.get(path) != after.get(path)}
+
+def refresh_models(changed):
+    """Mark the in-memory indexes stale for the changed files.
+
+    Indexes that were never loaded are left alone, and loaded ones rescan
+    the changed files the next time they are used.
+    """
+    from dts_index import invalidate_sources, reset_dts_index
+    from source_index import mark_stale
+
+    sources = [path for path in changed if path.endswith('.ts') and path != DTS_PATH]
+    if sources:
+        mark_stale(sources)
+        invalidate_sources()
+    if DTS_PATH in changed:
+        reset_dts_index()
+    # Markdown pages are revalidated on size and mtime by load_document
+
+def _analyze(analyze, describe, path):
+    try:
+        return [describe(finding) for finding in analyze(path)]
+    except Exception as e:
+        print(f"Error analyzing {path}: {e}")
+        return None
+
+def watch(covered_files, analyze, describe, dependents=None, interval=POLL_INTERVAL):
+    """Analyze every file, then re-analyze changed files and their dependents until interrupted.
+
+    covered_files() returns the files covered by the analyzer, analyze(path) the
+    findings of one file and describe(finding) the line used to report and
+    diff it. dependents(changed) returns the covered files affected by changes
+    to other files, e.g. the docs page of an interface whose source changed.
+    """
+    before = snapshot()
+    findings = {}
+    for path in covered_files():
+        findings[path] = _analyze(analyze, describe, path) or []
+
+    total = sum(len(lines) for lines in findings.values())
+    print(f"[WATCHING] {len(findings)} files, {total} findings (Ctrl+C to stop)")
+    for lines in findings.values():
+        for line in lines:
+            print(f"  {line}")
+
+    try:
+        while True:
+            time.sleep(interval)
+            after = snapshot()
+            changed = changed_files(before, after)
+            before = after
+            if not changed:
+                continue
+
+            refresh_models(changed)
+            files = set(covered_files())
+            affected = changed & files
+            if dependents is not None:
+                affected |= dependents(changed) & files
+            affected |= set(findings) - files
+
+            appeared = Counter()
+            resolved = Counter()
+            for path in sorted(affected):
+                old = findings.get(path, [])
+                new = _analyze(analyze, describe, path) if path in files else []
+                if new is None:
+                    continue
+                if path in files:
+                    findings[path] = new
+                else:
+                    findings.pop(path, None)
+                appeared.update(Counter(new) - Counter(old))
+                resolved.update(Counter(old) - Counter(new))
+
+            total = sum(len(lines) for lines in findings.values())
+            print(f"\n[CHANGED] {len(changed)} files, re-analyzed {len(affected)}")
+            for line in sorted(resolved.elements()):
+                print(f"[-] {line}")
+            for line in sorted(appeared.elements()):
+                print(f"[+] {line}")
+            print(f"[TOTAL] {total} findings")
+
+    except KeyboardInterrupt:
+        print("\n[STOPPED]")
\ No newline at end of file